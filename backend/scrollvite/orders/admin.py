@@ -1,3 +1,39 @@
 from django.contrib import admin
 
-# Register your models here.
+from scrollvite.admin_tools import CreatedYearFilter, LargeTableAdmin
+from .archive import restore_invite
+from .models import InviteInstance, Payment
+
+
+@admin.register(Payment)
+class PaymentAdmin(LargeTableAdmin):
+    list_display = ("razorpay_order_id", "order", "amount", "currency", "status", "paid_at", "created_at")
+    list_select_related = ("order",)
+    list_filter = ("status", CreatedYearFilter)
+    search_fields = ("=razorpay_order_id", "=razorpay_payment_id")
+    raw_id_fields = ("order",)
+    ordering = ("-created_at",)
+    readonly_fields = ("razorpay_signature", "paid_at", "created_at", "updated_at")
+
+
+@admin.register(InviteInstance)
+class InviteInstanceAdmin(LargeTableAdmin):
+    list_display = (
+        "public_slug", "bride_name", "groom_name", "template",
+        "wedding_date", "is_active", "created_at", "expires_at",
+    )
+    list_select_related = ("template",)
+    list_filter = ("is_active", "is_archived", CreatedYearFilter)
+    search_fields = ("=public_slug", "=order__user__email")
+    raw_id_fields = ("order", "template", "template_version")
+    ordering = ("-created_at",)
+    changelist_defer = ("schema",)
+    readonly_fields = (
+        "bride_name", "groom_name", "hero_image", "wedding_date",
+        "image_count", "schema_size", "version", "is_archived", "created_at",
+    )
+
+    def get_object(self, request, object_id, from_field=None):
+        # The change form edits the schema, so bring it back from the archive
+        invite = super().get_object(request, object_id, from_field)
+        return restore_invite(invite) if invite else invite
@@ -0,0 +1,134 @@
+# File: backend/scrollvite/orders/analytics.py
+# Buffered invite view counting
+#
+# InviteView is the hottest read path, so it never writes per view. Views are
+# accumulated in process per (invite, day) and flushed as one increment per
+# key by the first view after INVITE_VIEW_FLUSH_INTERVAL seconds (or once the
+# buffer holds INVITE_VIEW_FLUSH_MAX_KEYS keys), and when the process exits.
+# Unique visitors are deduplicated with cache.add on a hash of IP + user
+# agent, so they are shared across workers when the cache is.
+
+import atexit
+import hashlib
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+from rest_framework.throttling import BaseThrottle
+
+from .models import InviteInstance, InviteViewStats
+
+logger = logging.getLogger(__name__)
+
+UNIQUE_VISITOR_TIMEOUT = 60 * 60 * 24
+
+
+def visitor_id(request):
+    """Anonymous, non-reversible visitor key (no cookies)"""
+    # Same client IP as the throttles: X-Forwarded-For only counts behind
+    # NUM_PROXIES trusted proxies, so clients can't mint new visitors
+    ip = BaseThrottle().get_ident(request)
+    agent = request.META.get("HTTP_USER_AGENT", "")
+    return hashlib.blake2b(f"{ip}|{agent}".encode(), digest_size=8).hexdigest()
+
+
+def unique_visitor_key(invite_id, visitor, day=None):
+    day = day or timezone.localdate()
+    return f"invite-visitor:{invite_id}:{day.isoformat()}:{visitor}"
+
+
+class ViewCounter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buffer = {}
+        self._last_flush = time.monotonic()
+
+    def record(self, invite_id, visitor, is_unique=None):
+        """
+        Count one view. is_unique may be passed in by async callers that
+        already did the cache.add; otherwise it's checked here.
+        """
+        day = timezone.localdate()
+        if is_unique is None:
+            is_unique = cache.add(unique_visitor_key(invite_id, visitor, day), True, UNIQUE_VISITOR_TIMEOUT)
+
+        with self._lock:
+            counts = self._buffer.setdefault((invite_id, day), [0, 0])
+            counts[0] += 1
+            if is_unique:
+                counts[1] += 1
+
+    def is_due(self):
+        return (
+            len(self._buffer) >= settings.INVITE_VIEW_FLUSH_MAX_KEYS
+            or time.monotonic() - self._last_flush >= settings.INVITE_VIEW_FLUSH_INTERVAL
+        )
+
+    def pending(self):
+        with self._lock:
+            return sum(views for views, _ in self._buffer.values())
+
+    def flush(self):
+        """Write buffered deltas. Returns the number of (invite, day) rows touched."""
+        with self._lock:
+            buffer, self._buffer = self._buffer, {}
+            self._last_flush = time.monotonic()
+
+        # Invites deleted since their views were counted would fail the
+        # foreign key check at commit and take the whole batch with them
+        invite_ids = {invite_id for invite_id, _ in buffer}
+        existing = set(InviteInstance.objects.filter(id__in=invite_ids).values_list("id", flat=True))
+        buffer = {key: counts for key, counts in buffer.items() if key[0] in existing}
+        if not buffer:
+            return 0
+
+        with transaction.atomic():
+            for (invite_id, day), (views, uniques) in buffer.items():
+                self._apply(invite_id, day, views, uniques)
+        return len(buffer)
+
+    def _apply(self, invite_id, day, views, uniques):
+        rows = InviteViewStats.objects.filter(invite_id=invite_id, date=day)
+        if rows.update(views=F("views") + views, unique_visitors=F("unique_visitors") + uniques):
+            return
+        try:
+            with transaction.atomic():
+                InviteViewStats.objects.create(
+                    invite_id=invite_id, date=day, views=views, unique_visitors=uniques
+                )
+        except IntegrityError:
+            # Another worker created the row first, or the invite is gone
+            rows.update(views=F("views") + views, unique_visitors=F("unique_visitors") + uniques)
+
+
+view_counter = ViewCounter()
+
+
+@atexit.register
+def _flush_at_exit():
+    # Worker recycling/shutdown: don't drop views no later request will flush
+    try:
+        view_counter.flush()
+    except Exception:
+        logger.exception("Could not flush buffered invite views at exit")
+
+
+def get_invite_analytics(invite, days=30):
+    """Totals and daily rollups for an invite's owner dashboard"""
+    stats = InviteViewStats.objects.filter(invite=invite)
+    totals = stats.aggregate(views=Sum("views"), unique_visitors=Sum("unique_visitors"))
+
+    since = timezone.localdate() - timedelta(days=days - 1)
+    daily = stats.filter(date__gte=since).order_by("date").values("date", "views", "unique_visitors")
+
+    return {
+        "total_views": totals["views"] or 0,
+        "unique_visitors": totals["unique_visitors"] or 0,
+        "daily": list(daily),
+    }
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class OrdersConfig(AppConfig):
     name = 'orders'
+
+    def ready(self):
+        from . import checks  # noqa: F401  registers system checks
+        from . import rollups  # noqa: F401  registers rollup delete handlers
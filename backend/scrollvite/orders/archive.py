@@ -0,0 +1,138 @@
+# File: backend/scrollvite/orders/archive.py
+# Cold storage for the schemas of long-expired invites
+#
+# Schemas are the bulk of the InviteInstance table, yet invites that expired
+# months ago are almost never opened again. archive_invites() moves their
+# schema into ArchivedInviteSchema (zlib-compressed JSON, the same format as
+# TemplateVersion snapshots) and leaves the row in place with schema {} and
+# is_archived set. Summary columns are untouched, so listings, the admin and
+# share cards keep working without the schema.
+#
+# Anything that needs the schema calls restore_invite() first, which moves it
+# back; an archived invite behaves exactly as before once restored.
+
+import time
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from templates_app.versioning import compress_schema, decompress_schema
+from .models import ArchivedInviteSchema, InviteInstance
+
+BATCH_SIZE = 500
+
+
+def archive_candidates(days, now=None):
+    """Invites expired more than `days` days ago whose schema is still hot"""
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    return InviteInstance.objects.filter(is_archived=False, expires_at__lt=cutoff)
+
+
+def _archive_batch(ids):
+    with transaction.atomic():
+        invites = list(
+            InviteInstance.objects.select_for_update()
+            .filter(id__in=ids, is_archived=False)
+            .values_list("id", "public_slug", "schema")
+        )
+        archives = []
+        for invite_id, _, schema in invites:
+            compressed, size, _ = compress_schema(schema)
+            archives.append(ArchivedInviteSchema(
+                invite_id=invite_id, compressed_schema=compressed, schema_size=size
+            ))
+        ArchivedInviteSchema.objects.bulk_create(archives)
+        # update() rather than save(): the stub schema must not reach the
+        # summary columns, and archiving isn't an edit (version is kept).
+        # The queryset invalidates the public caches.
+        InviteInstance.objects.filter(id__in=[invite[0] for invite in invites]).update(
+            schema={}, is_archived=True
+        )
+
+    return (
+        len(archives),
+        sum(archive.schema_size for archive in archives),
+        sum(len(archive.compressed_schema) for archive in archives),
+    )
+
+
+def archive_invites(days, batch_size=BATCH_SIZE, now=None):
+    """
+    Archive every candidate, batch_size invites per transaction. Returns
+    {"invites", "schema_bytes", "compressed_bytes"} for what was moved.
+    """
+    stats = {"invites": 0, "schema_bytes": 0, "compressed_bytes": 0}
+    candidates = archive_candidates(days, now).order_by("pk").values_list("id", flat=True)
+    last_id = None
+    while True:
+        batch = candidates.filter(pk__gt=last_id) if last_id else candidates
+        ids = list(batch[:batch_size])
+        if not ids:
+            return stats
+        count, schema_bytes, compressed_bytes = _archive_batch(ids)
+        stats["invites"] += count
+        stats["schema_bytes"] += schema_bytes
+        stats["compressed_bytes"] += compressed_bytes
+        last_id = ids[-1]
+
+
+def restore_invite(invite):
+    """Move an archived invite's schema back onto it (no-op if it's hot)"""
+    if not invite.is_archived:
+        return invite
+
+    with transaction.atomic():
+        archive = (
+            ArchivedInviteSchema.objects.select_for_update()
+            .filter(invite_id=invite.id)
+            .first()
+        )
+        if archive is None:
+            # Restored concurrently
+            invite.schema = InviteInstance.objects.values_list("schema", flat=True).get(id=invite.id)
+        else:
+            invite.schema = decompress_schema(archive.compressed_schema)
+            InviteInstance.objects.filter(id=invite.id).update(schema=invite.schema, is_archived=False)
+            archive.delete()
+    invite.is_archived = False
+    return invite
+
+
+# ===================== REPORTING =====================
+
+def storage_stats():
+    """Hot vs archived schema bytes (uncompressed JSON; archives as stored)"""
+    invites = InviteInstance.objects.aggregate(
+        hot=Count("id", filter=Q(is_archived=False)),
+        archived=Count("id", filter=Q(is_archived=True)),
+        hot_bytes=Sum("schema_size", filter=Q(is_archived=False)),
+    )
+    archives = ArchivedInviteSchema.objects.aggregate(
+        schema_bytes=Sum("schema_size"),
+        compressed_bytes=Sum(Length("compressed_schema")),
+    )
+    stats = {
+        "hot_invites": invites["hot"],
+        "archived_invites": invites["archived"],
+        "hot_schema_bytes": invites["hot_bytes"] or 0,
+        "archived_schema_bytes": archives["schema_bytes"] or 0,
+        "archive_bytes": archives["compressed_bytes"] or 0,
+    }
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_total_relation_size(%s)", [InviteInstance._meta.db_table]
+            )
+            stats["invite_table_bytes"] = cursor.fetchone()[0]
+    return stats
+
+
+def time_schema_scan():
+    """Seconds to read every invite's schema column once (a full hot-table scan)"""
+    start = time.perf_counter()
+    for _ in InviteInstance.objects.values_list("schema", flat=True).iterator(chunk_size=2000):
+        pass
+    return time.perf_counter() - start
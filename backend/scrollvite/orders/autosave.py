@@ -0,0 +1,204 @@
+# File: backend/scrollvite/orders/autosave.py
+# Versioned invite schema saves with optional autosave coalescing
+#
+# Every persisted save bumps InviteInstance.version. Clients send the version
+# they edited in an If-Match header; a mismatch raises VersionConflict (409).
+#
+# Autosaves (X-Autosave header) are persisted at most once per
+# INVITE_AUTOSAVE_INTERVAL seconds per invite. Saves inside the window are
+# kept as a draft in the cache (with their own version) and returned to the
+# owner on GET, and the response tells the client when the window closes
+# (202 + Retry-After). The draft is written to the database by the next save
+# after the window, by the owner's next GET once the window has closed, or
+# by the flush_invite_drafts command. Drafts must be visible to every worker,
+# so coalescing needs a shared cache (checked as orders.E003).
+#
+# The version check and the draft/database write run under a short per-invite
+# cache lock, so two concurrent saves of the same version can't both succeed.
+
+import math
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import InviteInstance
+from .summary import summarize_schema
+
+DIRTY_DRAFTS_KEY = "invite-drafts:dirty"
+# A crashed holder blocks saves of its invite for at most this long
+LOCK_TIMEOUT = 5  # seconds
+# How long a save waits for another save of the same invite
+LOCK_WAIT = 2  # seconds
+
+
+class VersionConflict(Exception):
+    def __init__(self, current_version):
+        super().__init__(f"Invite was changed elsewhere (current version {current_version})")
+        self.current_version = current_version
+
+
+class SaveInProgress(Exception):
+    """Another save of the same invite held the lock for longer than LOCK_WAIT"""
+
+
+def _draft_key(invite_id):
+    return f"invite-draft:{invite_id}"
+
+
+def _window_key(invite_id):
+    return f"invite-autosave-window:{invite_id}"
+
+
+def _lock_key(invite_id):
+    return f"invite-save-lock:{invite_id}"
+
+
+@contextmanager
+def _invite_lock(invite_id):
+    key, token = _lock_key(invite_id), uuid.uuid4().hex
+    deadline = time.monotonic() + LOCK_WAIT
+    while not cache.add(key, token, LOCK_TIMEOUT):
+        if time.monotonic() >= deadline:
+            raise SaveInProgress(f"Invite {invite_id} is being saved by another request")
+        time.sleep(0.01)
+    try:
+        yield
+    finally:
+        # Don't release a lock that timed out and was taken by someone else
+        if cache.get(key) == token:
+            cache.delete(key)
+
+
+def get_draft(invite_id):
+    """Buffered autosave for an invite: {"schema": ..., "version": ...} or None"""
+    return cache.get(_draft_key(invite_id))
+
+
+def current_state(invite):
+    """(schema, version) the owner should see, including any buffered draft"""
+    draft = get_draft(invite.pk)
+    if draft and draft["version"] > invite.version:
+        return draft["schema"], draft["version"]
+    return invite.schema, invite.version
+
+
+def window_remaining(invite_id):
+    """Seconds until the invite's autosave window closes (0 if it is closed)"""
+    closes_at = cache.get(_window_key(invite_id))
+    if closes_at is None:
+        return 0
+    return max(0, math.ceil(closes_at - time.time()))
+
+
+def parse_if_match(header):
+    """Version number from an If-Match header ('"7"', 'W/"7"' or '7'), or None"""
+    if not header or header.strip() == "*":
+        return None
+    value = header.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        return None
+
+
+def save_schema(invite, schema, expected_version=None, autosave=False):
+    """
+    Save a new schema for an invite.
+
+    Returns (version, persisted). Raises VersionConflict if expected_version
+    is given and doesn't match the latest (draft or stored) version, and
+    SaveInProgress if another save of the invite doesn't finish in time.
+    """
+    with _invite_lock(invite.pk):
+        invite.refresh_from_db(fields=["version"])
+        _, current_version = current_state(invite)
+        if expected_version is not None and expected_version != current_version:
+            raise VersionConflict(current_version)
+
+        new_version = current_version + 1
+        interval = settings.INVITE_AUTOSAVE_INTERVAL
+
+        # cache.add only succeeds once per window, so at most one autosave
+        # per interval reaches the database
+        if autosave and interval > 0 and not cache.add(
+            _window_key(invite.pk), time.time() + interval, interval
+        ):
+            _set_draft(invite.pk, schema, new_version)
+            return new_version, False
+
+        persist(invite, schema, new_version)
+        return new_version, True
+
+
+def persist(invite, schema, new_version):
+    """
+    Write schema + summary columns with a compare-and-swap on the stored
+    version, touching only the columns that change.
+    """
+    summary = summarize_schema(schema)
+    updated = InviteInstance.objects.filter(pk=invite.pk, version=invite.version).update(
+        schema=schema,
+        version=new_version,
+        **summary,
+    )
+    if not updated:
+        invite.refresh_from_db(fields=["version"])
+        raise VersionConflict(invite.version)
+
+    invite.schema = schema
+    invite.version = new_version
+    for field, value in summary.items():
+        setattr(invite, field, value)
+
+    cache.delete(_draft_key(invite.pk))
+
+
+def _persist_draft(invite):
+    """Write the invite's buffered draft, if any. Returns True if one was written."""
+    with _invite_lock(invite.pk):
+        invite.refresh_from_db(fields=["version"])
+        draft = get_draft(invite.pk)
+        if not draft or draft["version"] <= invite.version:
+            return False
+        persist(invite, draft["schema"], draft["version"])
+        return True
+
+
+def flush_due_draft(invite):
+    """Persist the trailing draft once its autosave window has closed"""
+    if get_draft(invite.pk) is None or window_remaining(invite.pk):
+        return False
+    return _persist_draft(invite)
+
+
+def _set_draft(invite_id, schema, version):
+    cache.set(
+        _draft_key(invite_id),
+        {"schema": schema, "version": version},
+        settings.INVITE_DRAFT_TIMEOUT,
+    )
+    # Best-effort index for flush_invite_drafts; a lost entry only means the
+    # draft waits for the owner's next save or GET
+    dirty = cache.get(DIRTY_DRAFTS_KEY) or set()
+    if invite_id not in dirty:
+        dirty.add(invite_id)
+        cache.set(DIRTY_DRAFTS_KEY, dirty, settings.INVITE_DRAFT_TIMEOUT)
+
+
+def flush_drafts():
+    """Persist all buffered drafts. Returns (flushed, conflicts)."""
+    dirty = cache.get(DIRTY_DRAFTS_KEY) or set()
+    cache.delete(DIRTY_DRAFTS_KEY)
+
+    flushed = conflicts = 0
+    for invite in InviteInstance.objects.filter(pk__in=dirty).only("id", "public_slug", "version"):
+        try:
+            flushed += _persist_draft(invite)
+        except (VersionConflict, SaveInProgress):
+            conflicts += 1
+    return flushed, conflicts
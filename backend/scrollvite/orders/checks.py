@@ -0,0 +1,47 @@
+# File: backend/scrollvite/orders/checks.py
+# Deploy checks for secrets that settings.py no longer requires at import time,
+# and checks for settings that only work with a shared cache
+
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+
+@register(Tags.security, deploy=True)
+def check_payment_secrets(app_configs, **kwargs):
+    errors = []
+    if settings.RAZORPAY_STUB:
+        errors.append(Error(
+            "RAZORPAY_STUB is enabled; payments are simulated and never charged.",
+            id="orders.E002",
+        ))
+    elif not settings.RAZORPAY_KEY_ID or not settings.RAZORPAY_KEY_SECRET:
+        errors.append(Error(
+            "RAZORPAY_KEY_ID and RAZORPAY_KEY_SECRET are not set; payments will fail.",
+            id="orders.E001",
+        ))
+    if not settings.EMAIL_HOST_PASSWORD and settings.EMAIL_BACKEND.endswith("smtp.EmailBackend"):
+        errors.append(Warning(
+            "EMAIL_HOST_PASSWORD is not set; purchase emails can't be sent over SMTP.",
+            id="orders.W001",
+        ))
+    return errors
+
+
+# Per-process caches: each worker would see only its own entries
+LOCAL_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    errors = []
+    if settings.INVITE_AUTOSAVE_INTERVAL > 0 and settings.CACHES["default"]["BACKEND"] in LOCAL_CACHE_BACKENDS:
+        errors.append(Error(
+            "INVITE_AUTOSAVE_INTERVAL needs a shared cache: buffered drafts in a "
+            "per-process cache are invisible to other workers and to flush_invite_drafts.",
+            hint="Set REDIS_URL, or set INVITE_AUTOSAVE_INTERVAL=0.",
+            id="orders.E003",
+        ))
+    return errors
@@ -0,0 +1,158 @@
+# File: backend/scrollvite/orders/circuit_breaker.py
+# Circuit breaker for calls to an external service
+#
+# Outcomes are counted in the cache in BUCKET_SECONDS buckets, so with
+# REDIS_URL set every worker shares one breaker per operation (with the
+# local-memory cache each process has its own). A call fails if it raises
+# an exception the caller counts as a failure, or takes longer than
+# slow_call_seconds.
+#
+#   closed     calls go through. Once the last `window` seconds hold at least
+#              min_calls calls and failure_rate of them failed, it opens.
+#   open       calls are rejected at once with CircuitOpen for open_seconds.
+#   half-open  after that, one probe call at a time goes through: success
+#              closes the breaker, failure opens it again.
+
+import logging
+import math
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+BUCKET_SECONDS = 10
+OUTCOMES = ("calls", "failures", "slow_calls", "rejected")
+
+
+class CircuitOpen(Exception):
+    def __init__(self, name, retry_after):
+        super().__init__(f"{name} is unavailable (circuit open)")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_rate=0.5, slow_call_seconds=5.0, min_calls=10,
+                 window=60, open_seconds=30, is_failure=lambda exc: True):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.min_calls = min_calls
+        self.window = window
+        self.open_seconds = open_seconds
+        self.is_failure = is_failure
+
+    # ---- cache keys ----
+
+    def _key(self, suffix):
+        return f"breaker:{self.name}:{suffix}"
+
+    def _bucket_keys(self, outcome, now):
+        current = int(now // BUCKET_SECONDS)
+        count = max(1, math.ceil(self.window / BUCKET_SECONDS))
+        return [self._key(f"{outcome}:{bucket}") for bucket in range(current - count + 1, current + 1)]
+
+    def _count(self, outcome, now):
+        key = self._bucket_keys(outcome, now)[-1]
+        cache.add(key, 0, self.window + BUCKET_SECONDS)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr()
+            cache.set(key, 1, self.window + BUCKET_SECONDS)
+
+    def _totals(self, now):
+        keys = {outcome: self._bucket_keys(outcome, now) for outcome in OUTCOMES}
+        values = cache.get_many([key for bucket_keys in keys.values() for key in bucket_keys])
+        return {
+            outcome: sum(values.get(key, 0) for key in bucket_keys)
+            for outcome, bucket_keys in keys.items()
+        }
+
+    # ---- state ----
+
+    def _reopen(self, now):
+        cache.set(self._key("opened_at"), now, None)
+        logger.warning(f"Circuit {self.name} reopened: probe call failed")
+
+    def _close(self, now):
+        cache.delete_many([
+            self._key("opened_at"),
+            *(key for outcome in OUTCOMES for key in self._bucket_keys(outcome, now)),
+        ])
+        logger.info(f"Circuit {self.name} closed")
+
+    def _before_call(self, now):
+        """True for a half-open probe; raises CircuitOpen to reject the call"""
+        opened_at = cache.get(self._key("opened_at"))
+        if opened_at is None:
+            return False
+
+        retry_at = opened_at + self.open_seconds
+        if now >= retry_at and cache.add(self._key("probe"), True, self.open_seconds):
+            return True
+
+        self._count("rejected", now)
+        raise CircuitOpen(self.name, max(1, math.ceil(retry_at - now)))
+
+    def _after_call(self, now, failed, slow, probe):
+        if probe:
+            cache.delete(self._key("probe"))
+            if failed:
+                self._reopen(now)
+            else:
+                self._close(now)
+            return
+
+        self._count("calls", now)
+        if slow:
+            self._count("slow_calls", now)
+        if not failed:
+            return
+
+        self._count("failures", now)
+        totals = self._totals(now)
+        if totals["calls"] >= self.min_calls and totals["failures"] >= self.failure_rate * totals["calls"]:
+            if cache.add(self._key("opened_at"), now, None):
+                logger.warning(
+                    f"Circuit {self.name} opened: {totals['failures']}/{totals['calls']} "
+                    f"calls failed in {self.window}s"
+                )
+
+    @contextmanager
+    def guard(self):
+        """Wrap one call; raises CircuitOpen instead of running it while open"""
+        probe = self._before_call(time.time())
+        start = time.monotonic()
+        try:
+            yield
+        except Exception as exc:
+            failed = self.is_failure(exc)
+            self._after_call(time.time(), failed, False, probe)
+            raise
+        duration = time.monotonic() - start
+        slow = duration > self.slow_call_seconds
+        self._after_call(time.time(), slow, slow, probe)
+
+    def state(self):
+        """Current state and the window's counts, for metrics"""
+        now = time.time()
+        opened_at = cache.get(self._key("opened_at"))
+        if opened_at is None:
+            state, retry_after = "closed", 0
+        elif now < opened_at + self.open_seconds:
+            state, retry_after = "open", math.ceil(opened_at + self.open_seconds - now)
+        else:
+            state, retry_after = "half_open", 0
+
+        totals = self._totals(now)
+        return {
+            "name": self.name,
+            "state": state,
+            "opened_at": opened_at,
+            "retry_after": retry_after,
+            "window_seconds": self.window,
+            **totals,
+            "failure_rate": round(totals["failures"] / totals["calls"], 4) if totals["calls"] else 0.0,
+        }
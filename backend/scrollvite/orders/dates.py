@@ -0,0 +1,44 @@
+# File: backend/scrollvite/orders/dates.py
+# YYYY-MM-DD day parsing shared by the admin reporting views and commands
+#
+# Exports and sales analytics take an inclusive ?start=/?end= range (or
+# --start/--end on the command line) and reject anything that isn't a date.
+
+import argparse
+
+from django.utils.dateparse import parse_date
+
+
+class InvalidDate(ValueError):
+    pass
+
+
+def parse_day(value):
+    """The date in a YYYY-MM-DD string, or None if it isn't one"""
+    try:
+        return parse_date(value)
+    except ValueError:
+        # Well formed but impossible, e.g. 2026-02-30
+        return None
+
+
+def day_argument(value):
+    """argparse type for --start/--end"""
+    day = parse_day(value)
+    if day is None:
+        raise argparse.ArgumentTypeError(f"Invalid date: {value} (expected YYYY-MM-DD)")
+    return day
+
+
+def date_range(params, start=None, end=None):
+    """
+    {"start": ..., "end": ...} from query params, using the given defaults
+    for missing ones. Raises InvalidDate naming the first bad parameter.
+    """
+    dates = {}
+    for name, default in (("start", start), ("end", end)):
+        value = params.get(name)
+        dates[name] = parse_day(value) if value else default
+        if value and dates[name] is None:
+            raise InvalidDate(f"{name} must be a date (YYYY-MM-DD)")
+    return dates
@@ -0,0 +1,99 @@
+# File: backend/scrollvite/orders/digest.py
+# Periodic admin sales digest
+#
+# Purchases are already recorded as successful Payments, so a digest is just
+# the payments with paid_at inside its period. Each sent digest is logged in
+# AdminDigest and the next period starts where the last one ended, so no
+# purchase is reported twice or skipped even if cron runs late.
+
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from .models import AdminDigest, Payment
+
+
+def sales_summary(start, end, top=None):
+    """
+    Purchase count, revenue, revenue by category and top templates for
+    payments in (start, end]. One GROUP BY query per template; category and
+    overall totals are rolled up from its rows.
+    """
+    rows = list(
+        Payment.objects.filter(status="SUCCESS", paid_at__gt=start, paid_at__lte=end)
+        .values("order__template_id", "order__template__title", "order__template__category__name")
+        .annotate(count=Count("id"), revenue=Sum("amount"))
+        .order_by("-revenue", "-count")
+    )
+
+    templates = [
+        {
+            "id": row["order__template_id"],
+            "title": row["order__template__title"],
+            "category": row["order__template__category__name"],
+            "count": row["count"],
+            "revenue": row["revenue"],
+        }
+        for row in rows
+    ]
+
+    categories = defaultdict(lambda: {"count": 0, "revenue": Decimal("0")})
+    for item in templates:
+        categories[item["category"]]["count"] += item["count"]
+        categories[item["category"]]["revenue"] += item["revenue"]
+
+    return {
+        "start": start,
+        "end": end,
+        "count": sum(item["count"] for item in templates),
+        "revenue": sum((item["revenue"] for item in templates), Decimal("0")),
+        "templates": templates,
+        "categories": sorted(
+            ({"name": name, **totals} for name, totals in categories.items()),
+            key=lambda category: category["revenue"],
+            reverse=True,
+        ),
+        "top_items": templates[:top or settings.ADMIN_DIGEST_TOP_ITEMS],
+    }
+
+
+def next_period(now=None):
+    """(start, end) of the digest that would be sent now"""
+    now = now or timezone.now()
+    last = AdminDigest.objects.values_list("period_end", flat=True).first()
+    start = last or now - timedelta(minutes=settings.ADMIN_DIGEST_INTERVAL)
+    return start, now
+
+
+def is_due(now=None):
+    now = now or timezone.now()
+    start, end = next_period(now)
+    return end - start >= timedelta(minutes=settings.ADMIN_DIGEST_INTERVAL)
+
+
+def send_digest(now=None, send_empty=False):
+    """
+    Send the digest for the current period and log it. Returns the summary,
+    or None if there were no purchases and send_empty is False (the period
+    is still closed, so it isn't reported later).
+    """
+    from .email_templates import build_admin_digest_email
+    from .mailer import send_bulk
+
+    start, end = next_period(now)
+    summary = sales_summary(start, end)
+
+    if summary["count"] or send_empty:
+        send_bulk([build_admin_digest_email(summary)], fail_silently=False)
+
+    AdminDigest.objects.create(
+        period_start=start,
+        period_end=end,
+        purchase_count=summary["count"],
+        revenue=summary["revenue"],
+    )
+    return summary if summary["count"] or send_empty else None
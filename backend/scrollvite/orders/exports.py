@@ -0,0 +1,104 @@
+# File: backend/scrollvite/orders/exports.py
+# Streaming order/payment export for accounting (CSV or NDJSON)
+#
+# Rows are read with values_list(...).iterator(chunk_size=...), so neither
+# model instances nor the full result set are ever held in memory, and are
+# encoded one at a time into the response (or file) as they're read.
+
+import csv
+import json
+import random
+from datetime import datetime, time, timedelta
+from numbers import Number
+
+from django.utils import timezone
+
+from scrollvite.db_router import get_replicas
+from templates_app.models import Order
+
+CHUNK_SIZE = 2000
+
+# (column, ORM path)
+COLUMNS = (
+    ("order_id", "id"),
+    ("created_at", "created_at"),
+    ("status", "status"),
+    ("amount", "amount"),
+    ("user_email", "user__email"),
+    ("template_id", "template_id"),
+    ("template_title", "template__title"),
+    ("category", "template__category__name"),
+    ("region", "template__region"),
+    ("razorpay_order_id", "payment__razorpay_order_id"),
+    ("razorpay_payment_id", "payment__razorpay_payment_id"),
+    ("payment_status", "payment__status"),
+    ("currency", "payment__currency"),
+    ("paid_at", "payment__paid_at"),
+)
+HEADER = [column for column, _ in COLUMNS]
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def export_queryset(start=None, end=None, status=None):
+    """
+    Orders created between start and end (dates, inclusive), optionally with
+    one status, as tuples in COLUMNS order. Reads from a replica if any.
+    """
+    replicas = get_replicas()
+    orders = Order.objects.using(random.choice(replicas) if replicas else "default")
+    if start:
+        orders = orders.filter(created_at__gte=_day_start(start))
+    if end:
+        orders = orders.filter(created_at__lt=_day_start(end) + timedelta(days=1))
+    if status:
+        orders = orders.filter(status=status)
+    return orders.order_by("created_at", "id").values_list(*(path for _, path in COLUMNS))
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_cell(value):
+    # Keep spreadsheet apps from evaluating user-supplied text as a formula
+    text = _text(value)
+    if text[:1] in ("=", "+", "-", "@") and not isinstance(value, Number):
+        return "'" + text
+    return text
+
+
+class _Echo:
+    """File-like object whose write() returns the line instead of storing it"""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(HEADER)
+    for row in rows:
+        yield writer.writerow([_csv_cell(value) for value in row])
+
+
+def iter_ndjson(rows):
+    for row in rows:
+        record = {column: value for column, value in zip(HEADER, row)}
+        yield json.dumps(record, default=_text, ensure_ascii=False) + "\n"
+
+
+def iter_export(fmt, start=None, end=None, status=None, chunk_size=CHUNK_SIZE):
+    rows = export_queryset(start, end, status).iterator(chunk_size=chunk_size)
+    return iter_csv(rows) if fmt == "csv" else iter_ndjson(rows)
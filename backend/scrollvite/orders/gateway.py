@@ -0,0 +1,99 @@
+# File: backend/scrollvite/orders/gateway.py
+# Razorpay client, built on first use, and circuit-broken gateway calls
+#
+# The razorpay SDK is only needed by payment calls, so it isn't imported at
+# module level: workers and management commands boot without it. Views call
+# get_razorpay_client() instead; missing keys only fail payment calls.
+#
+# Views call the gateway through call_gateway(), which puts every operation
+# behind its own circuit breaker (orders/circuit_breaker.py). When Razorpay
+# is failing or slow, requests are turned away at once with
+# GatewayUnavailable (a 503 with Retry-After) instead of each tying up a
+# worker for the full timeout. HTTP calls time out after RAZORPAY_TIMEOUT.
+
+from functools import lru_cache
+from operator import attrgetter
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .circuit_breaker import CircuitBreaker, CircuitOpen
+
+OPERATIONS = ("order.create", "payment.fetch")
+# Retry-After for a failed call while the breaker is still closed
+RETRY_AFTER = 5  # seconds
+
+
+class GatewayUnavailable(Exception):
+    """Razorpay can't be reached right now; the request can be retried"""
+
+    def __init__(self, message, retry_after=RETRY_AFTER):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@lru_cache(maxsize=1)
+def get_razorpay_client():
+    if settings.RAZORPAY_STUB:
+        from .gateway_stub import StubRazorpayClient
+        return StubRazorpayClient(
+            failure_rate=settings.RAZORPAY_STUB_FAILURE_RATE,
+            latency=settings.RAZORPAY_STUB_LATENCY,
+        )
+
+    if not settings.RAZORPAY_KEY_ID or not settings.RAZORPAY_KEY_SECRET:
+        raise ImproperlyConfigured("RAZORPAY_KEY_ID and RAZORPAY_KEY_SECRET must be set")
+
+    import razorpay
+    import requests
+
+    class TimeoutSession(requests.Session):
+        def request(self, *args, **kwargs):
+            kwargs.setdefault("timeout", settings.RAZORPAY_TIMEOUT)
+            return super().request(*args, **kwargs)
+
+    return razorpay.Client(
+        session=TimeoutSession(),
+        auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET),
+    )
+
+
+def _is_failure(exc):
+    # Rejected requests (unknown ids, invalid amounts) mean Razorpay is up
+    from razorpay.errors import BadRequestError
+    return not isinstance(exc, BadRequestError)
+
+
+@lru_cache(maxsize=None)
+def get_breaker(operation):
+    return CircuitBreaker(
+        f"razorpay:{operation}",
+        failure_rate=settings.GATEWAY_BREAKER_FAILURE_RATE,
+        slow_call_seconds=settings.GATEWAY_BREAKER_SLOW_CALL_SECONDS,
+        min_calls=settings.GATEWAY_BREAKER_MIN_CALLS,
+        window=settings.GATEWAY_BREAKER_WINDOW,
+        open_seconds=settings.GATEWAY_BREAKER_OPEN_SECONDS,
+        is_failure=_is_failure,
+    )
+
+
+def call_gateway(operation, *args, **kwargs):
+    """
+    Call a Razorpay client method, e.g. call_gateway("payment.fetch", payment_id).
+    Raises GatewayUnavailable when the breaker is open or the call fails for
+    a reason other than a rejected request; BadRequestError propagates.
+    """
+    method = attrgetter(operation)(get_razorpay_client())
+    try:
+        with get_breaker(operation).guard():
+            return method(*args, **kwargs)
+    except CircuitOpen as e:
+        raise GatewayUnavailable(str(e), retry_after=e.retry_after)
+    except Exception as e:
+        if not _is_failure(e):
+            raise
+        raise GatewayUnavailable(f"Razorpay {operation} failed: {e!r}") from e
+
+
+def gateway_metrics():
+    return [get_breaker(operation).state() for operation in OPERATIONS]
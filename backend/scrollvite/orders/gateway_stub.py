@@ -0,0 +1,111 @@
+# File: backend/scrollvite/orders/gateway_stub.py
+# Local stand-in for the Razorpay client, with fault injection
+#
+# With RAZORPAY_STUB=True get_razorpay_client() returns a StubRazorpayClient,
+# so payments can be exercised without Razorpay (local development, load and
+# resilience tests). Orders and payments live in process memory. Faults make
+# a share of calls raise ServerError and/or add latency, for every operation
+# (RAZORPAY_STUB_FAILURE_RATE / RAZORPAY_STUB_LATENCY) or per operation with
+# inject(), to see how the gateway circuit breaker reacts.
+
+import hashlib
+import hmac
+import random
+import secrets
+import threading
+import time
+
+from django.conf import settings
+
+
+class _OrderResource:
+    def __init__(self, stub):
+        self._stub = stub
+
+    def create(self, data={}, **kwargs):
+        self._stub.fault("order.create")
+        order = {
+            "id": f"order_{secrets.token_hex(7)}",
+            "entity": "order",
+            "amount": data["amount"],
+            "currency": data.get("currency", "INR"),
+            "receipt": data.get("receipt"),
+            "notes": data.get("notes", {}),
+            "status": "created",
+        }
+        with self._stub.lock:
+            self._stub.orders[order["id"]] = order
+        return order
+
+
+class _PaymentResource:
+    def __init__(self, stub):
+        self._stub = stub
+
+    def fetch(self, payment_id, data={}, **kwargs):
+        from razorpay.errors import BadRequestError
+
+        self._stub.fault("payment.fetch")
+        with self._stub.lock:
+            payment = self._stub.payments.get(payment_id)
+        if payment is None:
+            raise BadRequestError("The id provided does not exist")
+        return dict(payment)
+
+
+class StubRazorpayClient:
+    def __init__(self, failure_rate=0.0, latency=0.0, seed=None):
+        self.default_fault = (failure_rate, latency)
+        self.faults = {}
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.orders = {}
+        self.payments = {}
+        self.calls = []
+        self.order = _OrderResource(self)
+        self.payment = _PaymentResource(self)
+
+    def inject(self, operation, failure_rate=0.0, latency=0.0):
+        """Fail `failure_rate` of `operation` calls and delay each by `latency` seconds"""
+        self.faults[operation] = (failure_rate, latency)
+
+    def clear_faults(self):
+        self.faults.clear()
+        self.default_fault = (0.0, 0.0)
+
+    def fault(self, operation):
+        from razorpay.errors import ServerError
+
+        self.calls.append(operation)
+        failure_rate, latency = self.faults.get(operation, self.default_fault)
+        if latency:
+            time.sleep(latency)
+        if failure_rate and self.random.random() < failure_rate:
+            raise ServerError(f"Injected fault in {operation}")
+
+    def pay(self, order_id, status="captured"):
+        """
+        Simulate checkout for an order: records a payment and returns what
+        Razorpay's checkout hands the browser (ids and signature).
+        """
+        payment_id = f"pay_{secrets.token_hex(7)}"
+        with self.lock:
+            order = self.orders[order_id]
+            self.payments[payment_id] = {
+                "id": payment_id,
+                "entity": "payment",
+                "amount": order["amount"],
+                "currency": order["currency"],
+                "order_id": order_id,
+                "status": status,
+            }
+        signature = hmac.new(
+            settings.RAZORPAY_KEY_SECRET.encode(),
+            f"{order_id}|{payment_id}".encode(),
+            hashlib.sha256,
+        ).hexdigest()
+        return {
+            "razorpay_order_id": order_id,
+            "razorpay_payment_id": payment_id,
+            "razorpay_signature": signature,
+        }
@@ -0,0 +1,200 @@
+# File: backend/scrollvite/orders/guest_import.py
+# Guest-list CSV import with personal invite tokens
+#
+# The upload is read one CSV line at a time from Django's upload file (a temp
+# file for anything but small lists), so memory holds one chunk of guests plus
+# the dedupe keys seen so far. Rows are validated and deduped (by email, else
+# phone, else name, within the file and against guests already imported) and
+# inserted with one bulk_create per chunk. import_guests() yields a progress
+# dict after every chunk so the view can stream it to the host.
+
+import csv
+import hashlib
+import io
+import json
+import re
+import secrets
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+
+from .models import Guest
+
+CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 100
+MAX_PARTY_SIZE = 20
+TOKEN_BYTES = 6  # 8 URL-safe characters
+TOKEN_ATTEMPTS = 3
+
+# Accepted header names per field (case and surrounding spaces ignored)
+HEADER_ALIASES = {
+    "name": ("name", "guest", "guest name", "full name"),
+    "email": ("email", "e-mail", "email address"),
+    "phone": ("phone", "mobile", "phone number", "whatsapp"),
+    "party_size": ("party size", "party_size", "guests", "pax", "count"),
+}
+
+_NON_DIGITS = re.compile(r"[^\d]")
+
+
+class GuestImportError(Exception):
+    pass
+
+
+def dedupe_key(name, email, phone):
+    if email:
+        value = f"email:{email.lower()}"
+    elif phone:
+        value = f"phone:{phone}"
+    else:
+        value = f"name:{' '.join(name.lower().split())}"
+    return hashlib.blake2b(value.encode(), digest_size=16).hexdigest()
+
+
+def _columns(header):
+    names = [column.strip().lower() for column in header]
+    columns = {}
+    for field, aliases in HEADER_ALIASES.items():
+        for index, column in enumerate(names):
+            if column in aliases:
+                columns[field] = index
+                break
+    if "name" not in columns:
+        raise GuestImportError("The CSV needs a header row with a name column")
+    return columns
+
+
+def read_rows(file):
+    """(line number, {field: value}) for each data row of a binary CSV file"""
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    reader = csv.reader(text)
+    try:
+        columns = _columns(next(reader, []))
+        for row in reader:
+            if not any(value.strip() for value in row):
+                continue
+            yield reader.line_num, {
+                field: row[index].strip() if index < len(row) else ""
+                for field, index in columns.items()
+            }
+    except UnicodeDecodeError:
+        raise GuestImportError("The CSV must be UTF-8 encoded")
+    except csv.Error as e:
+        raise GuestImportError(f"Line {reader.line_num}: {e}")
+    finally:
+        text.detach()
+
+
+def parse_guest(invite, row):
+    """Unsaved Guest for a row; raises ValueError with the reason"""
+    name = row["name"]
+    if not name:
+        raise ValueError("name is required")
+    if len(name) > 200:
+        raise ValueError("name is too long")
+
+    email = row.get("email", "")
+    if email:
+        try:
+            validate_email(email)
+        except ValidationError:
+            raise ValueError(f"invalid email: {email}")
+
+    phone = row.get("phone", "")
+    if phone:
+        digits = _NON_DIGITS.sub("", phone)
+        if not 7 <= len(digits) <= 15:
+            raise ValueError(f"invalid phone: {phone}")
+        phone = ("+" if phone.startswith("+") else "") + digits
+
+    party_size = row.get("party_size") or "1"
+    if not party_size.isdigit() or not 1 <= int(party_size) <= MAX_PARTY_SIZE:
+        raise ValueError(f"party size must be between 1 and {MAX_PARTY_SIZE}")
+
+    return Guest(
+        invite=invite,
+        name=name,
+        email=email,
+        phone=phone,
+        party_size=int(party_size),
+        dedupe_key=dedupe_key(name, email, phone),
+    )
+
+
+def _save_chunk(invite, guests):
+    """Insert guests not already on the list; returns how many were inserted"""
+    for attempt in range(TOKEN_ATTEMPTS):
+        existing = set(
+            Guest.objects.filter(invite=invite, dedupe_key__in=[guest.dedupe_key for guest in guests])
+            .values_list("dedupe_key", flat=True)
+        )
+        new = [guest for guest in guests if guest.dedupe_key not in existing]
+        for guest in new:
+            guest.token = secrets.token_urlsafe(TOKEN_BYTES)
+        try:
+            with transaction.atomic():
+                Guest.objects.bulk_create(new)
+            return len(new)
+        except IntegrityError:
+            # A token collided, or a concurrent import added one of these guests
+            continue
+    raise GuestImportError("Some guests could not be saved; the ones counted as created were kept. Please try again.")
+
+
+def import_guests(invite, file, chunk_size=CHUNK_SIZE):
+    """
+    Import a guest-list CSV. Yields progress after every chunk and a final
+    summary with "done": True and the first MAX_REPORTED_ERRORS row errors.
+    """
+    stats = {"rows": 0, "created": 0, "duplicates": 0, "invalid": 0}
+    errors = []
+    seen = set()
+    chunk = []
+
+    def flush():
+        created = _save_chunk(invite, chunk)
+        stats["created"] += created
+        stats["duplicates"] += len(chunk) - created
+        chunk.clear()
+
+    try:
+        for line, row in read_rows(file):
+            stats["rows"] += 1
+            if stats["rows"] > settings.GUEST_IMPORT_MAX_ROWS:
+                raise GuestImportError(f"Too many rows (max {settings.GUEST_IMPORT_MAX_ROWS})")
+
+            try:
+                guest = parse_guest(invite, row)
+            except ValueError as e:
+                stats["invalid"] += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({"line": line, "error": str(e)})
+                continue
+
+            if guest.dedupe_key in seen:
+                stats["duplicates"] += 1
+                continue
+            seen.add(guest.dedupe_key)
+
+            chunk.append(guest)
+            if len(chunk) >= chunk_size:
+                flush()
+                yield dict(stats)
+
+        if chunk:
+            flush()
+    except GuestImportError as e:
+        yield {**stats, "done": True, "error": str(e), "errors": errors}
+        return
+
+    yield {**stats, "done": True, "errors": errors}
+
+
+async def stream_progress(progress):
+    """NDJSON lines from a progress iterator, advanced off the event loop"""
+    advance = sync_to_async(next, thread_sensitive=True)
+    while (item := await advance(progress, None)) is not None:
+        yield json.dumps(item) + "\n"
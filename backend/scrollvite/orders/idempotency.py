@@ -0,0 +1,127 @@
+# File: backend/scrollvite/orders/idempotency.py
+# Idempotency-Key support for POST endpoints
+#
+# A client that may retry a request (double-clicks, flaky mobile networks)
+# sends the same Idempotency-Key header with every attempt. The first attempt
+# claims the key with one INSERT, runs the view and stores its response;
+# every later attempt is answered from that row (one lookup on the unique
+# index) without running the view, so it never reaches the payment gateway
+# or takes row locks. Keys live for IDEMPOTENCY_KEY_TTL seconds.
+#
+# 5xx responses and exceptions release the key, so the retry runs for real.
+# A key reused with a different request body gets 422, and a retry that
+# arrives while the first attempt is still running gets 409 + Retry-After.
+
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+# A claim still unfinished after this long belongs to a crashed worker
+CLAIM_TIMEOUT = 60  # seconds
+
+
+def request_hash(request):
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(f"{request.path}\n{body}".encode()).hexdigest()
+
+
+def _replay(record, fingerprint):
+    if record.request_hash != fingerprint:
+        return Response(
+            {"error": f"This {HEADER} was already used for a different request"},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    if record.status_code is None:
+        return Response(
+            {"error": "The original request is still being processed. Please retry shortly."},
+            status=status.HTTP_409_CONFLICT,
+            headers={"Retry-After": "1"}
+        )
+    return Response(record.response, status=record.status_code, headers={REPLAYED_HEADER: "true"})
+
+
+def _claim(user, scope, key, fingerprint):
+    """(new IdempotencyKey, None) for a first attempt, else (None, response to replay)"""
+    now = timezone.now()
+    records = IdempotencyKey.objects.filter(user=user, scope=scope, key=key)
+
+    record = records.first()
+    if record is not None:
+        abandoned = (
+            record.status_code is None
+            and record.created_at < now - timedelta(seconds=CLAIM_TIMEOUT)
+        )
+        if record.expires_at > now and not abandoned:
+            return None, _replay(record, fingerprint)
+        records.filter(pk=record.pk).delete()
+
+    try:
+        with transaction.atomic():
+            record = IdempotencyKey.objects.create(
+                user=user,
+                scope=scope,
+                key=key,
+                request_hash=fingerprint,
+                expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+            )
+    except IntegrityError:
+        # A concurrent attempt claimed the key first
+        return None, _replay(records.get(), fingerprint)
+    return record, None
+
+
+def idempotent(scope):
+    """
+    Decorator for an APIView handler method. Requests without the header
+    run as before.
+    """
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            key = request.headers.get(HEADER)
+            if key is None:
+                return handler(view, request, *args, **kwargs)
+            if not key.strip() or len(key) > MAX_KEY_LENGTH:
+                return Response(
+                    {"error": f"{HEADER} must be 1-{MAX_KEY_LENGTH} characters"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            fingerprint = request_hash(request)
+            record, replay = _claim(request.user, scope, key, fingerprint)
+            if replay is not None:
+                return replay
+
+            try:
+                response = handler(view, request, *args, **kwargs)
+            except Exception:
+                record.delete()
+                raise
+
+            if response.status_code >= 500:
+                record.delete()
+            else:
+                IdempotencyKey.objects.filter(pk=record.pk).update(
+                    status_code=response.status_code, response=response.data
+                )
+            return response
+        return wrapper
+    return decorator
+
+
+def purge_expired_keys():
+    """Delete expired keys; returns how many"""
+    deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
@@ -0,0 +1,24 @@
+# File: backend/scrollvite/orders/mailer.py
+# Send many emails over one backend connection
+#
+# Each EmailMessage.send() opens (and for SMTP, logs in to) its own
+# connection. send_bulk() opens one and reuses it, reconnecting every
+# EMAIL_MESSAGES_PER_CONNECTION messages since providers cap messages per
+# SMTP session.
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+
+def send_bulk(messages, fail_silently=True, connection=None):
+    """Send messages over a single connection. Returns the number sent."""
+    per_connection = getattr(settings, "EMAIL_MESSAGES_PER_CONNECTION", 100)
+    connection = connection or get_connection(fail_silently=fail_silently)
+    sent = 0
+    with connection:
+        for start in range(0, len(messages), per_connection):
+            if start:
+                connection.close()
+                connection.open()
+            sent += connection.send_messages(messages[start:start + per_connection]) or 0
+    return sent
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from orders.rsvp import aggregate_rsvps, rebuild_rsvp_tallies
+
+
+class Command(BaseCommand):
+    help = (
+        "Count new guest RSVPs into the per-event tallies. Run from cron "
+        "(e.g. every minute): the host's RSVP dashboard only reads the tallies."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rebuild", action="store_true", help="Recount all tallies from scratch")
+
+    def handle(self, *args, **options):
+        count = rebuild_rsvp_tallies() if options["rebuild"] else aggregate_rsvps()
+        if count is None:
+            self.stdout.write("Skipped: another process holds the RSVP watermark lock and will count new responses")
+            return
+        self.stdout.write(self.style.SUCCESS(f"Counted {count} RSVP responses"))
@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from orders.archive import (
+    BATCH_SIZE, archive_candidates, archive_invites, storage_stats, time_schema_scan,
+)
+
+
+def _size(num_bytes):
+    if num_bytes < 1024 * 1024:
+        return f"{num_bytes / 1024:.1f} KB"
+    return f"{num_bytes / 1024 / 1024:.1f} MB"
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the schemas of invites expired more than --days days into "
+        "compressed cold storage, and report the space and scan time saved"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.INVITE_ARCHIVE_AFTER_DAYS,
+            help=f"Archive invites expired more than this many days ago (default: {settings.INVITE_ARCHIVE_AFTER_DAYS})",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help=f"Invites archived per transaction (default: {BATCH_SIZE})",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be archived")
+
+    def handle(self, *args, **options):
+        days = options["days"]
+
+        if options["dry_run"]:
+            candidates = archive_candidates(days)
+            count = candidates.count()
+            schema_bytes = sum(candidates.values_list("schema_size", flat=True).iterator())
+            self.stdout.write(
+                f"{count} invites expired more than {days} days ago ({_size(schema_bytes)} of schema JSON)"
+            )
+            return
+
+        before, scan_before = storage_stats(), time_schema_scan()
+        moved = archive_invites(days, batch_size=options["batch_size"])
+        after, scan_after = storage_stats(), time_schema_scan()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {moved['invites']} invites expired more than {days} days ago"
+        ))
+        if moved["invites"]:
+            ratio = moved["schema_bytes"] / moved["compressed_bytes"] if moved["compressed_bytes"] else 0
+            self.stdout.write(
+                f"  Schema JSON moved:  {_size(moved['schema_bytes'])} -> "
+                f"{_size(moved['compressed_bytes'])} compressed ({ratio:.1f}x)"
+            )
+        self.stdout.write(
+            f"  Hot schemas:        {before['hot_invites']} ({_size(before['hot_schema_bytes'])}) -> "
+            f"{after['hot_invites']} ({_size(after['hot_schema_bytes'])})"
+        )
+        self.stdout.write(
+            f"  Archive:            {after['archived_invites']} invites, "
+            f"{_size(after['archive_bytes'])} for {_size(after['archived_schema_bytes'])} of JSON"
+        )
+        if "invite_table_bytes" in after:
+            self.stdout.write(
+                f"  Invite table:       {_size(before['invite_table_bytes'])} -> "
+                f"{_size(after['invite_table_bytes'])}"
+            )
+        self.stdout.write(
+            f"  Full schema scan:   {scan_before * 1000:.1f} ms -> {scan_after * 1000:.1f} ms"
+        )
+        if moved["invites"]:
+            self.stdout.write(
+                "  Freed pages are reused by new rows; run VACUUM to return them to the OS"
+            )
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from orders.models import InviteInstance
+from orders.summary import SUMMARY_FIELDS, summarize_schema
+
+
+class Command(BaseCommand):
+    help = "Recompute denormalized summary columns (names, wedding date, image count, size) for invites"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of invites updated per transaction (default: 500)",
+        )
+        parser.add_argument(
+            "--only-missing",
+            action="store_true",
+            help="Only process invites whose schema_size is still 0",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        # Archived invites keep their summaries; their schema column is a stub
+        queryset = (
+            InviteInstance.objects.filter(is_archived=False)
+            .only("id", "schema", *SUMMARY_FIELDS)
+            .order_by("pk")
+        )
+        if options["only_missing"]:
+            queryset = queryset.filter(schema_size=0)
+
+        total = queryset.count()
+        updated = 0
+        batch = []
+
+        for invite in queryset.iterator(chunk_size=batch_size):
+            for field, value in summarize_schema(invite.schema).items():
+                setattr(invite, field, value)
+            batch.append(invite)
+
+            if len(batch) >= batch_size:
+                updated += self._flush(batch)
+                self.stdout.write(f"  {updated}/{total} invites updated")
+
+        updated += self._flush(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled summaries for {updated} invites"))
+
+    def _flush(self, batch):
+        if not batch:
+            return 0
+        count = len(batch)
+        with transaction.atomic():
+            InviteInstance.objects.bulk_update(batch, SUMMARY_FIELDS)
+        batch.clear()
+        return count
@@ -0,0 +1,81 @@
+import tempfile
+import time
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from orders.email_templates import (
+    admin_notification_context,
+    build_admin_notification_email,
+    build_purchase_email,
+    purchase_context,
+)
+from orders.mailer import send_bulk
+
+FILE_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
+
+
+class Command(BaseCommand):
+    help = "Measure purchase email rendering and sending throughput on the file backend"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        orders = [self._fake_order(i) for i in range(options["orders"])]
+
+        with tempfile.TemporaryDirectory() as file_path:
+            # Baseline: template rendered from source, one connection per email
+            start = time.perf_counter()
+            for order, invite in orders:
+                for message in self._messages(order, invite):
+                    message.connection = get_connection(FILE_BACKEND, file_path=file_path)
+                    message.send()
+            self._report("Per-email connection", len(orders) * 2, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            messages = []
+            for order, invite in orders:
+                messages += [build_purchase_email(order, invite), build_admin_notification_email(order)]
+            sent = send_bulk(messages, connection=get_connection(FILE_BACKEND, file_path=file_path))
+            self._report("Compiled + bulk", sent, time.perf_counter() - start)
+
+        order, invite = orders[0]
+        raw = render_to_string("emails/purchase.html", purchase_context(order, invite, "https://scrollvite.com"))
+        minified = build_purchase_email(order, invite).alternatives[0].content
+        self.stdout.write(f"Buyer HTML: {len(raw.encode())} bytes raw, {len(minified.encode())} minified")
+
+    def _messages(self, order, invite):
+        """Messages rendered with the template loader each time, as before"""
+        contexts = (
+            ("purchase", purchase_context(order, invite, "https://scrollvite.com"), order.user.email),
+            ("admin_purchase", admin_notification_context(order), "admin@example.com"),
+        )
+        for name, context, recipient in contexts:
+            message = EmailMultiAlternatives(
+                subject=order.template.title,
+                body=render_to_string(f"emails/{name}.txt", context),
+                to=[recipient],
+            )
+            message.attach_alternative(render_to_string(f"emails/{name}.html", context), "text/html")
+            yield message
+
+    def _fake_order(self, index):
+        user = SimpleNamespace(username="", email=f"guest{index}@example.com")
+        order = SimpleNamespace(
+            id=uuid.uuid4(),
+            user=user,
+            template=SimpleNamespace(title=f"Royal {index}"),
+            amount=Decimal("499.00"),
+            created_at=timezone.now(),
+        )
+        invite = SimpleNamespace(id=uuid.uuid4(), public_slug=f"invite-{uuid.uuid4().hex[:10]}")
+        return order, invite
+
+    def _report(self, label, count, elapsed):
+        self.stdout.write(f"{label:<22} {count / elapsed:8.0f} emails/s   ({count} emails, {elapsed:.2f}s)")
@@ -0,0 +1,103 @@
+import random
+import secrets
+import tempfile
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from orders.guest_import import import_guests, parse_guest, read_rows
+from orders.management.commands.bench_invite_views import QueryCounter
+from orders.models import Guest, InviteInstance
+
+
+class Command(BaseCommand):
+    help = "Time the guest-list CSV import against per-row inserts on a generated list"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=50000)
+        parser.add_argument("--baseline-rows", type=int, default=5000, help="Rows for the per-row baseline")
+
+    def handle(self, *args, **options):
+        invite = InviteInstance.objects.first()
+        if invite is None:
+            self.stdout.write(self.style.ERROR("No invites found"))
+            return
+
+        with tempfile.TemporaryFile() as file:
+            self._write_csv(file, options["rows"])
+            size = file.tell()
+            self.stdout.write(f"{options['rows']} rows, {size / 1024 / 1024:.1f} MB")
+
+            # Everything runs in rolled-back transactions so no guests are kept
+            with transaction.atomic():
+                file.seek(0)
+                self._baseline(invite, file, options["baseline_rows"])
+                transaction.set_rollback(True)
+
+            with transaction.atomic():
+                file.seek(0)
+                self._import(invite, file)
+                transaction.set_rollback(True)
+
+            with transaction.atomic():
+                file.seek(0)
+                self._peak_memory(invite, file)
+                transaction.set_rollback(True)
+
+    def _write_csv(self, file, rows):
+        file.write(b"Name,Email,Phone,Party Size\n")
+        for i in range(rows):
+            if i and random.random() < 0.05:
+                i = random.randrange(i)  # duplicate of an earlier guest
+            email = f"guest{i}@example.com" if i % 3 else ""
+            phone = f"+91 98{i:08d}" if i % 2 else ""
+            if i % 97 == 0:
+                email = "not-an-email"
+            file.write(f"Guest {i},{email},{phone},{i % 4 + 1}\n".encode())
+
+    def _baseline(self, invite, file, limit):
+        queries = QueryCounter()
+        with connection.execute_wrapper(queries):
+            start = time.perf_counter()
+            rows = 0
+            for _, row in read_rows(file):
+                if rows >= limit:
+                    break
+                rows += 1
+                try:
+                    guest = parse_guest(invite, row)
+                except ValueError:
+                    continue
+                if not Guest.objects.filter(invite=invite, dedupe_key=guest.dedupe_key).exists():
+                    guest.token = secrets.token_urlsafe(6)
+                    guest.save()
+            elapsed = time.perf_counter() - start
+        self._report("Per-row", rows, elapsed, queries.count)
+
+    def _import(self, invite, file):
+        queries = QueryCounter()
+        with connection.execute_wrapper(queries):
+            start = time.perf_counter()
+            for progress in import_guests(invite, file):
+                pass
+            elapsed = time.perf_counter() - start
+
+        self._report("Chunked import", progress["rows"], elapsed, queries.count)
+        self.stdout.write(
+            f"created {progress['created']}, duplicates {progress['duplicates']}, "
+            f"invalid {progress['invalid']}"
+        )
+
+    def _peak_memory(self, invite, file):
+        # Separate run: tracemalloc slows everything down several times
+        tracemalloc.start()
+        for _ in import_guests(invite, file):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.stdout.write(f"Peak Python memory during import: {peak / 1024 / 1024:.1f} MB")
+
+    def _report(self, label, rows, elapsed, query_count):
+        self.stdout.write(f"{label:<16} {rows / elapsed:10.0f} rows/s   {query_count:6d} queries")
@@ -0,0 +1,68 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from orders.analytics import ViewCounter
+from orders.models import InviteInstance
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = "Compare per-view database writes with the buffered invite view counter"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--views", type=int, default=10000)
+        parser.add_argument("--visitors", type=int, default=500, help="Distinct visitors")
+
+    def handle(self, *args, **options):
+        invite_ids = list(InviteInstance.objects.values_list("id", flat=True)[:20])
+        if not invite_ids:
+            self.stdout.write(self.style.ERROR("No invites found"))
+            return
+
+        total = options["views"]
+        visitors = [uuid.uuid4().hex[:16] for _ in range(options["visitors"])]
+        views = [(invite_ids[i % len(invite_ids)], visitors[i % len(visitors)]) for i in range(total)]
+
+        # Everything runs in one rolled-back transaction so real stats are untouched
+        with transaction.atomic():
+            self._run(views, total)
+            transaction.set_rollback(True)
+
+    def _run(self, views, total):
+        # Baseline: one increment per view, as a naive counter would do
+        queries = QueryCounter()
+        counter = ViewCounter()
+        with connection.execute_wrapper(queries):
+            start = time.perf_counter()
+            for invite_id, visitor in views:
+                counter.record(invite_id, visitor, is_unique=False)
+                counter.flush()
+            naive = time.perf_counter() - start
+        self._report("Per-view writes", total, naive, queries.count)
+
+        queries = QueryCounter()
+        counter = ViewCounter()
+        with connection.execute_wrapper(queries):
+            start = time.perf_counter()
+            for invite_id, visitor in views:
+                counter.record(invite_id, visitor)
+            rows = counter.flush()
+            buffered = time.perf_counter() - start
+        self._report("Buffered", total, buffered, queries.count)
+        self.stdout.write(f"Buffered flush touched {rows} rows")
+
+    def _report(self, label, total, elapsed, query_count):
+        self.stdout.write(
+            f"{label:<16} {total / elapsed:10.0f} views/s   {query_count:6d} queries"
+        )
@@ -0,0 +1,38 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from templates_app.models import Order
+from orders.dates import day_argument
+from orders.exports import FORMATS, iter_export
+
+
+class Command(BaseCommand):
+    help = "Stream orders with their payments as CSV or NDJSON for accounting"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", type=day_argument, help="First day (YYYY-MM-DD, inclusive)")
+        parser.add_argument("--end", type=day_argument, help="Last day (YYYY-MM-DD, inclusive)")
+        parser.add_argument("--status", choices=dict(Order.STATUS_CHOICES))
+        parser.add_argument("--format", choices=FORMATS, default="csv")
+        parser.add_argument("--output", help="File to write (default: stdout)")
+
+    def handle(self, *args, **options):
+        chunks = iter_export(
+            options["format"],
+            start=options["start"],
+            end=options["end"],
+            status=options["status"],
+        )
+
+        if not options["output"]:
+            for chunk in chunks:
+                sys.stdout.write(chunk)
+            return
+
+        rows = -1 if options["format"] == "csv" else 0
+        with open(options["output"], "w", encoding="utf-8", newline="") as output:
+            for chunk in chunks:
+                output.write(chunk)
+                rows += 1
+        self.stderr.write(self.style.SUCCESS(f"Exported {max(rows, 0)} orders to {options['output']}"))
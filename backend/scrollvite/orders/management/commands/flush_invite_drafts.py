@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from orders.autosave import flush_drafts
+
+
+class Command(BaseCommand):
+    help = "Persist buffered invite autosave drafts to the database"
+
+    def handle(self, *args, **options):
+        flushed, conflicts = flush_drafts()
+        self.stdout.write(self.style.SUCCESS(f"Flushed {flushed} drafts ({conflicts} conflicts)"))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from orders.dates import day_argument
+from orders.rollups import rebuild_daily_sales
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute daily sales rollups from orders and payments. "
+        "Without --start/--end, rebuilds all history."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", type=day_argument, help="First day (YYYY-MM-DD, inclusive)")
+        parser.add_argument("--end", type=day_argument, help="Last day (YYYY-MM-DD, inclusive)")
+
+    def handle(self, *args, **options):
+        count = rebuild_daily_sales(options["start"], options["end"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} daily sales rows"))
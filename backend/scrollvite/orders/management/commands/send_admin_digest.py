@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from orders.digest import is_due, send_digest
+
+
+class Command(BaseCommand):
+    help = (
+        "Email ADMIN_EMAIL a sales digest for purchases since the last digest. "
+        "Run from cron; does nothing until ADMIN_DIGEST_INTERVAL has passed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Send even if the interval hasn't passed")
+        parser.add_argument("--send-empty", action="store_true", help="Send even with no purchases")
+
+    def handle(self, *args, **options):
+        if not options["force"] and not is_due():
+            self.stdout.write("Digest not due yet")
+            return
+
+        summary = send_digest(send_empty=options["send_empty"])
+        if summary is None:
+            self.stdout.write("No purchases since the last digest; nothing sent")
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Sent digest: {summary['count']} purchases, ₹{summary['revenue']:.2f}"
+        ))
@@ -0,0 +1,43 @@
+# Generated by Django 6.0.1 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_inviteinstance_expires_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inviteinstance',
+            name='bride_name',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='inviteinstance',
+            name='groom_name',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='inviteinstance',
+            name='hero_image',
+            field=models.CharField(blank=True, default='', max_length=1000),
+        ),
+        migrations.AddField(
+            model_name='inviteinstance',
+            name='wedding_date',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='inviteinstance',
+            name='image_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='inviteinstance',
+            name='schema_size',
+            field=models.PositiveIntegerField(default=0, help_text='Schema size in bytes'),
+        ),
+    ]
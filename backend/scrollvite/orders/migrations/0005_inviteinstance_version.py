@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_inviteinstance_summary_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inviteinstance',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
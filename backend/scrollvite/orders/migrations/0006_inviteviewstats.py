@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-19 15:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0005_inviteinstance_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InviteViewStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('unique_visitors', models.PositiveIntegerField(default=0)),
+                ('invite', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_stats', to='orders.inviteinstance')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('invite', 'date'), name='unique_invite_view_stats_day')],
+            },
+        ),
+    ]
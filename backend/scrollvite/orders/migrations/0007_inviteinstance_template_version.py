@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-19 16:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_versions(apps, schema_editor):
+    InviteInstance = apps.get_model('orders', 'InviteInstance')
+    Order = apps.get_model('templates_app', 'Order')
+    InviteInstance.objects.update(
+        template_version=models.Subquery(
+            Order.objects.filter(pk=models.OuterRef('order_id')).values('template_version')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_inviteviewstats'),
+        ('templates_app', '0010_templateversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inviteinstance',
+            name='template_version',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='invites', to='templates_app.templateversion'),
+        ),
+        migrations.RunPython(link_versions, migrations.RunPython.noop),
+    ]
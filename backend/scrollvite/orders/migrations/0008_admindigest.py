@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-19 17:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0007_inviteinstance_template_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdminDigest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_start', models.DateTimeField()),
+                ('period_end', models.DateTimeField(db_index=True)),
+                ('purchase_count', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('sent_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-period_end'],
+            },
+        ),
+    ]
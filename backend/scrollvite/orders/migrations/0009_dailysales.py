@@ -0,0 +1,75 @@
+# Generated by Django 6.0.1 on 2026-10-19 18:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill(apps, schema_editor):
+    """Same as orders.rollups.rebuild_daily_sales() over all history"""
+    DailySales = apps.get_model('orders', 'DailySales')
+    Order = apps.get_model('templates_app', 'Order')
+    Payment = apps.get_model('orders', 'Payment')
+    Template = apps.get_model('templates_app', 'Template')
+
+    rows = {}
+
+    def row(day, template_id):
+        if (day, template_id) not in rows:
+            rows[day, template_id] = DailySales(date=day, template_id=template_id)
+        return rows[day, template_id]
+
+    orders = (
+        Order.objects.annotate(day=TruncDate('created_at'))
+        .values('day', 'template_id').annotate(count=Count('id')).order_by()
+    )
+    for item in orders:
+        row(item['day'], item['template_id']).orders = item['count']
+
+    payments = (
+        Payment.objects.filter(status='SUCCESS', paid_at__isnull=False)
+        .annotate(day=TruncDate('paid_at'))
+        .values('day', 'order__template_id')
+        .annotate(count=Count('id'), revenue=Sum('amount')).order_by()
+    )
+    for item in payments:
+        sales = row(item['day'], item['order__template_id'])
+        sales.paid_orders = item['count']
+        sales.revenue = item['revenue']
+
+    templates = Template.objects.in_bulk({template_id for _, template_id in rows})
+    for (_, template_id), sales in rows.items():
+        sales.category_id = templates[template_id].category_id
+        sales.region = templates[template_id].region or ''
+
+    DailySales.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0008_admindigest'),
+        ('templates_app', '0010_templateversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('region', models.CharField(blank=True, default='', max_length=50)),
+                ('orders', models.PositiveIntegerField(default=0)),
+                ('paid_orders', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='templates_app.category')),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='templates_app.template')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date'], name='daily_sales_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('date', 'template'), name='unique_daily_sales_template_day')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
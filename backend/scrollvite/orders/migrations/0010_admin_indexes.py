@@ -0,0 +1,34 @@
+# Generated by Django 6.0.1 on 2026-10-19 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0009_dailysales'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='payment',
+            name='razorpay_order_id',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['created_at'], name='payment_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['status', 'created_at'], name='payment_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inviteinstance',
+            index=models.Index(fields=['created_at'], name='invite_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inviteinstance',
+            index=models.Index(fields=['is_active', 'created_at'], name='invite_active_created_idx'),
+        ),
+    ]
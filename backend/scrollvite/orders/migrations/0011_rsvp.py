@@ -0,0 +1,55 @@
+# Generated by Django 6.0.1 on 2026-10-19 19:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0010_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RSVPResponse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event', models.PositiveSmallIntegerField(default=0)),
+                ('event_name', models.CharField(blank=True, default='', max_length=200)),
+                ('guest_name', models.CharField(max_length=200)),
+                ('contact', models.CharField(blank=True, default='', max_length=200)),
+                ('guest_key', models.CharField(max_length=32)),
+                ('status', models.CharField(choices=[('YES', 'Attending'), ('NO', 'Not attending'), ('MAYBE', 'Maybe')], max_length=5)),
+                ('party_size', models.PositiveSmallIntegerField(default=1)),
+                ('message', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('invite', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rsvp_responses', to='orders.inviteinstance')),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['invite', 'guest_key'], name='rsvp_invite_guest_idx'),
+                    models.Index(fields=['invite', '-id'], name='rsvp_invite_recent_idx'),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name='RSVPTally',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event', models.PositiveSmallIntegerField()),
+                ('event_name', models.CharField(blank=True, default='', max_length=200)),
+                ('yes', models.PositiveIntegerField(default=0)),
+                ('no', models.PositiveIntegerField(default=0)),
+                ('maybe', models.PositiveIntegerField(default=0)),
+                ('guests', models.PositiveIntegerField(default=0)),
+                ('last_response_id', models.BigIntegerField(db_index=True, default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('invite', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rsvp_tallies', to='orders.inviteinstance')),
+            ],
+            options={
+                'ordering': ['invite', 'event'],
+                'constraints': [models.UniqueConstraint(fields=('invite', 'event'), name='unique_rsvp_tally_event')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-19 20:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0011_rsvp'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Guest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('email', models.EmailField(blank=True, default='', max_length=254)),
+                ('phone', models.CharField(blank=True, default='', max_length=20)),
+                ('party_size', models.PositiveSmallIntegerField(default=1)),
+                ('dedupe_key', models.CharField(max_length=32)),
+                ('token', models.CharField(max_length=16, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('invite', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='guests', to='orders.inviteinstance')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('invite', 'dedupe_key'), name='unique_guest_per_invite')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-19 20:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0012_guest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inviteinstance',
+            name='is_archived',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='inviteinstance',
+            index=models.Index(fields=['expires_at'], name='invite_expires_idx'),
+        ),
+        migrations.CreateModel(
+            name='ArchivedInviteSchema',
+            fields=[
+                ('invite', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='archived_schema', serialize=False, to='orders.inviteinstance')),
+                ('compressed_schema', models.BinaryField()),
+                ('schema_size', models.PositiveIntegerField(help_text='Uncompressed size in bytes')),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 21:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0014_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='inviteviewstats',
+            name='id',
+            field=models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+    ]
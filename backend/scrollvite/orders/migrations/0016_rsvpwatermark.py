@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-19 22:10
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def seed_watermark(apps, schema_editor):
+    # Until now the watermark was the highest last_response_id over all tallies
+    RSVPTally = apps.get_model("orders", "RSVPTally")
+    RSVPWatermark = apps.get_model("orders", "RSVPWatermark")
+    last = RSVPTally.objects.aggregate(last=Max("last_response_id"))["last"] or 0
+    RSVPWatermark.objects.create(pk=1, last_response_id=last)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0015_alter_inviteviewstats_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RSVPWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_response_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(seed_watermark, migrations.RunPython.noop),
+    ]
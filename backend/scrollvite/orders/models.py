@@ -1,7 +1,10 @@
 import uuid
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
-from templates_app.models import Order, Template
+from django.core.serializers.json import DjangoJSONEncoder
+from templates_app.models import Order, Template, TemplateVersion
+from templates_app.public_cache import invalidate_invite
+from .summary import SUMMARY_FIELDS, summarize_schema
 
 
 class Payment(models.Model):
@@ -16,7 +19,7 @@ class Payment(models.Model):
     order = models.OneToOneField(Order, on_delete=models.CASCADE, related_name="payment")
     
     # Razorpay details
-    razorpay_order_id = models.CharField(max_length=100)
+    razorpay_order_id = models.CharField(max_length=100, db_index=True)
     razorpay_payment_id = models.CharField(max_length=100, blank=True)
     razorpay_signature = models.CharField(max_length=255, blank=True)
     
@@ -30,10 +33,38 @@ class Payment(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     paid_at = models.DateTimeField(null=True, blank=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"], name="payment_created_idx"),
+            models.Index(fields=["status", "created_at"], name="payment_status_created_idx"),
+        ]
+
     def __str__(self):
         return f"Payment {self.razorpay_order_id} - {self.status}"
 
 
+def delete_public_files(slug):
+    """Delete an invite's rendered share cards and QR codes"""
+    from .qr import delete_qr_codes
+    from .share_image import delete_share_images
+
+    delete_share_images(slug)
+    delete_qr_codes(slug)
+
+
+class InviteInstanceQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        # update() skips save(): clear the public caches of the rows it
+        # touches (and the 404 cached for a slug it assigns)
+        slugs = set(self.values_list("public_slug", flat=True))
+        rows = super().update(**kwargs)
+        if "public_slug" in kwargs:
+            slugs.add(kwargs["public_slug"])
+        for slug in slugs:
+            invalidate_invite(slug)
+        return rows
+
+
 class InviteInstance(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
 
@@ -48,18 +79,282 @@ class InviteInstance(models.Model):
         on_delete=models.PROTECT
     )
 
+    # Template version the invite started from; schema is the owner's copy
+    template_version = models.ForeignKey(
+        TemplateVersion,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="invites"
+    )
+
     schema = models.JSONField()
     public_slug = models.SlugField(unique=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField(null=True, blank=True)
 
+    # Denormalized from schema on every save (see orders/summary.py)
+    # so listings can defer the schema column entirely
+    bride_name = models.CharField(max_length=200, blank=True, default="")
+    groom_name = models.CharField(max_length=200, blank=True, default="")
+    hero_image = models.CharField(max_length=1000, blank=True, default="")
+    wedding_date = models.DateField(null=True, blank=True, db_index=True)
+    image_count = models.PositiveIntegerField(default=0)
+    schema_size = models.PositiveIntegerField(default=0, help_text="Schema size in bytes")
+
+    # Bumped on every schema write; clients send it back in If-Match
+    version = models.PositiveIntegerField(default=1)
+
+    # Schema moved to ArchivedInviteSchema (schema is {} until restored,
+    # see orders/archive.py); summary columns keep their values
+    is_archived = models.BooleanField(default=False)
+
+    objects = InviteInstanceQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"], name="invite_created_idx"),
+            models.Index(fields=["is_active", "created_at"], name="invite_active_created_idx"),
+            models.Index(fields=["expires_at"], name="invite_expires_idx"),
+        ]
+
     def __str__(self):
         return f"Invite {self.public_slug}"
+
+    def refresh_summary(self):
+        """Recompute summary columns from the current schema"""
+        for field, value in summarize_schema(self.schema).items():
+            setattr(self, field, value)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if self.is_archived:
+            # The stub schema must not overwrite the summary columns
+            pass
+        elif update_fields is None:
+            self.refresh_summary()
+            if not self._state.adding:
+                self.version += 1
+        elif "schema" in update_fields:
+            self.refresh_summary()
+            self.version += 1
+            kwargs["update_fields"] = set(update_fields) | set(SUMMARY_FIELDS) | {"version"}
+        super().save(*args, **kwargs)
+        invalidate_invite(self.public_slug)
+        if not self.is_active:
+            # Cards and QR codes show names and photos; stop serving them
+            slug = self.public_slug
+            transaction.on_commit(lambda: delete_public_files(slug))
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_invite(self.public_slug)
+        delete_public_files(self.public_slug)
+        return result
     
     def is_expired(self):
         """Check if invite has expired"""
         if not self.expires_at:
             return False
         from django.utils import timezone
-        return timezone.now() > self.expires_at
\ No newline at end of file
+        return timezone.now() > self.expires_at
+
+
+class ArchivedInviteSchema(models.Model):
+    """Cold, zlib-compressed schema of a long-expired invite (orders/archive.py)"""
+    invite = models.OneToOneField(
+        InviteInstance,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="archived_schema"
+    )
+    compressed_schema = models.BinaryField()
+    schema_size = models.PositiveIntegerField(help_text="Uncompressed size in bytes")
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Archived schema of {self.invite_id}"
+
+
+class InviteViewStats(models.Model):
+    """Daily view rollup per invite, written in batches by orders.analytics"""
+    invite = models.ForeignKey(
+        InviteInstance,
+        on_delete=models.CASCADE,
+        related_name="view_stats"
+    )
+    date = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    unique_visitors = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["invite", "date"], name="unique_invite_view_stats_day"),
+        ]
+
+    def __str__(self):
+        return f"{self.invite_id} {self.date}: {self.views} views"
+
+
+class AdminDigest(models.Model):
+    """One sent admin sales digest; the next one starts at period_end"""
+    period_start = models.DateTimeField()
+    period_end = models.DateTimeField(db_index=True)
+    purchase_count = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-period_end"]
+
+    def __str__(self):
+        return f"Digest {self.period_start:%Y-%m-%d %H:%M} - {self.period_end:%Y-%m-%d %H:%M}"
+
+
+class DailySales(models.Model):
+    """
+    Orders placed and paid per template per day, maintained by orders.rollups.
+    Category and region are copied from the template so dashboards can group
+    by them without joins.
+    """
+    date = models.DateField()
+    template = models.ForeignKey(Template, on_delete=models.CASCADE, related_name="daily_sales")
+    category = models.ForeignKey("templates_app.Category", on_delete=models.CASCADE, related_name="daily_sales")
+    region = models.CharField(max_length=50, blank=True, default="")
+
+    orders = models.PositiveIntegerField(default=0)
+    paid_orders = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["date", "template"], name="unique_daily_sales_template_day"),
+        ]
+        indexes = [
+            models.Index(fields=["date"], name="daily_sales_date_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.template_id} {self.date}: {self.paid_orders}/{self.orders} paid"
+
+
+class RSVPResponse(models.Model):
+    """
+    One guest's answer for one event, as submitted. Rows are only ever
+    inserted; a guest answering again adds newer rows, and orders.rsvp
+    counts the latest one per (guest, event) in RSVPTally.
+    """
+    STATUS_CHOICES = (
+        ("YES", "Attending"),
+        ("NO", "Not attending"),
+        ("MAYBE", "Maybe"),
+    )
+
+    invite = models.ForeignKey(InviteInstance, on_delete=models.CASCADE, related_name="rsvp_responses")
+    # Index into the invite's schema["events"] (0 when it has none)
+    event = models.PositiveSmallIntegerField(default=0)
+    event_name = models.CharField(max_length=200, blank=True, default="")
+
+    guest_name = models.CharField(max_length=200)
+    contact = models.CharField(max_length=200, blank=True, default="")
+    # Hash of normalized name + contact; identifies repeat answers
+    guest_key = models.CharField(max_length=32)
+    status = models.CharField(max_length=5, choices=STATUS_CHOICES)
+    party_size = models.PositiveSmallIntegerField(default=1)
+    message = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["invite", "guest_key"], name="rsvp_invite_guest_idx"),
+            models.Index(fields=["invite", "-id"], name="rsvp_invite_recent_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.guest_name}: {self.status} ({self.invite_id} #{self.event})"
+
+
+class RSVPTally(models.Model):
+    """Per-event RSVP counts of an invite, maintained in batches by orders.rsvp"""
+    invite = models.ForeignKey(InviteInstance, on_delete=models.CASCADE, related_name="rsvp_tallies")
+    event = models.PositiveSmallIntegerField()
+    event_name = models.CharField(max_length=200, blank=True, default="")
+
+    yes = models.PositiveIntegerField(default=0)
+    no = models.PositiveIntegerField(default=0)
+    maybe = models.PositiveIntegerField(default=0)
+    # Sum of party sizes of YES answers
+    guests = models.PositiveIntegerField(default=0)
+
+    # Highest RSVPResponse id counted into this tally
+    last_response_id = models.BigIntegerField(default=0, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["invite", "event"]
+        constraints = [
+            models.UniqueConstraint(fields=["invite", "event"], name="unique_rsvp_tally_event"),
+        ]
+
+    def __str__(self):
+        return f"{self.invite_id} #{self.event}: {self.yes} yes / {self.no} no / {self.maybe} maybe"
+
+
+
+class RSVPWatermark(models.Model):
+    """
+    Single row (pk=1): the highest RSVPResponse id counted into the tallies.
+    orders.rsvp locks it (SELECT ... FOR UPDATE) for each aggregation batch,
+    so only one process counts responses at a time.
+    """
+    last_response_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"RSVPs counted up to #{self.last_response_id}"
+
+class Guest(models.Model):
+    """A guest with a personal invite link: /invite/<slug>?guest=<token>"""
+    invite = models.ForeignKey(InviteInstance, on_delete=models.CASCADE, related_name="guests")
+    name = models.CharField(max_length=200)
+    email = models.EmailField(blank=True, default="")
+    phone = models.CharField(max_length=20, blank=True, default="")
+    party_size = models.PositiveSmallIntegerField(default=1)
+
+    # Hash of the normalized email, else phone, else name (see orders.guest_import)
+    dedupe_key = models.CharField(max_length=32)
+    token = models.CharField(max_length=16, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["invite", "dedupe_key"], name="unique_guest_per_invite"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.invite_id})"
+
+
+class IdempotencyKey(models.Model):
+    """First response to a request sent with an Idempotency-Key (orders/idempotency.py)"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    scope = models.CharField(max_length=50)
+    key = models.CharField(max_length=255)
+    # SHA-256 of the request body; a reused key with another body is rejected
+    request_hash = models.CharField(max_length=64)
+
+    # Both null while the first request is still running
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "scope", "key"], name="unique_idempotency_key"),
+        ]
+
+    def __str__(self):
+        return f"{self.scope} {self.key}"
@@ -0,0 +1,56 @@
+# File: backend/scrollvite/orders/qr.py
+# QR codes (PNG/SVG) of public invite URLs, for printed invites
+#
+# Codes are stored as qr/<slug>/<url hash>-<size>.<format>: the slug and
+# FRONTEND_URL fully determine the content, so each file is rendered once
+# and then served as immutable. segno is imported on first render.
+
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+
+from .rendered_files import delete_rendered, get_or_render
+
+# Largest width in pixels (PNG) or user units (SVG); the code is drawn at
+# the biggest whole number of pixels per module that fits
+QR_SIZES = (128, 256, 512, 1024, 2048)
+QR_FORMATS = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+}
+QR_BORDER = 4  # modules of quiet zone, as the spec requires
+
+
+def invite_public_url(slug):
+    return f"{settings.FRONTEND_URL}/invite/{slug}"
+
+
+def qr_dir(slug):
+    return f"qr/{slug}"
+
+
+def qr_path(slug, size, fmt):
+    url_hash = hashlib.sha256(invite_public_url(slug).encode()).hexdigest()[:8]
+    return f"{qr_dir(slug)}/{url_hash}-{size}.{fmt}"
+
+
+def render_qr(data, size, fmt):
+    import segno
+
+    # Medium error correction survives print smudges and folds
+    code = segno.make(data, error="m", micro=False)
+    width, _ = code.symbol_size(scale=1, border=QR_BORDER)
+    buffer = BytesIO()
+    code.save(buffer, kind=fmt, scale=max(1, size // width), border=QR_BORDER)
+    return buffer.getvalue()
+
+
+def get_qr_code(slug, size, fmt):
+    """Storage name of the invite's QR code, rendering it if needed"""
+    path, _ = get_or_render(qr_path(slug, size, fmt), lambda: render_qr(invite_public_url(slug), size, fmt))
+    return path
+
+
+def delete_qr_codes(slug):
+    delete_rendered(qr_dir(slug))
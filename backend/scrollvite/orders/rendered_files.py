@@ -0,0 +1,52 @@
+# File: backend/scrollvite/orders/rendered_files.py
+# Generated files (share cards, QR codes) cached in default_storage
+#
+# Each file's storage name identifies its content, so once written it's
+# served as-is forever. get_or_render() renders a missing file once: the
+# first request takes a cache lock and renders, concurrent requests for the
+# same name wait for the file instead of rendering it again.
+
+import time
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+RENDER_LOCK_TIMEOUT = 30  # seconds
+
+
+def get_or_render(name, render):
+    """
+    Return name, first saving render() (bytes) under it if it doesn't
+    exist yet. Returns True as the second value if this call rendered it.
+    """
+    if default_storage.exists(name):
+        return name, False
+
+    lock = f"render-lock:{name}"
+    if not cache.add(lock, True, RENDER_LOCK_TIMEOUT):
+        # Another request is rendering this file
+        deadline = time.monotonic() + RENDER_LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(0.1)
+            if default_storage.exists(name):
+                return name, False
+
+    try:
+        if default_storage.exists(name):
+            return name, False
+        default_storage.save(name, ContentFile(render()))
+    finally:
+        cache.delete(lock)
+    return name, True
+
+
+def delete_rendered(directory, keep=()):
+    """Delete the files in directory except those named in keep"""
+    try:
+        _, files = default_storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    for filename in files:
+        if filename not in keep:
+            default_storage.delete(f"{directory}/{filename}")
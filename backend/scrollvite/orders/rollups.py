@@ -0,0 +1,170 @@
+# File: backend/scrollvite/orders/rollups.py
+# Daily sales rollups (DailySales) behind the admin analytics API
+#
+# Every order adds to `orders` on the day it's placed and every successful
+# payment adds to `paid_orders`/`revenue` on the day it's paid, inside the
+# transaction that writes it. Deleting an order or a successful payment
+# (directly, in the admin or by cascade) takes it off again through the
+# post_delete handlers below. Dashboards then sum a few rollup rows per day
+# instead of grouping the raw Order and Payment tables.
+#
+# The raw tables stay authoritative: changes that bypass the ORM (raw SQL,
+# QuerySet.update() of status or amount) aren't tracked, and
+# rebuild_daily_sales() (the rebuild_sales_rollups command) recomputes any
+# date range from scratch.
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Greatest, TruncDate
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from templates_app.models import Order, Template
+from .models import DailySales, Payment
+
+# group_by -> (values() fields, label field)
+GROUPS = {
+    "date": (("date",), "date"),
+    "template": (("template_id", "template__title"), "template__title"),
+    "category": (("category_id", "category__name"), "category__name"),
+    "region": (("region",), "region"),
+}
+
+
+def _bump(template, day, **increments):
+    row, _ = DailySales.objects.get_or_create(
+        date=day,
+        template_id=template.id,
+        defaults={"category_id": template.category_id, "region": template.region or ""},
+    )
+    DailySales.objects.filter(pk=row.pk).update(
+        **{field: F(field) + value for field, value in increments.items()}
+    )
+
+
+def _drop(template_id, day, **decrements):
+    # Only touches existing rows: a missing row means the rollups haven't been
+    # built for that day, and the template may itself be being deleted
+    DailySales.objects.filter(date=day, template_id=template_id).update(
+        **{field: Greatest(F(field) - value, 0) for field, value in decrements.items()}
+    )
+
+
+def record_order(order):
+    """Count a newly placed order"""
+    _bump(order.template, timezone.localdate(order.created_at), orders=1)
+
+
+def record_payment(payment, order):
+    """Count a payment that has just succeeded"""
+    _bump(order.template, timezone.localdate(payment.paid_at), paid_orders=1, revenue=payment.amount)
+
+
+@receiver(post_delete, sender=Order, dispatch_uid="rollups_order_deleted")
+def forget_order(sender, instance, **kwargs):
+    """Uncount a deleted order"""
+    _drop(instance.template_id, timezone.localdate(instance.created_at), orders=1)
+
+
+@receiver(post_delete, sender=Payment, dispatch_uid="rollups_payment_deleted")
+def forget_payment(sender, instance, **kwargs):
+    """Uncount a deleted successful payment"""
+    if instance.status != "SUCCESS" or instance.paid_at is None:
+        return
+    # Cascades delete the payment before its order, so the order is still there
+    template_id = Order.objects.filter(pk=instance.order_id).values_list("template_id", flat=True).first()
+    if template_id is not None:
+        _drop(template_id, timezone.localdate(instance.paid_at), paid_orders=1, revenue=instance.amount)
+
+
+def rebuild_daily_sales(start=None, end=None):
+    """
+    Recompute rollups for days start..end (inclusive; None = unbounded) with
+    two GROUP BY queries. Returns the number of rows written.
+    """
+    orders = Order.objects.annotate(day=TruncDate("created_at"))
+    payments = (
+        Payment.objects.filter(status="SUCCESS", paid_at__isnull=False)
+        .annotate(day=TruncDate("paid_at"))
+    )
+    existing = DailySales.objects.all()
+    for bound, lookup in ((start, "gte"), (end, "lte")):
+        if bound:
+            orders = orders.filter(**{f"day__{lookup}": bound})
+            payments = payments.filter(**{f"day__{lookup}": bound})
+            existing = existing.filter(**{f"date__{lookup}": bound})
+
+    rows = {}
+
+    def row(day, template_id):
+        if (day, template_id) not in rows:
+            rows[day, template_id] = DailySales(date=day, template_id=template_id)
+        return rows[day, template_id]
+
+    for item in orders.values("day", "template_id").annotate(count=Count("id")).order_by():
+        row(item["day"], item["template_id"]).orders = item["count"]
+
+    paid = (
+        payments.values("day", "order__template_id")
+        .annotate(count=Count("id"), revenue=Sum("amount"))
+        .order_by()
+    )
+    for item in paid:
+        sales = row(item["day"], item["order__template_id"])
+        sales.paid_orders = item["count"]
+        sales.revenue = item["revenue"]
+
+    templates = Template.objects.in_bulk({template_id for _, template_id in rows})
+    for (_, template_id), sales in rows.items():
+        sales.category_id = templates[template_id].category_id
+        sales.region = templates[template_id].region or ""
+
+    with transaction.atomic():
+        existing.delete()
+        DailySales.objects.bulk_create(rows.values(), batch_size=1000)
+    return len(rows)
+
+
+def _conversion(orders, paid_orders):
+    return round(paid_orders / orders, 4) if orders else None
+
+
+def sales_report(start, end, group_by="date"):
+    """Totals and per-group rows for days start..end (inclusive)"""
+    fields, label = GROUPS[group_by]
+    sales = DailySales.objects.filter(date__gte=start, date__lte=end)
+    sums = {"orders": Sum("orders"), "paid_orders": Sum("paid_orders"), "revenue": Sum("revenue")}
+
+    totals = sales.aggregate(**sums)
+    ordering = "date" if group_by == "date" else "-revenue"
+    rows = [
+        {
+            "key": item[fields[0]],
+            "label": item[label],
+            "orders": item["orders"],
+            "paid_orders": item["paid_orders"],
+            "revenue": item["revenue"],
+            "conversion": _conversion(item["orders"], item["paid_orders"]),
+        }
+        for item in sales.values(*fields).annotate(**sums).order_by(ordering)
+    ]
+
+    return {
+        "start": start,
+        "end": end,
+        "group_by": group_by,
+        "orders": totals["orders"] or 0,
+        "paid_orders": totals["paid_orders"] or 0,
+        "revenue": totals["revenue"] or Decimal("0"),
+        "conversion": _conversion(totals["orders"] or 0, totals["paid_orders"] or 0),
+        "rows": rows,
+    }
+
+
+def default_range(days=30):
+    end = timezone.localdate()
+    return end - timedelta(days=days - 1), end
@@ -0,0 +1,279 @@
+# File: backend/scrollvite/orders/rsvp.py
+# Guest RSVPs: append-only writes, tallies updated in batches
+#
+# Submitting an RSVP is one multi-row INSERT into RSVPResponse; nothing is
+# read, locked or updated, so a surge of guests answering at once doesn't
+# contend on shared rows. aggregate_rsvps() then reads responses past the
+# watermark in id order and applies the net change per (invite, event) to
+# RSVPTally as one UPDATE each. A guest's newer answer replaces their
+# earlier one in the counts. Only the aggregate_rsvps cron command runs
+# aggregation; the host dashboard just reads tally rows, so it stays cheap
+# during a surge and is at most one cron interval behind.
+#
+# The watermark is the single RSVPWatermark row. Each batch locks it with
+# SELECT ... FOR UPDATE SKIP LOCKED in the transaction that moves it, so a
+# second process finds it taken and backs off instead of counting the same
+# responses twice. (SQLite has no row locks; there writers are serialized
+# by the database, with SQLITE_PRODUCTION_OPTIONS starting each transaction
+# with BEGIN IMMEDIATE.) A batch stops at the first response younger than
+# RSVP_SETTLE_SECONDS, so an insert that committed late with a lower id
+# isn't jumped over.
+
+import hashlib
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import RSVPResponse, RSVPTally, RSVPWatermark
+
+STATUS_FIELDS = {"YES": "yes", "NO": "no", "MAYBE": "maybe"}
+MAX_PARTY_SIZE = 20
+MAX_MESSAGE_LENGTH = 2000
+
+GUEST_KEY_CHUNK = 500
+
+_RESPONSE_FIELDS = ("id", "invite_id", "event", "event_name", "guest_key", "status", "party_size", "created_at")
+
+
+class InvalidRSVP(Exception):
+    pass
+
+
+def guest_key(name, contact):
+    """Same guest, same key: case and extra spaces are ignored"""
+    normalized = f"{' '.join(name.lower().split())}|{contact.strip().lower()}"
+    return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+
+def invite_events(schema):
+    """Event names guests can answer for, by index (the wedding itself if none)"""
+    events = schema.get("events") if isinstance(schema, dict) else None
+    if not isinstance(events, list) or not events:
+        return ["Wedding"]
+    return [
+        event["name"][:200] if isinstance(event, dict) and isinstance(event.get("name"), str) and event["name"]
+        else f"Event {index + 1}"
+        for index, event in enumerate(events)
+    ]
+
+
+def _text(data, field, max_length, required=False):
+    value = data.get(field, "")
+    if not isinstance(value, str):
+        raise InvalidRSVP(f"{field} must be a string")
+    value = value.strip()
+    if required and not value:
+        raise InvalidRSVP(f"{field} is required")
+    if len(value) > max_length:
+        raise InvalidRSVP(f"{field} is too long (max {max_length} characters)")
+    return value
+
+
+def build_responses(invite_id, schema, data):
+    """
+    Unsaved RSVPResponse rows for a submission:
+    {"name", "contact"?, "message"?, "responses": [{"event", "status", "party_size"?}]}
+    """
+    if not isinstance(data, dict):
+        raise InvalidRSVP("Expected a JSON object")
+
+    name = _text(data, "name", 200, required=True)
+    contact = _text(data, "contact", 200)
+    message = _text(data, "message", MAX_MESSAGE_LENGTH)
+    events = invite_events(schema)
+
+    answers = data.get("responses")
+    if not isinstance(answers, list) or not answers:
+        raise InvalidRSVP("responses must be a non-empty list")
+    if len(answers) > len(events):
+        raise InvalidRSVP("Too many responses")
+
+    key = guest_key(name, contact)
+    rows, seen = [], set()
+    for answer in answers:
+        if not isinstance(answer, dict):
+            raise InvalidRSVP("Each response must be an object")
+
+        event = answer.get("event", 0)
+        if not isinstance(event, int) or isinstance(event, bool) or not 0 <= event < len(events):
+            raise InvalidRSVP(f"Unknown event: {event}")
+        if event in seen:
+            raise InvalidRSVP(f"Duplicate response for event {event}")
+        seen.add(event)
+
+        status = answer.get("status")
+        status = status.upper() if isinstance(status, str) else status
+        if status not in STATUS_FIELDS:
+            raise InvalidRSVP(f"status must be one of: {', '.join(STATUS_FIELDS)}")
+
+        party_size = answer.get("party_size", 1)
+        if not isinstance(party_size, int) or isinstance(party_size, bool) or not 1 <= party_size <= MAX_PARTY_SIZE:
+            raise InvalidRSVP(f"party_size must be between 1 and {MAX_PARTY_SIZE}")
+
+        rows.append(RSVPResponse(
+            invite_id=invite_id,
+            event=event,
+            event_name=events[event],
+            guest_name=name,
+            contact=contact,
+            guest_key=key,
+            status=status,
+            party_size=party_size,
+            message=message,
+        ))
+    return rows
+
+
+# ===================== AGGREGATION =====================
+
+def _contribution(row):
+    counts = {STATUS_FIELDS[row["status"]]: 1}
+    if row["status"] == "YES":
+        counts["guests"] = row["party_size"]
+    return counts
+
+
+def _previous_answers(latest, watermark):
+    """Latest already-counted response per (invite, event, guest) in latest"""
+    invite_ids = {invite_id for invite_id, _, _ in latest}
+    guest_keys = sorted({key for _, _, key in latest})
+
+    previous = {}
+    for start in range(0, len(guest_keys), GUEST_KEY_CHUNK):
+        rows = (
+            RSVPResponse.objects.filter(
+                id__lte=watermark,
+                invite_id__in=invite_ids,
+                guest_key__in=guest_keys[start:start + GUEST_KEY_CHUNK],
+            )
+            .order_by("id")
+            .values(*_RESPONSE_FIELDS)
+        )
+        for row in rows:
+            key = (row["invite_id"], row["event"], row["guest_key"])
+            if key in latest:
+                previous[key] = row
+    return previous
+
+
+def _apply(invite_id, event, event_name, delta, last_id):
+    changes = {field: F(field) + value for field, value in delta.items() if value}
+    updated = RSVPTally.objects.filter(invite_id=invite_id, event=event).update(
+        event_name=event_name, last_response_id=last_id, **changes
+    )
+    if not updated:
+        RSVPTally.objects.create(
+            invite_id=invite_id,
+            event=event,
+            event_name=event_name,
+            last_response_id=last_id,
+            **{field: max(value, 0) for field, value in delta.items()},
+        )
+
+
+def _lock_watermark(skip_locked=True):
+    """
+    The watermark row, locked until the transaction ends. None if another
+    transaction holds it and skip_locked is set.
+    """
+    RSVPWatermark.objects.get_or_create(pk=1)
+    return RSVPWatermark.objects.select_for_update(skip_locked=skip_locked).filter(pk=1).first()
+
+
+def _aggregate_batch(batch_size, cutoff):
+    """Count one batch. Returns the number of responses read, or None if the watermark is locked."""
+    with transaction.atomic():
+        mark = _lock_watermark()
+        if mark is None:
+            return None
+        watermark = mark.last_response_id
+        rows = []
+        for row in RSVPResponse.objects.filter(id__gt=watermark).order_by("id").values(*_RESPONSE_FIELDS)[:batch_size]:
+            if row["created_at"] >= cutoff:
+                break
+            rows.append(row)
+        if not rows:
+            return 0
+
+        latest = {}
+        for row in rows:
+            latest[row["invite_id"], row["event"], row["guest_key"]] = row
+        previous = _previous_answers(latest, watermark)
+
+        deltas = defaultdict(Counter)
+        names = {}
+        for key, row in latest.items():
+            tally = key[:2]
+            names[tally] = row["event_name"]
+            deltas[tally].update(_contribution(row))
+            if key in previous:
+                deltas[tally].subtract(_contribution(previous[key]))
+
+        last_id = rows[-1]["id"]
+        for (invite_id, event), delta in deltas.items():
+            _apply(invite_id, event, names[invite_id, event], delta, last_id)
+        mark.last_response_id = last_id
+        mark.save(update_fields=["last_response_id", "updated_at"])
+    return len(rows)
+
+
+def aggregate_rsvps(batch_size=None, now=None):
+    """
+    Count all settled responses into the tallies. Returns the number of
+    responses read, or None if another process held the watermark before
+    anything was counted (that process counts them instead).
+    """
+    batch_size = batch_size or settings.RSVP_AGGREGATE_BATCH
+    cutoff = (now or timezone.now()) - timedelta(seconds=settings.RSVP_SETTLE_SECONDS)
+
+    total = None
+    while True:
+        count = _aggregate_batch(batch_size, cutoff)
+        if count is None:
+            break
+        total = (total or 0) + count
+        if count < batch_size:
+            break
+    return total
+
+
+def rebuild_rsvp_tallies():
+    """Recount every tally from the responses"""
+    with transaction.atomic():
+        # Waits for a running aggregation; its batches then see the reset
+        mark = _lock_watermark(skip_locked=False)
+        RSVPTally.objects.all().delete()
+        mark.last_response_id = 0
+        mark.save(update_fields=["last_response_id", "updated_at"])
+        return aggregate_rsvps(now=timezone.now() + timedelta(seconds=settings.RSVP_SETTLE_SECONDS))
+
+
+# ===================== DASHBOARD =====================
+
+def get_rsvp_summary(invite, recent=20):
+    """Per-event tallies (one row per event) and the latest answers"""
+    tallies = {
+        tally["event"]: tally
+        for tally in invite.rsvp_tallies.values("event", "yes", "no", "maybe", "guests", "updated_at")
+    }
+    events = []
+    for index, name in enumerate(invite_events(invite.schema)):
+        tally = tallies.get(index, {})
+        events.append({
+            "event": index,
+            "name": name,
+            "yes": tally.get("yes", 0),
+            "no": tally.get("no", 0),
+            "maybe": tally.get("maybe", 0),
+            "guests": tally.get("guests", 0),
+            "updated_at": tally.get("updated_at"),
+        })
+
+    latest = invite.rsvp_responses.order_by("-id").values(
+        "guest_name", "contact", "event", "status", "party_size", "message", "created_at"
+    )[:recent]
+    return {"events": events, "recent": list(latest)}
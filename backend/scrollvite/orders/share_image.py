@@ -0,0 +1,139 @@
+# File: backend/scrollvite/orders/share_image.py
+# Open Graph share cards (1200x630 JPEG) for public invites
+#
+# A card shows the couple's names and wedding date over the hero photo, all
+# taken from the invite's summary columns (derived from its schema). Cards are
+# stored as share/<slug>/<digest>.jpg, where the digest hashes exactly what
+# is drawn, so a URL never changes content and can be cached forever. The
+# first request for a new digest renders it once (see rendered_files).
+
+import hashlib
+import json
+from datetime import date
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+from .rendered_files import delete_rendered, get_or_render
+
+CARD_SIZE = (1200, 630)
+# Bump when the layout changes so every card is re-rendered
+RENDER_VERSION = 1
+
+BACKGROUND = (74, 22, 36)
+TEXT_COLOR = (255, 255, 255)
+ACCENT_COLOR = (244, 222, 180)
+
+
+def card_fields(invite):
+    return {
+        "bride_name": invite.bride_name,
+        "groom_name": invite.groom_name,
+        "wedding_date": invite.wedding_date.isoformat() if invite.wedding_date else "",
+        "hero_image": invite.hero_image,
+    }
+
+
+def card_digest(invite):
+    data = json.dumps([RENDER_VERSION, card_fields(invite)], sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()[:16]
+
+
+def share_image_dir(slug):
+    return f"share/{slug}"
+
+
+def share_image_path(slug, digest):
+    return f"{share_image_dir(slug)}/{digest}.jpg"
+
+
+def delete_share_images(slug, keep=()):
+    delete_rendered(share_image_dir(slug), keep)
+
+
+def _storage_name(url):
+    """Storage name for a URL of one of our uploads, or None"""
+    path = urlsplit(url).path
+    for prefix in (settings.MEDIA_URL, urlsplit(default_storage.url("")).path):
+        if prefix and prefix != "/" and path.startswith(prefix):
+            return path[len(prefix):]
+    return None
+
+
+def _load_hero(url):
+    # Only our own uploads are read; fetching arbitrary URLs from the
+    # owner-edited schema would let anyone make the server request them
+    from PIL import Image
+
+    name = _storage_name(url) if url else None
+    if not name or not default_storage.exists(name):
+        return None
+    try:
+        with default_storage.open(name, "rb") as file:
+            image = Image.open(file)
+            image.load()
+        return image.convert("RGB")
+    except (OSError, ValueError):
+        return None
+
+
+def _font(size):
+    from PIL import ImageFont
+
+    if settings.SHARE_IMAGE_FONT:
+        return ImageFont.truetype(settings.SHARE_IMAGE_FONT, size)
+    return ImageFont.load_default(size)
+
+
+def _fitted_font(draw, text, size, max_width):
+    font = _font(size)
+    while size > 24 and draw.textlength(text, font=font) > max_width:
+        size -= 4
+        font = _font(size)
+    return font
+
+
+def _centered(draw, y, text, font, fill):
+    width = draw.textlength(text, font=font)
+    draw.text(((CARD_SIZE[0] - width) / 2, y), text, font=font, fill=fill)
+
+
+def render_share_card(fields):
+    """JPEG bytes of the card for card_fields() output"""
+    from PIL import Image, ImageDraw, ImageEnhance, ImageOps
+
+    hero = _load_hero(fields["hero_image"])
+    if hero:
+        card = ImageOps.fit(hero, CARD_SIZE, Image.Resampling.LANCZOS)
+        card = ImageEnhance.Brightness(card).enhance(0.45)
+    else:
+        card = Image.new("RGB", CARD_SIZE, BACKGROUND)
+
+    draw = ImageDraw.Draw(card)
+    names = " & ".join(name for name in (fields["bride_name"], fields["groom_name"]) if name)
+    names = names or "Our Wedding"
+    max_width = CARD_SIZE[0] - 120
+
+    _centered(draw, 170, "You're invited to the wedding of", _font(36), ACCENT_COLOR)
+    _centered(draw, 250, names, _fitted_font(draw, names, 84, max_width), TEXT_COLOR)
+    if fields["wedding_date"]:
+        day = date.fromisoformat(fields["wedding_date"])
+        _centered(draw, 400, f"{day.day} {day:%B %Y}", _font(44), ACCENT_COLOR)
+
+    buffer = BytesIO()
+    card.save(buffer, format="JPEG", quality=85, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def get_share_image(invite):
+    """Storage name of the invite's current card, rendering it if needed"""
+    digest = card_digest(invite)
+    path, rendered = get_or_render(
+        share_image_path(invite.public_slug, digest),
+        lambda: render_share_card(card_fields(invite)),
+    )
+    if rendered:
+        delete_share_images(invite.public_slug, keep={f"{digest}.jpg"})
+    return path
@@ -0,0 +1,94 @@
+# File: backend/scrollvite/orders/summary.py
+# Derive the denormalized summary columns stored on InviteInstance
+
+import json
+from datetime import date
+
+from django.utils.dateparse import parse_date
+
+# Same lookup order the frontend uses in lib/api.ts getHeroImage()
+HERO_IMAGE_FIELDS = ('couple_photo', 'photo', 'image', 'hero_image', 'background', 'picture')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif')
+
+SUMMARY_FIELDS = (
+    'bride_name',
+    'groom_name',
+    'hero_image',
+    'wedding_date',
+    'image_count',
+    'schema_size',
+)
+
+
+def schema_byte_size(schema):
+    """Size of the schema as compact UTF-8 JSON"""
+    return len(json.dumps(schema, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+
+
+def parse_wedding_date(schema):
+    """Return hero.wedding_date as a date, or None if missing/invalid"""
+    if not isinstance(schema, dict):
+        return None
+    hero = schema.get('hero')
+    if not isinstance(hero, dict):
+        return None
+    value = hero.get('wedding_date')
+    if isinstance(value, date):
+        return value
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return parse_date(value[:10])
+    except ValueError:
+        return None
+
+
+def _is_image_url(value):
+    if not isinstance(value, str) or not value.startswith('http'):
+        return False
+    path = value.split('?', 1)[0].lower()
+    return '/media/' in path or path.endswith(IMAGE_EXTENSIONS)
+
+
+def _count_images(node):
+    if isinstance(node, dict):
+        return sum(_count_images(v) for v in node.values())
+    if isinstance(node, list):
+        return sum(_count_images(v) for v in node)
+    return 1 if _is_image_url(node) else 0
+
+
+def _hero_image(hero):
+    for field in HERO_IMAGE_FIELDS:
+        value = hero.get(field)
+        if isinstance(value, str) and value.startswith('http'):
+            return value
+    for value in hero.values():
+        if isinstance(value, str) and value.startswith('http'):
+            return value
+    return ''
+
+
+def _text(value, max_length):
+    return value[:max_length] if isinstance(value, str) else ''
+
+
+def summarize_schema(schema):
+    """Compute the summary column values for an invite schema"""
+    hero = schema.get('hero') if isinstance(schema, dict) else None
+    if not isinstance(hero, dict):
+        hero = {}
+
+    hero_image = _hero_image(hero)
+    if len(hero_image) > 1000:
+        # A truncated URL is useless; the listing falls back to names
+        hero_image = ''
+
+    return {
+        'bride_name': _text(hero.get('bride_name'), 200),
+        'groom_name': _text(hero.get('groom_name'), 200),
+        'hero_image': hero_image,
+        'wedding_date': parse_wedding_date(schema),
+        'image_count': _count_images(schema),
+        'schema_size': schema_byte_size(schema),
+    }
@@ -1,3 +1,878 @@
-from django.test import TestCase
+import csv
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import date, timedelta
+from io import StringIO
+from random import Random
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from templates_app.models import Category, Order, Template
+from users.models import User
+from . import analytics, archive, autosave, idempotency, rollups, rsvp
+from .gateway import GatewayUnavailable, call_gateway, get_breaker, get_razorpay_client
+from .idempotency import idempotent
+from .models import (
+    ArchivedInviteSchema, DailySales, Guest, IdempotencyKey, InviteInstance, InviteViewStats, Payment,
+    RSVPResponse, RSVPTally, RSVPWatermark,
+)
+from .summary import schema_byte_size, summarize_schema
+
+PHOTO = "https://cdn.example.com/media/invites/couple.jpg"
+SCHEMA = {
+    "hero": {"bride_name": "Asha", "groom_name": "Vikram", "wedding_date": "2026-12-12", "couple_photo": PHOTO},
+    "events": [{"name": "Sangeet", "image": "https://cdn.example.com/sangeet.png"}, {"name": "Wedding"}],
+}
+
+
+def make_invite(slug="invite-test", schema=SCHEMA, email="host@example.com", **fields):
+    user = User.objects.create_user(email=email, role="BUYER")
+    category, _ = Category.objects.get_or_create(slug="wedding", defaults={"name": "Wedding"})
+    template = Template.objects.create(
+        title="Royal", category=category, schema=schema, price="499.00", is_published=True
+    )
+    order = Order.objects.create(user=user, template=template, amount="499.00", status="ACTIVE")
+    return InviteInstance.objects.create(
+        order=order, template=template, schema=schema, public_slug=slug, **fields
+    )
+
+
+# Libraries only some requests need; booting a worker must not import them
+LAZY_MODULES = ("razorpay", "PIL", "segno")
+
+# Runs in a fresh interpreter so modules already imported by the test runner
+# don't hide what a boot imports
+BOOT_SCRIPT = f"""
+import json, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps({{
+    "elapsed": time.perf_counter() - start,
+    "loaded": [name for name in {LAZY_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+
+class StartupImportTests(SimpleTestCase):
+    # Generous, so slow CI machines pass; a boot that imports the heavy
+    # libraries again shows up in test_payment_and_image_libraries_load_lazily
+    BUDGET_SECONDS = 5.0
+
+    def _boot(self, **env):
+        result = subprocess.run(
+            [sys.executable, "-c", BOOT_SCRIPT],
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": "scrollvite.settings", **env},
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_setup_and_url_loading_within_budget(self):
+        self.assertLess(self._boot()["elapsed"], self.BUDGET_SECONDS)
+
+    def test_payment_and_image_libraries_load_lazily(self):
+        self.assertEqual(self._boot()["loaded"], [])
+
+    def test_boots_without_payment_and_email_secrets(self):
+        env = {"RAZORPAY_KEY_ID": "", "RAZORPAY_KEY_SECRET": "", "EMAIL_HOST_PASSWORD": ""}
+        self._boot(**env)
+
+
+class InviteSummaryTests(TestCase):
+    def test_summary_columns_follow_the_schema(self):
+        invite = make_invite()
+        self.assertEqual((invite.bride_name, invite.groom_name), ("Asha", "Vikram"))
+        self.assertEqual(invite.wedding_date, date(2026, 12, 12))
+        self.assertEqual(invite.hero_image, PHOTO)
+        self.assertEqual(invite.image_count, 2)
+        self.assertEqual(invite.schema_size, schema_byte_size(SCHEMA))
+
+        invite.schema = {"hero": {"bride_name": "Meera"}}
+        invite.save(update_fields=["schema"])
+        invite.refresh_from_db()
+        self.assertEqual((invite.bride_name, invite.groom_name, invite.wedding_date), ("Meera", "", None))
+        self.assertEqual(invite.version, 2)
+
+    def test_malformed_schemas_give_empty_summaries(self):
+        for schema in ({}, {"hero": "x"}, {"hero": {"wedding_date": "someday", "photo": "x" * 2000}}):
+            summary = summarize_schema(schema)
+            self.assertEqual(summary["bride_name"], "")
+            self.assertIsNone(summary["wedding_date"])
+            self.assertEqual(summary["hero_image"], "")
+
+    def test_backfill_recomputes_summaries(self):
+        first = make_invite("invite-one")
+        second = make_invite("invite-two", email="other@example.com")
+        InviteInstance.objects.update(bride_name="", wedding_date=None, image_count=0)
+        InviteInstance.objects.filter(pk=second.pk).update(schema_size=1)
+
+        call_command("backfill_invite_summaries", "--only-missing", stdout=StringIO())
+        self.assertEqual(InviteInstance.objects.get(pk=second.pk).bride_name, "")
+
+        call_command("backfill_invite_summaries", "--batch-size", "1", stdout=StringIO())
+        for invite in InviteInstance.objects.filter(pk__in=[first.pk, second.pk]):
+            self.assertEqual(invite.bride_name, "Asha")
+            self.assertEqual(invite.wedding_date, date(2026, 12, 12))
+            self.assertEqual(invite.image_count, 2)
+            self.assertEqual(invite.schema_size, schema_byte_size(SCHEMA))
+
+
+class InviteEditorSaveTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.invite = make_invite()
+        self.client = APIClient()
+        self.client.force_authenticate(self.invite.order.user)
+        self.url = f"/api/invites/{self.invite.id}/"
+
+    def _put(self, name, version=None, autosave=False):
+        headers = {}
+        if version is not None:
+            headers["HTTP_IF_MATCH"] = f'"{version}"'
+        if autosave:
+            headers["HTTP_X_AUTOSAVE"] = "1"
+        schema = {"hero": {**SCHEMA["hero"], "bride_name": name}}
+        return self.client.put(self.url, {"schema": schema}, format="json", **headers)
+
+    def _stored_name(self):
+        self.invite.refresh_from_db()
+        return self.invite.schema["hero"]["bride_name"]
+
+    def test_stale_version_gets_409(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response["ETag"], '"1"')
+
+        response = self._put("Meera", version=1)
+        self.assertEqual((response.status_code, response.json()["version"]), (200, 2))
+        self.assertEqual(response["ETag"], '"2"')
+
+        response = self._put("Kavya", version=1)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["current_version"], 2)
+        self.assertEqual(response["ETag"], '"2"')
+        self.assertEqual(self._stored_name(), "Meera")
+
+    def test_autosaves_persist_without_coalescing(self):
+        self.assertEqual(self._put("Meera", version=1, autosave=True).status_code, 200)
+        self.assertEqual(self._put("Kavya", version=2, autosave=True).status_code, 200)
+        self.assertEqual(self._stored_name(), "Kavya")
+
+    @override_settings(INVITE_AUTOSAVE_INTERVAL=10)
+    def test_autosaves_inside_the_window_are_buffered(self):
+        self.assertEqual(self._put("Meera", version=1, autosave=True).status_code, 200)
+
+        response = self._put("Kavya", version=2, autosave=True)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["status"], "buffered")
+        self.assertTrue(1 <= int(response["Retry-After"]) <= 10)
+        self.assertEqual(self._stored_name(), "Meera")
+
+        # The owner sees the draft, and its version is the one to match
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()["schema"]["hero"]["bride_name"], "Kavya")
+        self.assertEqual(response.json()["version"], 3)
+        self.assertEqual(self._put("Asha", version=2, autosave=True).status_code, 409)
+
+        # A manual save persists at once
+        self.assertEqual(self._put("Asha", version=3).status_code, 200)
+        self.assertEqual(self._stored_name(), "Asha")
+        self.assertIsNone(autosave.get_draft(self.invite.pk))
+
+    @override_settings(INVITE_AUTOSAVE_INTERVAL=10)
+    def test_trailing_draft_is_persisted_once_the_window_closes(self):
+        self._put("Meera", version=1, autosave=True)
+        self._put("Kavya", version=2, autosave=True)
+
+        # Still inside the window
+        self.client.get(self.url)
+        self.assertEqual(self._stored_name(), "Meera")
+
+        cache.delete(autosave._window_key(self.invite.pk))
+        self.assertEqual(self.client.get(self.url).json()["version"], 3)
+        self.assertEqual(self._stored_name(), "Kavya")
+        self.assertEqual(self.invite.version, 3)
+
+    @override_settings(INVITE_AUTOSAVE_INTERVAL=10)
+    def test_flush_command_persists_drafts(self):
+        self._put("Meera", version=1, autosave=True)
+        self._put("Kavya", version=2, autosave=True)
+
+        out = StringIO()
+        call_command("flush_invite_drafts", stdout=out)
+        self.assertIn("Flushed 1 drafts", out.getvalue())
+        self.assertEqual(self._stored_name(), "Kavya")
+
+    @override_settings(INVITE_AUTOSAVE_INTERVAL=10)
+    def test_same_version_is_accepted_once(self):
+        self._put("Meera", version=1, autosave=True)
+        schema = {"hero": {"bride_name": "Kavya"}}
+        self.assertEqual(autosave.save_schema(self.invite, schema, 2, autosave=True), (3, False))
+        with self.assertRaises(autosave.VersionConflict):
+            autosave.save_schema(self.invite, schema, 2, autosave=True)
+
+    def test_concurrent_save_gets_409_with_retry_after(self):
+        cache.add(autosave._lock_key(self.invite.pk), "other", autosave.LOCK_TIMEOUT)
+        with mock.patch.object(autosave, "LOCK_WAIT", 0):
+            response = self._put("Meera", version=1)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertEqual(self._stored_name(), "Asha")
+
+
+class InviteViewAnalyticsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        analytics.view_counter.flush()
+        self.invite = make_invite()
+        # Inside the test transaction, so nothing is left for the exit hook
+        self.addCleanup(analytics.view_counter.flush)
+
+    def _stats(self):
+        return list(InviteViewStats.objects.filter(invite=self.invite).values_list("views", "unique_visitors"))
+
+    def test_views_are_buffered_until_due(self):
+        with self.settings(INVITE_VIEW_FLUSH_INTERVAL=3600):
+            for agent in ("phone", "phone", "laptop"):
+                self.client.get("/api/invite/invite-test/", HTTP_USER_AGENT=agent)
+        self.assertEqual(self._stats(), [])
+        self.assertEqual(analytics.view_counter.pending(), 3)
+
+        with self.settings(INVITE_VIEW_FLUSH_INTERVAL=0):
+            self.client.get("/api/invite/invite-test/", HTTP_USER_AGENT="phone")
+        self.assertEqual(self._stats(), [(4, 2)])
+        self.assertEqual(analytics.view_counter.pending(), 0)
+
+    def test_flush_adds_to_existing_rows(self):
+        analytics.view_counter.record(self.invite.id, "a")
+        analytics.view_counter.flush()
+        analytics.view_counter.record(self.invite.id, "a")
+        analytics.view_counter.record(self.invite.id, "b")
+        analytics.view_counter.flush()
+        self.assertEqual(self._stats(), [(3, 2)])
+
+        summary = analytics.get_invite_analytics(self.invite)
+        self.assertEqual((summary["total_views"], summary["unique_visitors"]), (3, 2))
+        self.assertEqual(len(summary["daily"]), 1)
+
+    def test_views_of_deleted_invites_are_dropped(self):
+        other = make_invite("invite-gone", email="other@example.com")
+        analytics.view_counter.record(self.invite.id, "a")
+        analytics.view_counter.record(other.id, "a")
+        other.delete()
+        self.assertEqual(analytics.view_counter.flush(), 1)
+        self.assertEqual(self._stats(), [(1, 1)])
+
+    def test_pending_views_are_flushed_at_exit(self):
+        analytics.view_counter.record(self.invite.id, "a")
+        analytics._flush_at_exit()
+        self.assertEqual(self._stats(), [(1, 1)])
+
+    def test_visitor_ignores_forwarded_for_without_trusted_proxies(self):
+        request = RequestFactory().get("/", REMOTE_ADDR="198.51.100.7", HTTP_X_FORWARDED_FOR="203.0.113.1")
+        spoofed = RequestFactory().get("/", REMOTE_ADDR="198.51.100.7", HTTP_X_FORWARDED_FOR="203.0.113.2")
+        self.assertEqual(analytics.visitor_id(request), analytics.visitor_id(spoofed))
+
+
+stub_gateway = override_settings(
+    RAZORPAY_STUB=True,
+    GATEWAY_BREAKER_FAILURE_RATE=0.5,
+    GATEWAY_BREAKER_SLOW_CALL_SECONDS=0.05,
+    GATEWAY_BREAKER_MIN_CALLS=4,
+    GATEWAY_BREAKER_OPEN_SECONDS=30,
+)
+
+
+class GatewayTestMixin:
+    """Fresh stub gateway and breakers for each test"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        get_razorpay_client.cache_clear()
+        get_breaker.cache_clear()
+        self.addCleanup(get_razorpay_client.cache_clear)
+        self.addCleanup(get_breaker.cache_clear)
+        self.gateway = get_razorpay_client()
+
+
+@stub_gateway
+class CircuitBreakerTests(GatewayTestMixin, SimpleTestCase):
+    ORDER = {"amount": 49900, "currency": "INR"}
+
+    def _create_orders(self, count):
+        failures = 0
+        for _ in range(count):
+            try:
+                call_gateway("order.create", data=self.ORDER)
+            except GatewayUnavailable:
+                failures += 1
+        return failures
+
+    def test_opens_on_failure_rate_and_fails_fast(self):
+        self.gateway.inject("order.create", failure_rate=1.0)
+        self.assertEqual(self._create_orders(4), 4)
+        self.assertEqual(get_breaker("order.create").state()["state"], "open")
+
+        with self.assertRaises(GatewayUnavailable) as raised:
+            call_gateway("order.create", data=self.ORDER)
+        self.assertEqual(self.gateway.calls.count("order.create"), 4)
+        self.assertGreater(raised.exception.retry_after, 0)
+        self.assertEqual(get_breaker("order.create").state()["rejected"], 1)
+
+        # Breakers are per operation
+        self.assertEqual(get_breaker("payment.fetch").state()["state"], "closed")
+
+    def test_stays_closed_below_failure_rate(self):
+        self.gateway.inject("order.create", failure_rate=0.25)
+        self.gateway.random.seed(1)
+        self._create_orders(20)
+        state = get_breaker("order.create").state()
+        self.assertLess(state["failure_rate"], 0.5)
+        self.assertEqual(state["state"], "closed")
+
+    def test_slow_calls_count_as_failures(self):
+        self.gateway.inject("order.create", latency=0.06)
+        self.assertEqual(self._create_orders(4), 0)
+        state = get_breaker("order.create").state()
+        self.assertEqual((state["state"], state["slow_calls"]), ("open", 4))
+
+    def test_rejected_requests_do_not_open_the_breaker(self):
+        from razorpay.errors import BadRequestError
+
+        for _ in range(5):
+            with self.assertRaises(BadRequestError):
+                call_gateway("payment.fetch", "pay_unknown")
+        self.assertEqual(get_breaker("payment.fetch").state()["state"], "closed")
+
+    def test_half_open_probe(self):
+        self.gateway.inject("order.create", failure_rate=1.0)
+        self._create_orders(4)
+
+        later = get_breaker("order.create").state()["opened_at"] + 31
+        with mock.patch("orders.circuit_breaker.time.time", return_value=later):
+            self.assertEqual(get_breaker("order.create").state()["state"], "half_open")
+            # Failed probe: open again
+            self.assertEqual(self._create_orders(1), 1)
+            self.assertEqual(get_breaker("order.create").state()["state"], "open")
+
+        with mock.patch("orders.circuit_breaker.time.time", return_value=later + 31):
+            self.gateway.clear_faults()
+            self.assertEqual(self._create_orders(1), 0)
+            self.assertEqual(get_breaker("order.create").state()["state"], "closed")
+
+
+@stub_gateway
+class PaymentGatewayOutageTests(GatewayTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        category = Category.objects.create(name="Wedding", slug="wedding")
+        self.template = Template.objects.create(
+            title="Royal", category=category, schema={}, price="499.00", is_published=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(email="host@example.com"))
+
+    def _create_order(self):
+        return self.client.post(f"/api/create-payment-order/{self.template.id}/")
+
+    def test_create_order_fails_fast_while_gateway_is_down(self):
+        self.gateway.inject("order.create", failure_rate=1.0)
+        response = self._create_order()
+        self.assertEqual(response.status_code, 503)
+        self.assertTrue(response.data["retryable"])
+        self.assertIn("Retry-After", response.headers)
+        self.assertFalse(Payment.objects.exists())
+
+    def test_verify_keeps_payment_pending_until_gateway_recovers(self):
+        checkout = self.gateway.pay(self._create_order().data["razorpay_order_id"])
+
+        self.gateway.inject("payment.fetch", failure_rate=1.0)
+        response = self.client.post("/api/verify-payment/", checkout, format="json")
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response.headers)
+        self.assertEqual(Payment.objects.get().status, "PENDING")
+
+        self.gateway.clear_faults()
+        response = self.client.post("/api/verify-payment/", checkout, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Payment.objects.get().status, "SUCCESS")
+        self.assertTrue(InviteInstance.objects.filter(id=response.data["invite_id"]).exists())
+
+
+class OrderExportTests(TestCase):
+    def setUp(self):
+        invite = make_invite(email="=HYPERLINK(\"http://evil\")@example.com")
+        self.order = invite.order
+        Template.objects.filter(pk=invite.template_id).update(title="-2+3", region="@SUM(A1)")
+        Payment.objects.create(order=self.order, razorpay_order_id="order_1", amount=49900, status="SUCCESS")
+        admin = User.objects.create_user(email="admin@example.com", role="SUPER_ADMIN")
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def _export(self, **params):
+        response = self.client.get("/api/admin/orders/export/", params)
+        self.assertEqual(response.status_code, 200)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_csv_escapes_formulas(self):
+        response, body = self._export(format="csv")
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        row, = csv.DictReader(StringIO(body))
+        self.assertEqual(row["user_email"], "'=HYPERLINK(\"http://evil\")@example.com")
+        self.assertEqual(row["template_title"], "'-2+3")
+        self.assertEqual(row["region"], "'@SUM(A1)")
+        self.assertEqual(row["amount"], "499.00")
+        self.assertEqual(row["razorpay_order_id"], "order_1")
+
+    def test_ndjson_keeps_values_unescaped(self):
+        response, body = self._export(format="ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        records = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["order_id"], str(self.order.id))
+        self.assertEqual(records[0]["template_title"], "-2+3")
+        self.assertEqual(records[0]["payment_status"], "SUCCESS")
+        self.assertIsNone(records[0]["paid_at"])
+
+    def test_filters_and_validation(self):
+        _, body = self._export(format="ndjson", status="PENDING")
+        self.assertEqual(body, "")
+        today = timezone.localdate().isoformat()
+        _, body = self._export(format="ndjson", start=today, end=today)
+        self.assertEqual(len(body.splitlines()), 1)
+        for params in ({"format": "xml"}, {"status": "LOST"}, {"start": "19-10-2026"}):
+            self.assertEqual(self.client.get("/api/admin/orders/export/", params).status_code, 400)
+
+    def test_requires_super_admin(self):
+        self.client.force_authenticate(self.order.user)
+        self.assertEqual(self.client.get("/api/admin/orders/export/").status_code, 403)
+
+
+class SalesRollupTests(TestCase):
+    def setUp(self):
+        category = Category.objects.create(name="Wedding", slug="wedding")
+        self.templates = [
+            Template.objects.create(
+                title=title, category=category, schema={}, price="499.00", region=region, is_published=True
+            )
+            for title, region in (("Royal", "north"), ("Minimal", None))
+        ]
+
+    def _place(self, template, email, paid_at=None):
+        user, _ = User.objects.get_or_create(email=email, defaults={"role": "BUYER"})
+        order = Order.objects.create(user=user, template=template, amount=template.price)
+        rollups.record_order(order)
+        if paid_at:
+            payment = Payment.objects.create(
+                order=order, razorpay_order_id=f"order_{order.id}", amount=template.price,
+                status="SUCCESS", paid_at=paid_at,
+            )
+            rollups.record_payment(payment, order)
+        return order
+
+    def _rows(self):
+        # A rebuild leaves out days whose orders were all deleted
+        return list(
+            DailySales.objects.exclude(orders=0, paid_orders=0)
+            .order_by("date", "template_id")
+            .values("date", "template_id", "category_id", "region", "orders", "paid_orders", "revenue")
+        )
+
+    def test_incremental_rollups_match_a_rebuild(self):
+        royal, minimal = self.templates
+        now = timezone.now()
+        self._place(royal, "a@example.com", paid_at=now)
+        self._place(royal, "a@example.com", paid_at=now - timedelta(days=1))
+        self._place(royal, "b@example.com").delete()
+        Payment.objects.get(order=self._place(minimal, "b@example.com", paid_at=now)).delete()
+        self._place(minimal, "c@example.com", paid_at=now)
+        User.objects.get(email="c@example.com").delete()
+        self._place(minimal, "d@example.com")
+
+        incremental = self._rows()
+        self.assertEqual(
+            [(row["orders"], row["paid_orders"]) for row in incremental if row["date"] == timezone.localdate()],
+            [(2, 1), (2, 0)],
+        )
+        rollups.rebuild_daily_sales()
+        self.assertEqual(self._rows(), incremental)
+
+    @stub_gateway
+    def test_orders_deleted_by_the_payment_view_are_taken_off(self):
+        cache.clear()
+        get_razorpay_client.cache_clear()
+        get_breaker.cache_clear()
+        self.addCleanup(get_razorpay_client.cache_clear)
+        self.addCleanup(get_breaker.cache_clear)
+        gateway = get_razorpay_client()
+        url = f"/api/create-payment-order/{self.templates[0].id}/"
+
+        def create_order(email):
+            client = APIClient()
+            client.force_authenticate(User.objects.create_user(email=email, role="BUYER"))
+            return client, client.post(url)
+
+        self.assertEqual(create_order("a@example.com")[1].status_code, 200)
+
+        # Corrupted pending order (payment row missing): replaced by a new one
+        client, _ = create_order("b@example.com")
+        Payment.objects.filter(order__user__email="b@example.com").delete()
+        self.assertEqual(client.post(url).status_code, 200)
+
+        gateway.inject("order.create", failure_rate=1.0)
+        self.assertEqual(create_order("c@example.com")[1].status_code, 503)
+
+        self.assertEqual(Order.objects.count(), 2)
+        incremental = self._rows()
+        self.assertEqual(incremental[0]["orders"], 2)
+        rollups.rebuild_daily_sales()
+        self.assertEqual(self._rows(), incremental)
+
+    def test_deletes_never_go_below_zero(self):
+        order = self._place(self.templates[0], "a@example.com", paid_at=timezone.now())
+        DailySales.objects.all().delete()
+        order.delete()
+        self.assertFalse(DailySales.objects.exists())
+
+    def test_analytics_view_validates_dates(self):
+        self._place(self.templates[0], "a@example.com", paid_at=timezone.now())
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(email="admin@example.com", role="SUPER_ADMIN"))
+        response = client.get("/api/admin/analytics/sales/", {"group_by": "region"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["orders"], response.data["paid_orders"]), (1, 1))
+        for params in ({"start": "2026-02-30"}, {"end": "soon"}, {"start": "2026-10-19", "end": "2026-10-01"}):
+            self.assertEqual(client.get("/api/admin/analytics/sales/", params).status_code, 400)
+
+
+@override_settings(RSVP_SETTLE_SECONDS=0)
+class RSVPAggregationTests(TestCase):
+    def setUp(self):
+        self.invite = make_invite()
+        self.client = APIClient()
+
+    def _tallies(self):
+        return {
+            (tally.invite_id, tally.event): (tally.yes, tally.no, tally.maybe, tally.guests)
+            for tally in RSVPTally.objects.all()
+        }
+
+    def test_20k_answers_match_brute_force(self):
+        invites = [self.invite] + [make_invite(f"invite-{n}", email=f"host{n}@example.com") for n in range(3)]
+        random = Random(46)
+        answers = [
+            RSVPResponse(
+                invite=random.choice(invites),
+                event=random.randrange(2),
+                guest_name=f"Guest {guest}",
+                guest_key=rsvp.guest_key(f"Guest {guest}", ""),
+                status=random.choice(["YES", "NO", "MAYBE"]),
+                party_size=random.randint(1, 6),
+            )
+            for guest in (random.randrange(3000) for _ in range(20000))
+        ]
+        # Aggregate part way through, so later answers replace counted ones
+        RSVPResponse.objects.bulk_create(answers[:8000], batch_size=2000)
+        self.assertEqual(rsvp.aggregate_rsvps(batch_size=997), 8000)
+        RSVPResponse.objects.bulk_create(answers[8000:], batch_size=2000)
+        self.assertEqual(rsvp.aggregate_rsvps(batch_size=997), 12000)
+
+        latest = {}
+        for row in RSVPResponse.objects.order_by("id").values("invite_id", "event", "guest_key", "status", "party_size"):
+            latest[row["invite_id"], row["event"], row["guest_key"]] = row
+        expected = defaultdict(lambda: [0, 0, 0, 0])
+        for (invite_id, event, _), row in latest.items():
+            counts = expected[invite_id, event]
+            counts[("YES", "NO", "MAYBE").index(row["status"])] += 1
+            if row["status"] == "YES":
+                counts[3] += row["party_size"]
+        self.assertEqual(self._tallies(), {key: tuple(counts) for key, counts in expected.items()})
+        self.assertEqual(RSVPWatermark.objects.get().last_response_id, RSVPResponse.objects.latest("id").id)
+
+        tallies = self._tallies()
+        self.assertEqual(rsvp.rebuild_rsvp_tallies(), 20000)
+        self.assertEqual(self._tallies(), tallies)
+
+    def test_requests_only_append_and_read(self):
+        response = self.client.post(
+            "/api/invite/invite-test/rsvp/",
+            {"name": "Meera", "responses": [{"event": 1, "status": "yes", "party_size": 3}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(RSVPTally.objects.exists())
+
+        # The host dashboard reads tallies without writing them
+        self.client.force_authenticate(self.invite.order.user)
+        url = f"/api/invites/{self.invite.id}/rsvps/"
+        with mock.patch.object(rsvp, "_aggregate_batch") as aggregate:
+            summary = self.client.get(url).data
+        aggregate.assert_not_called()
+        self.assertEqual(summary["events"][1]["yes"], 0)
+        self.assertEqual(summary["recent"][0]["guest_name"], "Meera")
+
+        call_command("aggregate_rsvps", stdout=StringIO())
+        summary = self.client.get(url).data
+        self.assertEqual(summary["events"][1]["yes"], 1)
+        self.assertEqual(summary["events"][1]["guests"], 3)
+
+    def test_locked_watermark_skips_aggregation(self):
+        rsvp.build_responses(self.invite.id, SCHEMA, {"name": "Meera", "responses": [{"status": "NO"}]})[0].save()
+        with mock.patch.object(rsvp, "_lock_watermark", return_value=None):
+            self.assertIsNone(rsvp.aggregate_rsvps())
+            out = StringIO()
+            call_command("aggregate_rsvps", stdout=out)
+            self.assertIn("another process holds the RSVP watermark lock", out.getvalue())
+        self.assertFalse(RSVPTally.objects.exists())
+        self.assertEqual(rsvp.aggregate_rsvps(), 1)
+
+
+class GuestImportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.invite = make_invite()
+        self.client = APIClient()
+        self.client.force_authenticate(self.invite.order.user)
+
+    def _import(self, text):
+        upload = SimpleUploadedFile("guests.csv", text.encode(), content_type="text/csv")
+        response = self.client.post(f"/api/invites/{self.invite.id}/guests/import/", {"file": upload})
+        self.assertEqual(response.status_code, 200)
+        # The progress stream is an async iterator, as served under ASGI
+        body = async_to_sync(self._read)(response.streaming_content)
+        return [json.loads(line) for line in body.decode().splitlines()]
+
+    @staticmethod
+    async def _read(content):
+        return b"".join([chunk async for chunk in content])
+
+    def test_header_aliases(self):
+        *_, done = self._import(
+            " Full Name ,E-Mail,WhatsApp,PAX,notes\n"
+            "Asha Rao,asha@example.com,+91 98765 43210,3,veg\n"
+            "Ravi,,,,\n"
+        )
+        self.assertEqual((done["created"], done["invalid"]), (2, 0))
+        self.assertEqual(
+            list(Guest.objects.order_by("id").values_list("name", "email", "phone", "party_size")),
+            [("Asha Rao", "asha@example.com", "+919876543210", 3), ("Ravi", "", "", 1)],
+        )
+
+    def test_header_without_a_name_column(self):
+        done, = self._import("email,phone\nasha@example.com,\n")
+        self.assertEqual(done["error"], "The CSV needs a header row with a name column")
+
+    def test_dedupes_within_the_file_and_against_the_list(self):
+        text = (
+            "name,email,phone\n"
+            "Asha,asha@example.com,\n"
+            "Asha R,ASHA@example.com,\n"
+            "Ravi,,98765-43210\n"
+            "Ravi K,,9876543210\n"
+            "Meera  Iyer,,\n"
+            "meera iyer,,\n"
+        )
+        *_, done = self._import(text)
+        self.assertEqual((done["rows"], done["created"], done["duplicates"]), (6, 3, 3))
+
+        *_, done = self._import(text + "Kiran,,\n")
+        self.assertEqual((done["created"], done["duplicates"]), (1, 6))
+        self.assertEqual(Guest.objects.count(), 4)
+
+    def test_invalid_rows_are_reported_by_line(self):
+        *_, done = self._import(
+            "name,email,phone,party size\n"
+            "Asha,not-an-email,,\n"
+            "\n"
+            ",ravi@example.com,,\n"
+            "Meera,,12,\n"
+            "Kiran,,,0\n"
+            "Dev,,,2\n"
+        )
+        self.assertEqual((done["created"], done["invalid"]), (1, 4))
+        self.assertEqual(done["errors"], [
+            {"line": 2, "error": "invalid email: not-an-email"},
+            {"line": 4, "error": "name is required"},
+            {"line": 5, "error": "invalid phone: 12"},
+            {"line": 6, "error": "party size must be between 1 and 20"},
+        ])
+
+    def test_save_failure_ends_the_stream_with_an_error(self):
+        with mock.patch.object(Guest.objects, "bulk_create", side_effect=IntegrityError):
+            *_, done = self._import("name\nAsha\n")
+        self.assertTrue(done["done"])
+        self.assertIn("could not be saved", done["error"])
+        self.assertFalse(Guest.objects.exists())
+
+    def test_personal_link_greets_the_guest(self):
+        self._import("name,party size\nAsha,2\n")
+        token = self.client.get(f"/api/invites/{self.invite.id}/guests/").data["guests"][0]["token"]
+        public = APIClient()
+        response = public.get("/api/invite/invite-test/", {"guest": token})
+        self.assertEqual(response.data["guest"], {"name": "Asha", "party_size": 2})
+        self.assertNotIn("guest", public.get("/api/invite/invite-test/", {"guest": "wrong"}).data)
+        self.assertNotIn("guest", public.get("/api/invite/invite-test/").data)
+
+
+class InviteArchiveTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.invite = make_invite(expires_at=timezone.now() - timedelta(days=120))
+        self.summary = summarize_schema(SCHEMA)
+
+    def _archive(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return archive.archive_invites(days=90)
+
+    def _assert_summary_kept(self):
+        for field, value in self.summary.items():
+            self.assertEqual(getattr(self.invite, field), value, field)
+
+    def test_archive_and_restore_round_trip(self):
+        moved = self._archive()
+        self.assertEqual(moved["invites"], 1)
+        self.assertEqual(moved["schema_bytes"], schema_byte_size(SCHEMA))
+
+        self.invite.refresh_from_db()
+        self.assertTrue(self.invite.is_archived)
+        self.assertEqual(self.invite.schema, {})
+        self.assertEqual(self.invite.version, 1)
+        self._assert_summary_kept()
+        self.assertEqual(self._archive()["invites"], 0)
+
+        # Saving an archived invite (e.g. extending it) keeps the stub and the summary
+        self.invite.expires_at = timezone.now() + timedelta(days=30)
+        self.invite.save()
+        self.invite.refresh_from_db()
+        self.assertTrue(self.invite.is_archived)
+        self.assertEqual(self.invite.version, 1)
+        self._assert_summary_kept()
+        self.assertTrue(ArchivedInviteSchema.objects.filter(invite=self.invite).exists())
+
+        archive.restore_invite(self.invite)
+        self.assertEqual(self.invite.schema, SCHEMA)
+        self.invite.refresh_from_db()
+        self.assertEqual((self.invite.schema, self.invite.is_archived, self.invite.version), (SCHEMA, False, 1))
+        self._assert_summary_kept()
+        self.assertFalse(ArchivedInviteSchema.objects.exists())
+        # Restoring a hot invite is a no-op
+        self.assertIs(archive.restore_invite(self.invite), self.invite)
+
+    def test_reads_restore_the_schema(self):
+        self._archive()
+        response = APIClient().get("/api/invite/invite-test/")
+        self.assertEqual(response.status_code, 410)
+
+        InviteInstance.objects.filter(pk=self.invite.pk).update(expires_at=None)
+        client = APIClient()
+        client.force_authenticate(self.invite.order.user)
+        response = client.get(f"/api/invites/{self.invite.id}/")
+        self.assertEqual(response.data["schema"], SCHEMA)
+        self.assertFalse(InviteInstance.objects.get(pk=self.invite.pk).is_archived)
+
+
+class IdempotentView(APIView):
+    """Runs `handler`, so each test decides what an attempt does"""
+    handler = None
+
+    @idempotent("test")
+    def post(self, request):
+        return self.handler(request)
+
+
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="host@example.com", role="BUYER")
+        self.factory = APIRequestFactory()
+        self.calls = 0
+
+    def _post(self, handler, data=None, key="key-1"):
+        def counted(request):
+            self.calls += 1
+            return handler(request)
+
+        headers = {"HTTP_IDEMPOTENCY_KEY": key} if key is not None else {}
+        request = self.factory.post("/api/test/", data or {"amount": 499}, format="json", **headers)
+        force_authenticate(request, self.user)
+        return IdempotentView.as_view(handler=counted)(request)
+
+    def created(self, request):
+        return Response({"order": self.calls}, status=201)
+
+    def test_retry_replays_the_first_response(self):
+        first = self._post(self.created)
+        second = self._post(self.created)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual((second.status_code, second.data), (201, {"order": 1}))
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertFalse(first.has_header("Idempotent-Replayed"))
+
+        # Without the header every request runs
+        self._post(self.created, key=None)
+        self.assertEqual(self.calls, 2)
+
+    def test_different_body_gets_422(self):
+        self._post(self.created)
+        response = self._post(self.created, data={"amount": 999})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(self.calls, 1)
+
+    def test_invalid_key_gets_400(self):
+        for key in ("  ", "k" * 256):
+            self.assertEqual(self._post(self.created, key=key).status_code, 400)
+        self.assertEqual(self.calls, 0)
+
+    def test_retry_while_in_flight_gets_409(self):
+        def first(request):
+            # The client retries before the first attempt has finished
+            self.retry = self._post(self.created)
+            return self.created(request)
+
+        self._post(first)
+        self.assertEqual(self.retry.status_code, 409)
+        self.assertEqual(self.retry["Retry-After"], "1")
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self._post(self.created).status_code, 201)
+
+    def test_server_errors_and_exceptions_release_the_key(self):
+        self.assertEqual(self._post(lambda request: Response(status=503)).status_code, 503)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        with self.assertRaises(RuntimeError):
+            self._post(mock.Mock(side_effect=RuntimeError))
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        self.assertEqual(self._post(self.created).data, {"order": 3})
+        self.assertEqual(IdempotencyKey.objects.get().status_code, 201)
+
+    def test_stale_claim_is_taken_over(self):
+        claim = IdempotencyKey.objects.create(
+            user=self.user, scope="test", key="key-1", request_hash="crashed",
+            expires_at=timezone.now() + timedelta(days=1),
+        )
+        IdempotencyKey.objects.filter(pk=claim.pk).update(
+            created_at=timezone.now() - timedelta(seconds=idempotency.CLAIM_TIMEOUT + 1)
+        )
+        response = self._post(self.created)
+        self.assertEqual((response.status_code, self.calls), (201, 1))
+        self.assertEqual(IdempotencyKey.objects.get().status_code, 201)
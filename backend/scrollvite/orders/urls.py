@@ -4,13 +4,25 @@ from .views import (
     CreatePaymentOrderView, 
     VerifyPaymentView, 
     MyTemplatesView,
-    UploadInviteImageView 
+    UploadInviteImageView,
+    InviteRSVPSummaryView,
+    GuestListView,
+    GuestImportView,
+    OrderExportView,
+    SalesAnalyticsView,
+    GatewayMetricsView,
 )
 
 urlpatterns = [
     path("invites/<uuid:invite_id>/", InviteInstanceDetailView.as_view(), name="invite-detail"),
     path("invites/<uuid:invite_id>/upload-image/", UploadInviteImageView.as_view(), name="upload-invite-image"),  # ADD THIS
+    path("invites/<uuid:invite_id>/rsvps/", InviteRSVPSummaryView.as_view(), name="invite-rsvps"),
+    path("invites/<uuid:invite_id>/guests/", GuestListView.as_view(), name="invite-guests"),
+    path("invites/<uuid:invite_id>/guests/import/", GuestImportView.as_view(), name="invite-guests-import"),
     path("create-payment-order/<int:template_id>/", CreatePaymentOrderView.as_view(), name="create-payment-order"),
     path("verify-payment/", VerifyPaymentView.as_view(), name="verify-payment"),
     path("my-templates/", MyTemplatesView.as_view(), name="my-templates"),
+    path("admin/orders/export/", OrderExportView.as_view(), name="order-export"),
+    path("admin/analytics/sales/", SalesAnalyticsView.as_view(), name="sales-analytics"),
+    path("admin/gateway/metrics/", GatewayMetricsView.as_view(), name="gateway-metrics"),
 ]
\ No newline at end of file
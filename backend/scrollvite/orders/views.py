@@ -6,34 +6,60 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 from django.shortcuts import get_object_or_404
+from django.http import StreamingHttpResponse
 from django.conf import settings
 from django.utils import timezone
-from django.core.mail import send_mail
+from django.utils.dateparse import parse_date
 from django.db import transaction
 from .models import InviteInstance, Payment
+from .autosave import (
+    SaveInProgress, VersionConflict, current_state, flush_due_draft, parse_if_match, save_schema,
+    window_remaining,
+)
+from .analytics import get_invite_analytics
+from .archive import restore_invite
+from .gateway import GatewayUnavailable, call_gateway, gateway_metrics
+from .dates import InvalidDate, date_range
+from .exports import FORMATS, iter_export
+from .idempotency import idempotent
+from .guest_import import import_guests, stream_progress
+from .rsvp import get_rsvp_summary
+from .rollups import GROUPS, default_range, record_order, record_payment, sales_report
+from scrollvite.throttling import BucketThrottle
 from templates_app.models import Order, Template
-import razorpay
-import copy
+from templates_app.schema_validation import validate_schema, InvalidSchema
+from templates_app.permissions import IsSuperAdmin
+from scrollvite.db_router import ReplicaReadMixin
 import uuid
 import hmac
 import hashlib
 from datetime import timedelta
 from django.core.files.storage import default_storage
-from PIL import Image
 import os
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Initialize Razorpay client
-razorpay_client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
+
+def gateway_unavailable(error, message):
+    """503 telling the client when to retry a payment call"""
+    return Response(
+        {"error": message, "retryable": True},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(error.retry_after)}
+    )
 
 
 class CreatePaymentOrderView(APIView):
     """Create Razorpay order for payment with duplicate prevention"""
     permission_classes = [IsAuthenticated]
+    throttle_classes = [BucketThrottle]
+    throttle_scope = "payment"
 
+    @idempotent("create-payment-order")
     def post(self, request, template_id):
+        from razorpay.errors import BadRequestError
+
         # Validate template exists and is available
         template = get_object_or_404(
             Template, 
@@ -98,9 +124,12 @@ class CreatePaymentOrderView(APIView):
                 user=request.user,
                 template=template,
                 amount=template.price,
-                schema_snapshot=copy.deepcopy(template.schema),
+                template_version_id=template.get_version_id(),
                 status="PENDING"
             )
+            # Counted now so the post_delete handler can take it off again
+            # if the gateway call below fails and the order is deleted
+            record_order(order)
 
             # Create Razorpay order
             razorpay_order_data = {
@@ -117,7 +146,7 @@ class CreatePaymentOrderView(APIView):
             }
 
             try:
-                razorpay_order = razorpay_client.order.create(data=razorpay_order_data)
+                razorpay_order = call_gateway("order.create", data=razorpay_order_data)
                 
                 # Create payment record with idempotency
                 payment = Payment.objects.create(
@@ -138,7 +167,11 @@ class CreatePaymentOrderView(APIView):
                     "template_title": template.title,
                 })
 
-            except razorpay.errors.BadRequestError as e:
+            except GatewayUnavailable as e:
+                logger.warning(f"Payment gateway unavailable creating order {order.id}: {e}")
+                order.delete()
+                return gateway_unavailable(e, "Payment gateway is busy. Please try again in a moment.")
+            except BadRequestError as e:
                 logger.error(f"Razorpay error: {str(e)}")
                 order.delete()
                 return Response(
@@ -157,8 +190,13 @@ class CreatePaymentOrderView(APIView):
 class VerifyPaymentView(APIView):
     """Verify Razorpay payment with comprehensive security checks"""
     permission_classes = [IsAuthenticated]
+    throttle_classes = [BucketThrottle]
+    throttle_scope = "payment"
 
+    @idempotent("verify-payment")
     def post(self, request):
+        from razorpay.errors import BadRequestError
+
         razorpay_order_id = request.data.get('razorpay_order_id')
         razorpay_payment_id = request.data.get('razorpay_payment_id')
         razorpay_signature = request.data.get('razorpay_signature')
@@ -226,45 +264,15 @@ class VerifyPaymentView(APIView):
 
             # Validation 6: Fetch payment from Razorpay API to verify amount and status
             try:
-                razorpay_payment = razorpay_client.payment.fetch(razorpay_payment_id)
-                
-                # Check payment status from Razorpay
-                if razorpay_payment.get('status') != 'captured' and razorpay_payment.get('status') != 'authorized':
-                    logger.error(f"Payment {razorpay_payment_id} status is {razorpay_payment.get('status')}")
-                    payment.status = "FAILED"
-                    payment.save()
-                    return Response(
-                        {"error": f"Payment not successful. Status: {razorpay_payment.get('status')}"},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-                
-                # Validation 7: Verify amount matches (prevent amount manipulation)
-                expected_amount = int(payment.amount * 100)  # Convert to paise
-                actual_amount = razorpay_payment.get('amount')
-                
-                if actual_amount != expected_amount:
-                    logger.error(
-                        f"Amount mismatch: Expected {expected_amount}, Got {actual_amount} "
-                        f"for payment {razorpay_payment_id}"
-                    )
-                    payment.status = "FAILED"
-                    payment.save()
-                    return Response(
-                        {"error": "Payment amount verification failed"},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-                
-                # Validation 8: Verify order_id matches
-                if razorpay_payment.get('order_id') != razorpay_order_id:
-                    logger.error(f"Order ID mismatch for payment {razorpay_payment_id}")
-                    payment.status = "FAILED"
-                    payment.save()
-                    return Response(
-                        {"error": "Payment verification failed - order mismatch"},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-
-            except razorpay.errors.BadRequestError as e:
+                razorpay_payment = call_gateway("payment.fetch", razorpay_payment_id)
+            except GatewayUnavailable as e:
+                # The payment may well be captured: keep it PENDING and let
+                # the client retry (a retry re-runs every check)
+                logger.warning(f"Payment gateway unavailable verifying payment {razorpay_payment_id}: {e}")
+                return gateway_unavailable(
+                    e, "Could not confirm your payment with the payment gateway yet. Please retry in a moment."
+                )
+            except BadRequestError as e:
                 logger.error(f"Razorpay API error fetching payment {razorpay_payment_id}: {str(e)}")
                 payment.status = "FAILED"
                 payment.save()
@@ -272,11 +280,41 @@ class VerifyPaymentView(APIView):
                     {"error": "Payment verification failed - could not verify with payment gateway"},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            except Exception as e:
-                logger.error(f"Unexpected error verifying payment {razorpay_payment_id}: {str(e)}")
+
+            # Check payment status from Razorpay
+            if razorpay_payment.get('status') != 'captured' and razorpay_payment.get('status') != 'authorized':
+                logger.error(f"Payment {razorpay_payment_id} status is {razorpay_payment.get('status')}")
+                payment.status = "FAILED"
+                payment.save()
                 return Response(
-                    {"error": "Payment verification failed - unexpected error"},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                    {"error": f"Payment not successful. Status: {razorpay_payment.get('status')}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            # Validation 7: Verify amount matches (prevent amount manipulation)
+            expected_amount = int(payment.amount * 100)  # Convert to paise
+            actual_amount = razorpay_payment.get('amount')
+
+            if actual_amount != expected_amount:
+                logger.error(
+                    f"Amount mismatch: Expected {expected_amount}, Got {actual_amount} "
+                    f"for payment {razorpay_payment_id}"
+                )
+                payment.status = "FAILED"
+                payment.save()
+                return Response(
+                    {"error": "Payment amount verification failed"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            # Validation 8: Verify order_id matches
+            if razorpay_payment.get('order_id') != razorpay_order_id:
+                logger.error(f"Order ID mismatch for payment {razorpay_payment_id}")
+                payment.status = "FAILED"
+                payment.save()
+                return Response(
+                    {"error": "Payment verification failed - order mismatch"},
+                    status=status.HTTP_400_BAD_REQUEST
                 )
 
             # Validation 9: Verify template is still available
@@ -302,18 +340,20 @@ class VerifyPaymentView(APIView):
             # Update order status
             order.status = "ACTIVE"
             order.save()
+            record_payment(payment, order)
 
-            # Calculate expiry date based on wedding date
-            expires_at = self._calculate_expiry_date(order.schema_snapshot)
-
-            # Create invite instance
-            invite = InviteInstance.objects.create(
+            # Create invite instance; summary columns (incl. wedding_date)
+            # are derived from the schema before the expiry is calculated
+            invite = InviteInstance(
                 order=order,
                 template=template,
-                schema=copy.deepcopy(order.schema_snapshot),
+                template_version_id=order.template_version_id,
+                schema=order.purchased_schema(),
                 public_slug=f"invite-{uuid.uuid4().hex[:10]}",
-                expires_at=expires_at
             )
+            invite.refresh_summary()
+            invite.expires_at = self._calculate_expiry_date(invite.wedding_date)
+            invite.save()
 
             logger.info(f"Payment verified successfully: Order {order.id}, Invite {invite.id}")
 
@@ -333,21 +373,14 @@ class VerifyPaymentView(APIView):
                 "message": "Payment successful! Your template is ready."
             })
 
-    def _calculate_expiry_date(self, schema):
+    def _calculate_expiry_date(self, wedding_date):
         """Calculate invite expiry date based on wedding date"""
         expires_at = None
-        try:
-            from django.utils.dateparse import parse_date
-            wedding_date_str = schema.get('hero', {}).get('wedding_date')
-            if wedding_date_str:
-                wedding_date = parse_date(wedding_date_str)
-                if wedding_date:
-                    from datetime import datetime as dt
-                    wedding_datetime = dt.combine(wedding_date, dt.min.time())
-                    wedding_datetime = timezone.make_aware(wedding_datetime)
-                    expires_at = wedding_datetime + timedelta(days=30)
-        except (ValueError, TypeError) as e:
-            logger.warning(f"Error parsing wedding date: {e}")
+        if wedding_date:
+            from datetime import datetime as dt
+            wedding_datetime = dt.combine(wedding_date, dt.min.time())
+            wedding_datetime = timezone.make_aware(wedding_datetime)
+            expires_at = wedding_datetime + timedelta(days=30)
         
         # Fallback: 3 months from now if wedding date invalid
         if not expires_at:
@@ -356,72 +389,14 @@ class VerifyPaymentView(APIView):
         return expires_at
 
     def _send_purchase_emails(self, order, invite):
-        """Send beautiful HTML emails to buyer and admin"""
-        from django.core.mail import EmailMultiAlternatives
-        from .email_templates import get_purchase_email_html, get_admin_notification_email_html
-        
-        # Get user's name or email
-        user_name = order.user.username if order.user.username else order.user.email.split('@')[0]
-        
-        # === BUYER EMAIL ===
-        buyer_subject = f"Your {order.template.title} is Ready! 🎉"
-        
-        # Text version (fallback for email clients that don't support HTML)
-        buyer_text = f"""
-Hi {user_name},
-
-Thank you for your purchase!
+        """Send buyer and (unless digest-only) admin emails over one connection"""
+        from .email_templates import build_admin_notification_email, build_purchase_email
+        from .mailer import send_bulk
 
-Template: {order.template.title}
-Amount Paid: ₹{order.amount}
-
-Your invite is ready to customize:
-Edit: {settings.FRONTEND_URL}/editor/{invite.id}
-Public Link: {settings.FRONTEND_URL}/invite/{invite.public_slug}
-
-Best regards,
-ScrollVite Team
-        """
-        
-        # HTML version (beautiful template)
-        buyer_html = get_purchase_email_html(order, invite, settings.FRONTEND_URL)
-        
-        # Send email with both versions
-        buyer_email = EmailMultiAlternatives(
-            subject=buyer_subject,
-            body=buyer_text,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[order.user.email]
-        )
-        buyer_email.attach_alternative(buyer_html, "text/html")
-        buyer_email.send(fail_silently=True)
-        
-        # === ADMIN EMAIL ===
-        admin_subject = f"🎉 New Purchase: {order.template.title}"
-        
-        # Text version
-        admin_text = f"""
-New purchase received!
-
-Customer: {order.user.email}
-Template: {order.template.title}
-Amount: ₹{order.amount}
-Order ID: {order.id}
-Date: {order.created_at}
-        """
-        
-        # HTML version
-        admin_html = get_admin_notification_email_html(order)
-        
-        # Send email
-        admin_email = EmailMultiAlternatives(
-            subject=admin_subject,
-            body=admin_text,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[settings.ADMIN_EMAIL]
-        )
-        admin_email.attach_alternative(admin_html, "text/html")
-        admin_email.send(fail_silently=True)
+        messages = [build_purchase_email(order, invite)]
+        if settings.ADMIN_PURCHASE_EMAIL:
+            messages.append(build_admin_notification_email(order))
+        send_bulk(messages)
 
 
 # Keep all other views (InviteInstanceDetailView, MyTemplatesView, etc.) as they are
@@ -434,47 +409,120 @@ class InviteInstanceDetailView(APIView):
 
     def get(self, request, invite_id):
         invite = get_object_or_404(
-            InviteInstance,
+            InviteInstance.objects.select_related('template'),
             id=invite_id,
             order__user=request.user
         )
+        restore_invite(invite)
+        try:
+            flush_due_draft(invite)
+        except (VersionConflict, SaveInProgress) as e:
+            logger.info(f"Draft of invite {invite.id} not flushed: {e}")
+
+        # Owner sees their latest autosave even if it isn't persisted yet
+        schema, version = current_state(invite)
 
         return Response({
             "id": str(invite.id),
             "template_title": invite.template.title,
             "template_component": invite.template.template_component,
-            "schema": invite.schema,
+            "schema": schema,
+            "version": version,
             "public_slug": invite.public_slug,
             "is_active": invite.is_active,
             "expires_at": invite.expires_at,
-        })
+            "analytics": get_invite_analytics(invite),
+        }, headers={"ETag": f'"{version}"'})
 
     def put(self, request, invite_id):
         invite = get_object_or_404(
-            InviteInstance,
+            InviteInstance.objects.select_related('template'),
             id=invite_id,
             order__user=request.user
         )
+        restore_invite(invite)
+
+        version, persisted = invite.version, True
 
         if "schema" in request.data:
-            invite.schema = request.data["schema"]
-            invite.save()
+            try:
+                validate_schema(invite.template.template_component, request.data["schema"])
+            except InvalidSchema as e:
+                return Response(
+                    {"error": f"Invalid schema: {e}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
 
+            try:
+                version, persisted = save_schema(
+                    invite,
+                    request.data["schema"],
+                    expected_version=parse_if_match(request.headers.get("If-Match")),
+                    autosave=request.headers.get("X-Autosave", "").lower() in ("1", "true"),
+                )
+            except VersionConflict as e:
+                logger.info(f"Version conflict on invite {invite.id}: {e}")
+                return Response({
+                    "error": "This invite was changed in another window. Reload to get the latest version.",
+                    "current_version": e.current_version,
+                }, status=status.HTTP_409_CONFLICT, headers={"ETag": f'"{e.current_version}"'})
+            except SaveInProgress:
+                return Response(
+                    {"error": "Another save of this invite is in progress. Please retry shortly."},
+                    status=status.HTTP_409_CONFLICT,
+                    headers={"Retry-After": "1"}
+                )
+
+        headers = {"ETag": f'"{version}"'}
+        if not persisted:
+            # Buffered: the client re-sends a plain save once the window closes
+            headers["Retry-After"] = str(max(1, window_remaining(invite.pk)))
         return Response({
-            "status": "saved",
+            "status": "saved" if persisted else "buffered",
             "id": str(invite.id),
             "public_slug": invite.public_slug,
-        })
+            "version": version,
+        }, status=status.HTTP_200_OK if persisted else status.HTTP_202_ACCEPTED,
+            headers=headers)
     
     
-class MyTemplatesView(APIView):
+class MyTemplatesView(ReplicaReadMixin, APIView):
     """Get all templates purchased by the user"""
     permission_classes = [IsAuthenticated]
 
+    ORDERING_FIELDS = {
+        "created_at": "created_at",
+        "-created_at": "-created_at",
+        "wedding_date": "wedding_date",
+        "-wedding_date": "-wedding_date",
+    }
+
     def get(self, request):
+        # Only summary columns are needed here; the schema JSON of the
+        # invite, template and order is never loaded
         invites = InviteInstance.objects.filter(
             order__user=request.user
-        ).select_related('template', 'order').order_by('-created_at')
+        ).select_related('template').only(
+            'id', 'public_slug', 'created_at', 'expires_at',
+            'bride_name', 'groom_name', 'hero_image', 'wedding_date',
+            'template__id', 'template__title', 'template__template_component',
+        )
+
+        # Optional filters: ?wedding_after=YYYY-MM-DD&wedding_before=YYYY-MM-DD
+        wedding_after = self._query_date(request, 'wedding_after')
+        wedding_before = self._query_date(request, 'wedding_before')
+        if wedding_after:
+            invites = invites.filter(wedding_date__gte=wedding_after)
+        if wedding_before:
+            invites = invites.filter(wedding_date__lte=wedding_before)
+
+        ordering = self.ORDERING_FIELDS.get(
+            request.query_params.get('ordering'), '-created_at'
+        )
+        if ordering.lstrip('-') == 'created_at':
+            invites = invites.order_by(ordering)
+        else:
+            invites = invites.order_by(ordering, '-created_at')
 
         data = []
         for invite in invites:
@@ -487,13 +535,156 @@ class MyTemplatesView(APIView):
                 "created_at": invite.created_at,
                 "expires_at": invite.expires_at,
                 "is_expired": invite.is_expired(),
-                "bride_name": invite.schema.get('hero', {}).get('bride_name', ''),
-                "groom_name": invite.schema.get('hero', {}).get('groom_name', ''),
-                "schema": invite.schema,
+                "bride_name": invite.bride_name,
+                "groom_name": invite.groom_name,
+                "hero_image": invite.hero_image or None,
+                "wedding_date": invite.wedding_date,
             })
 
         return Response(data)
 
+    def _query_date(self, request, name):
+        try:
+            return parse_date(request.query_params.get(name) or '')
+        except ValueError:
+            return None
+
+
+class InviteRSVPSummaryView(APIView):
+    """Host's RSVP dashboard: per-event tallies and the latest answers"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, invite_id):
+        invite = get_object_or_404(
+            InviteInstance.objects.only('id', 'public_slug', 'schema', 'is_archived'),
+            id=invite_id,
+            order__user=request.user
+        )
+        restore_invite(invite)
+        # Tallies are counted by the aggregate_rsvps cron command; this only reads them
+        return Response(get_rsvp_summary(invite))
+
+
+class GuestImportView(APIView):
+    """
+    Import a guest-list CSV (multipart "file"; columns name, email, phone,
+    party size). Streams NDJSON progress, ending with a "done" summary.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, invite_id):
+        invite = get_object_or_404(
+            InviteInstance.objects.only('id'),
+            id=invite_id,
+            order__user=request.user
+        )
+
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST)
+        if upload.size > settings.GUEST_IMPORT_MAX_BYTES:
+            return Response(
+                {"error": f"File too large. Maximum size is {settings.GUEST_IMPORT_MAX_BYTES // (1024 * 1024)}MB."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return StreamingHttpResponse(
+            stream_progress(import_guests(invite, upload.file)),
+            content_type="application/x-ndjson",
+        )
+
+
+class GuestListView(APIView):
+    """Host's guest list with personal links; ?offset=&limit= (max 1000)"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, invite_id):
+        invite = get_object_or_404(
+            InviteInstance.objects.only('id', 'public_slug'),
+            id=invite_id,
+            order__user=request.user
+        )
+        try:
+            offset = max(int(request.query_params.get("offset", 0)), 0)
+            limit = min(max(int(request.query_params.get("limit", 100)), 1), 1000)
+        except ValueError:
+            return Response({"error": "offset and limit must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+
+        guests = invite.guests.order_by("id").values(
+            "id", "name", "email", "phone", "party_size", "token"
+        )[offset:offset + limit]
+        return Response({
+            "count": invite.guests.count(),
+            "guests": [
+                {**guest, "invite_url": f"/invite/{invite.public_slug}?guest={guest['token']}"}
+                for guest in guests
+            ],
+        })
+
+
+class OrderExportView(APIView):
+    """
+    Stream orders with their payment, buyer and template for accounting.
+    ?format=csv|ndjson, ?start=/?end= (YYYY-MM-DD, inclusive), ?status=
+    """
+    permission_classes = [IsAuthenticated, IsSuperAdmin]
+
+    def perform_content_negotiation(self, request, force=False):
+        # ?format= picks the export format here, not a DRF renderer
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request):
+        fmt = request.query_params.get("format", "csv")
+        if fmt not in FORMATS:
+            return Response(
+                {"error": f"format must be one of: {', '.join(FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        order_status = request.query_params.get("status")
+        if order_status and order_status not in dict(Order.STATUS_CHOICES):
+            return Response({"error": "Invalid status"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            dates = date_range(request.query_params)
+        except InvalidDate as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(
+            iter_export(fmt, status=order_status, **dates),
+            content_type=FORMATS[fmt],
+        )
+        filename = f"orders-{timezone.localdate():%Y%m%d}.{fmt}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class SalesAnalyticsView(ReplicaReadMixin, APIView):
+    """
+    Sales dashboard from the daily rollups.
+    ?start=/?end= (YYYY-MM-DD, inclusive; default last 30 days),
+    ?group_by=date|template|category|region
+    """
+    permission_classes = [IsAuthenticated, IsSuperAdmin]
+
+    def get(self, request):
+        group_by = request.query_params.get("group_by", "date")
+        if group_by not in GROUPS:
+            return Response(
+                {"error": f"group_by must be one of: {', '.join(GROUPS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            dates = date_range(request.query_params, *default_range())
+        except InvalidDate as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if dates["start"] > dates["end"]:
+            return Response({"error": "start must not be after end"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(sales_report(dates["start"], dates["end"], group_by))
+
 
 class UploadInviteImageView(APIView):
     """Upload and resize images for invite instances"""
@@ -529,6 +720,8 @@ class UploadInviteImageView(APIView):
             )
         
         try:
+            from PIL import Image  # imported on first upload, not at boot
+
             img = Image.open(image_file)
             
             if img.mode == 'RGBA':
@@ -605,6 +798,8 @@ class UploadTemplateImageView(APIView):
             )
         
         try:
+            from PIL import Image  # imported on first upload, not at boot
+
             img = Image.open(image_file)
             
             if img.mode == 'RGBA':
@@ -641,4 +836,14 @@ class UploadTemplateImageView(APIView):
             return Response(
                 {"error": f"Failed to process image: {str(e)}"}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+class GatewayMetricsView(APIView):
+    """
+    Payment gateway circuit breakers: state (closed/open/half_open) and call,
+    failure, slow-call and rejected counts over the breaker window
+    """
+    permission_classes = [IsAuthenticated, IsSuperAdmin]
+
+    def get(self, request):
+        return Response({"breakers": gateway_metrics()})
@@ -1,3 +1,4 @@
 from django.contrib import admin
 
-# Register your models here.
+# Intentionally empty: this app has no models yet. The Payment model lives
+# in orders, and its admin is in orders/admin.py.
@@ -5,6 +5,12 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
+
+The public read endpoints (InviteView, PreviewTemplatesView,
+TemplatePreviewDetailView, CategoryListView) are async views and run
+without a thread hop when served over ASGI, e.g.:
+
+    uvicorn scrollvite.asgi:application --workers 4
 """
 
 import os
@@ -0,0 +1,37 @@
+"""
+Async cache helpers.
+
+Django's cache backends implement ``aget``/``aset`` by pushing the sync call
+through ``sync_to_async``, i.e. a hop to the thread-sensitive executor that
+every async request has to queue for. The local-memory backend never does
+I/O, so for it these helpers call the sync method directly; other backends
+get the regular async API.
+"""
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def _is_local(cache):
+    return isinstance(cache, LocMemCache)
+
+
+async def cache_aget(key, default=None, alias="default"):
+    cache = caches[alias]
+    if _is_local(cache):
+        return cache.get(key, default)
+    return await cache.aget(key, default)
+
+
+async def cache_aset(key, value, timeout, alias="default"):
+    cache = caches[alias]
+    if _is_local(cache):
+        cache.set(key, value, timeout)
+    else:
+        await cache.aset(key, value, timeout)
+
+
+async def cache_aadd(key, value, timeout, alias="default"):
+    cache = caches[alias]
+    if _is_local(cache):
+        return cache.add(key, value, timeout)
+    return await cache.aadd(key, value, timeout)
@@ -0,0 +1,103 @@
+"""
+Read-replica routing.
+
+Writes always go to ``default``. Reads go to a replica (random pick from
+``settings.DATABASE_REPLICAS``) only while replica reads are switched on for
+the current request/task, which views opt into with ``ReplicaReadMixin``.
+
+A user who has just written something is pinned to the primary for
+``REPLICA_PIN_SECONDS`` (see ``PrimaryPinMiddleware``), so the editor always
+reads its own saves even if the replicas lag behind.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+
+_use_replica = ContextVar("use_replica", default=False)
+
+
+def get_replicas():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+# ===================== PINNING =====================
+
+def _pin_key(user_id):
+    return f"db-pin:{user_id}"
+
+
+def pin_to_primary(user_id):
+    """Send this user's reads to the primary for the next few seconds"""
+    if not get_replicas():
+        return
+    caches[settings.REPLICA_PIN_CACHE_ALIAS].set(
+        _pin_key(user_id), True, settings.REPLICA_PIN_SECONDS
+    )
+
+
+def is_pinned(user):
+    if not user or not user.is_authenticated:
+        return False
+    return bool(caches[settings.REPLICA_PIN_CACHE_ALIAS].get(_pin_key(user.pk)))
+
+
+# ===================== READ SELECTION =====================
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Route reads inside the block to a replica (if any are configured)"""
+    token = _use_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReplicaReadMixin:
+    """
+    For APIViews whose GETs can tolerate replica lag.
+
+    The decision is taken after authentication, so pinned users keep
+    reading from the primary.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and get_replicas() and not is_pinned(request.user):
+            # Plain set/clear rather than a reset token: async views run
+            # initial() in a worker thread, whose context is copied back
+            _use_replica.set(True)
+            self._reading_from_replica = True
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if getattr(self, "_reading_from_replica", False):
+            _use_replica.set(False)
+            self._reading_from_replica = False
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = get_replicas()
+        if replicas and _use_replica.get():
+            return random.choice(replicas)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {"default", *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary through replication
+        if db in get_replicas():
+            return False
+        return None
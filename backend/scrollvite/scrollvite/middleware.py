@@ -0,0 +1,200 @@
+"""
+Project-wide middleware.
+
+CompressionMiddleware replaces Django's GZipMiddleware: it negotiates
+brotli (if the ``brotli`` package is installed) or gzip, only compresses
+bodies above ``COMPRESSION_MIN_SIZE``, and caches the compressed bytes of
+public, cacheable responses (invites, previews) keyed by a hash of the
+uncompressed body so the same payload is never compressed twice.
+
+PrimaryPinMiddleware pins a user's reads to the primary database after
+they write (see scrollvite/db_router.py).
+"""
+import gzip
+import hashlib
+import re
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from .caching import cache_aget, cache_aset
+from .db_router import pin_to_primary
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "text/",
+    "image/svg+xml",
+)
+
+_accept_encoding_re = re.compile(r"\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?")
+
+
+def parse_accept_encoding(header):
+    """Return {coding: q} for an Accept-Encoding header"""
+    codings = {}
+    for part in header.split(","):
+        match = _accept_encoding_re.match(part)
+        if not match:
+            continue
+        coding, q = match.group(1).lower(), match.group(2)
+        try:
+            codings[coding] = float(q) if q is not None else 1.0
+        except ValueError:
+            codings[coding] = 0.0
+    return codings
+
+
+def choose_encoding(header):
+    """Pick the best supported encoding for a request, or None"""
+    if not header:
+        return None
+    codings = parse_accept_encoding(header)
+    wildcard = codings.get("*", 0.0)
+
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_q = None, 0.0
+    for coding in candidates:
+        q = codings.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    # mtime=0 keeps output deterministic for identical input
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Negotiated gzip/brotli compression with a cache for public responses"""
+
+    def process_response(self, request, response):
+        encoding = self._negotiate(request, response)
+        if encoding is None:
+            return response
+
+        if self._is_cacheable(request):
+            key = self._cache_key(response.content, encoding)
+            cache = caches[settings.COMPRESSION_CACHE_ALIAS]
+            compressed = cache.get(key)
+            if compressed is None:
+                compressed = compress(response.content, encoding)
+                cache.set(key, compressed, settings.COMPRESSION_CACHE_TIMEOUT)
+        else:
+            compressed = compress(response.content, encoding)
+
+        return self._apply(response, compressed, encoding)
+
+    async def __acall__(self, request):
+        # Native async path: MiddlewareMixin would run process_response in
+        # the thread-sensitive executor
+        response = await self.get_response(request)
+        encoding = self._negotiate(request, response)
+        if encoding is None:
+            return response
+
+        if self._is_cacheable(request):
+            key = self._cache_key(response.content, encoding)
+            compressed = await cache_aget(key, alias=settings.COMPRESSION_CACHE_ALIAS)
+            if compressed is None:
+                compressed = compress(response.content, encoding)
+                await cache_aset(
+                    key, compressed, settings.COMPRESSION_CACHE_TIMEOUT,
+                    alias=settings.COMPRESSION_CACHE_ALIAS,
+                )
+        else:
+            compressed = compress(response.content, encoding)
+
+        return self._apply(response, compressed, encoding)
+
+    def _negotiate(self, request, response):
+        """Encoding to compress this response with, or None to leave it alone"""
+        if response.streaming or response.has_header("Content-Encoding"):
+            return None
+        if response.status_code != 200:
+            return None
+
+        content_type = response.get("Content-Type", "").lower()
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return None
+
+        # Vary even when this particular body isn't compressed, so caches
+        # don't serve a small identity response to everyone
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return None
+
+        return choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+
+    def _apply(self, response, compressed, encoding):
+        # Return the original if compression doesn't help
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+
+        # The compressed body differs byte-for-byte, so a strong ETag no
+        # longer applies (same as django.middleware.gzip)
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+
+        return response
+
+    def _is_cacheable(self, request):
+        if request.method not in ("GET", "HEAD"):
+            return False
+        if request.META.get("HTTP_AUTHORIZATION"):
+            return False
+        return request.path.startswith(tuple(settings.COMPRESSION_CACHE_PATHS))
+
+    def _cache_key(self, body, encoding):
+        level = (
+            settings.COMPRESSION_BROTLI_QUALITY if encoding == "br"
+            else settings.COMPRESSION_GZIP_LEVEL
+        )
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        return f"compressed:{encoding}:{level}:{digest}"
+
+
+class PrimaryPinMiddleware(MiddlewareMixin):
+    """After a successful write, read-your-writes from the primary for a while"""
+
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+    def process_response(self, request, response):
+        user = self._user_to_pin(request, response)
+        if user is not None:
+            pin_to_primary(user.pk)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        user = self._user_to_pin(request, response)
+        if user is not None:
+            await sync_to_async(pin_to_primary)(user.pk)
+        return response
+
+    def _user_to_pin(self, request, response):
+        if request.method in self.SAFE_METHODS or response.status_code >= 400:
+            return None
+        # DRF copies the JWT-authenticated user onto the Django request
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return user
+        return None
@@ -0,0 +1,36 @@
+"""
+orjson-backed JSON parser for DRF.
+
+Drop-in replacement for ``rest_framework.parsers.JSONParser``. Bodies that
+aren't UTF-8, or that orjson rejects, are handed to the stock parser so
+error messages and edge cases (NaN handling, encodings) stay identical.
+"""
+import io
+
+from rest_framework.parsers import JSONParser
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser that decodes with orjson when it can"""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8')
+        if encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # Let the stdlib parser produce the usual ParseError
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+
@@ -0,0 +1,61 @@
+"""
+orjson-backed JSON renderer for DRF.
+
+Drop-in replacement for ``rest_framework.renderers.JSONRenderer``. If orjson
+is not installed, or a payload is something orjson can't encode (e.g. an int
+wider than 64 bits), rendering falls back to the stock DRF implementation, so
+output never changes shape.
+
+Datetimes, dates and times are passed through to DRF's ``JSONEncoder`` so
+they are formatted exactly as before ("Z" suffix for UTC, microseconds kept).
+Decimals go through the same encoder (float), UUIDs are encoded natively by
+orjson as the same canonical string. Known differences are cosmetic: floats
+use the shortest exponent form (``1e16`` instead of ``1e+16``) and NaN/inf
+encode as ``null`` instead of raising.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+    | orjson.OPT_NON_STR_KEYS
+) if orjson else 0
+
+_default_encoder = JSONEncoder()
+
+
+def _default(obj):
+    return _default_encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson when it can"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        # Pretty-printed output (?indent / browsable API) and custom encoders
+        # stay on the stdlib path
+        if orjson is None or self.encoder_class is not JSONEncoder:
+            return super().render(data, accepted_media_type, renderer_context)
+        renderer_context = renderer_context or {}
+        if self.ensure_ascii or not self.compact or self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        except (orjson.JSONEncodeError, TypeError):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Match DRF: escape U+2028/U+2029 for JavaScript compatibility
+        if b'\xe2\x80' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
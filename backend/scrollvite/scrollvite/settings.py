@@ -12,7 +12,8 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 import os
 from pathlib import Path
 from datetime import timedelta
-from decouple import config
+from decouple import config, Csv
+from corsheaders.defaults import default_headers
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -48,6 +49,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    "scrollvite.middleware.CompressionMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -55,6 +57,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    "scrollvite.middleware.PrimaryPinMiddleware",
 ]
 
 ROOT_URLCONF = 'scrollvite.urls'
@@ -87,6 +90,50 @@ DATABASES = {
     }
 }
 
+# SQLite production profile: WAL + tuned pragmas on every new connection,
+# persistent connections, and BEGIN IMMEDIATE for atomic() blocks so the
+# purchase transactions take the write lock up front (select_for_update()
+# is a no-op on SQLite). Enable with SQLITE_PRODUCTION=True.
+SQLITE_PRODUCTION = config('SQLITE_PRODUCTION', default=False, cast=bool)
+
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',      # durable with WAL, far fewer fsyncs
+    'PRAGMA busy_timeout=10000',      # ms to wait for a lock before SQLITE_BUSY
+    'PRAGMA cache_size=-20000',       # ~20 MB page cache per connection
+    'PRAGMA mmap_size=134217728',     # 128 MB memory-mapped reads
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA foreign_keys=ON',
+)
+
+SQLITE_PRODUCTION_OPTIONS = {
+    'init_command': '; '.join(SQLITE_PRAGMAS) + ';',
+    'transaction_mode': 'IMMEDIATE',
+}
+
+if SQLITE_PRODUCTION:
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=600, cast=int),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': SQLITE_PRODUCTION_OPTIONS,
+    })
+
+# Read replicas: comma-separated database NAMEs (SQLite paths today,
+# database names once on PostgreSQL) that share the default engine/options.
+# Safe reads from ReplicaReadMixin views go to a random replica; a user who
+# just wrote is pinned to the primary for REPLICA_PIN_SECONDS. The pin is
+# stored in the cache, so use a shared cache with more than one worker.
+DATABASE_REPLICAS = []
+for index, name in enumerate(config('DATABASE_REPLICA_NAMES', default='', cast=Csv()), start=1):
+    alias = f'replica{index}'
+    # Tests use the primary's test database (see templates_app/tests.py)
+    DATABASES[alias] = {**DATABASES['default'], 'NAME': name, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['scrollvite.db_router.ReplicaRouter']
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=int)
+REPLICA_PIN_CACHE_ALIAS = 'default'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -146,8 +193,43 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    # Token buckets for scrollvite.throttling.BucketThrottle: "rate:burst".
+    # Anonymous clients are keyed by IP, so keep public limits generous for
+    # guests sharing a venue's NAT.
+    "DEFAULT_THROTTLE_RATES": {
+        "invite": config('THROTTLE_INVITE', default='300/min:120'),
+        "catalog": config('THROTTLE_CATALOG', default='120/min:60'),
+        "auth": config('THROTTLE_AUTH', default='10/min:5'),
+        "payment": config('THROTTLE_PAYMENT', default='20/min:10'),
+        "rsvp": config('THROTTLE_RSVP', default='30/min:10'),
+    },
+    # Reverse proxies in front of Django that append to X-Forwarded-For.
+    # Client IPs (throttling, visitor counts) come from REMOTE_ADDR at 0,
+    # else from that many hops back in X-Forwarded-For; unset would trust
+    # whatever address a client puts in the header.
+    "NUM_PROXIES": config('NUM_PROXIES', default=0, cast=int),
 }
 
+# Empty keeps throttle buckets in process memory; name a cache alias (e.g.
+# "default" with REDIS_URL) to share them across workers.
+THROTTLE_CACHE_ALIAS = config('THROTTLE_CACHE_ALIAS', default='')
+THROTTLE_LOCAL_MAX_KEYS = 10000
+
+# orjson-backed JSON renderer/parser (falls back to stdlib json if orjson
+# isn't installed). Set FAST_JSON=False to use DRF's stock classes.
+FAST_JSON = config('FAST_JSON', default=True, cast=bool)
+
+if FAST_JSON:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = (
+        "scrollvite.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"] = (
+        "scrollvite.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    )
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
@@ -155,6 +237,130 @@ SIMPLE_JWT = {
 }
 
 CORS_ALLOW_ALL_ORIGINS = True
+CORS_ALLOW_HEADERS = (*default_headers, "if-match", "x-autosave", "idempotency-key")
+CORS_EXPOSE_HEADERS = ["ETag", "Retry-After", "Idempotent-Replayed"]
+
+# ===================== INVITE EDITOR AUTOSAVE =====================
+# Requests sent with X-Autosave are written to the DB at most once per
+# interval per invite; in between they are buffered in the cache.
+# 0 (the default) disables coalescing. Drafts must be visible to every
+# worker, so enabling it requires a shared cache (REDIS_URL, see
+# orders/checks.py). Run `manage.py flush_invite_drafts` from cron to
+# persist drafts of editors that went idle.
+
+INVITE_AUTOSAVE_INTERVAL = config('INVITE_AUTOSAVE_INTERVAL', default=0, cast=int)  # seconds
+INVITE_DRAFT_TIMEOUT = 60 * 60 * 24
+
+# ===================== INVITE VIEW ANALYTICS =====================
+# Public invite views are counted in memory and written as one increment per
+# invite per day, at most every INVITE_VIEW_FLUSH_INTERVAL seconds or once
+# INVITE_VIEW_FLUSH_MAX_KEYS invites are pending, whichever comes first.
+
+INVITE_VIEW_FLUSH_INTERVAL = config('INVITE_VIEW_FLUSH_INTERVAL', default=30, cast=int)  # seconds
+INVITE_VIEW_FLUSH_MAX_KEYS = config('INVITE_VIEW_FLUSH_MAX_KEYS', default=1000, cast=int)
+
+# ===================== RSVP =====================
+# Guest answers are inserted as-is; per-event tallies are recounted in
+# batches by `manage.py aggregate_rsvps` from cron, and the host's RSVP
+# dashboard only reads them. Answers younger than RSVP_SETTLE_SECONDS wait
+# for the next run.
+
+RSVP_AGGREGATE_BATCH = 5000
+RSVP_SETTLE_SECONDS = 2
+
+# ===================== GUEST LISTS =====================
+# Hosts upload guest-list CSVs (orders/guest_import.py); each guest gets a
+# personal link /invite/<slug>?guest=<token>
+
+GUEST_IMPORT_MAX_ROWS = config('GUEST_IMPORT_MAX_ROWS', default=100000, cast=int)
+GUEST_IMPORT_MAX_BYTES = 20 * 1024 * 1024
+
+# ===================== INVITE ARCHIVE =====================
+# `manage.py archive_invites` (cron) moves the schemas of invites expired
+# more than INVITE_ARCHIVE_AFTER_DAYS days into compressed cold storage
+# (orders/archive.py); they're restored when the owner opens the invite.
+
+INVITE_ARCHIVE_AFTER_DAYS = config('INVITE_ARCHIVE_AFTER_DAYS', default=90, cast=int)
+
+# ===================== SHARE IMAGES =====================
+# Open Graph cards for public invites (orders/share_image.py), stored under
+# MEDIA share/. Path to a .ttf/.otf font; Pillow's built-in font if empty.
+
+SHARE_IMAGE_FONT = config('SHARE_IMAGE_FONT', default='')
+
+# ===================== CACHE =====================
+# Local memory per process by default; set REDIS_URL to share the cache
+# (public responses, replica pins) across workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'scrollvite',
+    }
+}
+
+# Remembered 404s for unknown invite slugs, in their own bounded cache so
+# slug guessing can't evict real entries from the default cache
+CACHES['negative'] = {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'scrollvite-negative',
+    'OPTIONS': {'MAX_ENTRIES': config('NEGATIVE_CACHE_MAX_ENTRIES', default=10000, cast=int)},
+}
+
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    }
+    # Shared so a save on one worker clears the 404 on all of them;
+    # entries expire after PUBLIC_MISSING_CACHE_TIMEOUT
+    CACHES['negative'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'negative',
+    }
+
+# Seconds public invite/preview/category payloads stay cached
+# (model saves invalidate them immediately)
+PUBLIC_CACHE_TIMEOUT = config('PUBLIC_CACHE_TIMEOUT', default=60, cast=int)
+# Seconds an unknown/inactive invite slug is remembered as a 404
+PUBLIC_MISSING_CACHE_TIMEOUT = config('PUBLIC_MISSING_CACHE_TIMEOUT', default=300, cast=int)
+PUBLIC_MISSING_CACHE_ALIAS = 'negative'
+
+# ===================== ADMIN =====================
+# Unfiltered admin changelists of tables at least this large show the
+# database's row estimate instead of running COUNT(*) (PostgreSQL/MySQL)
+
+ADMIN_ESTIMATED_COUNT_THRESHOLD = config('ADMIN_ESTIMATED_COUNT_THRESHOLD', default=100000, cast=int)
+
+# ===================== SCHEMA VALIDATION =====================
+# Limits applied to template/invite schemas on save
+# (see templates_app/schema_validation.py for all keys and defaults)
+
+SCHEMA_LIMITS = {
+    'max_bytes': 256 * 1024,
+    'max_events': 30,
+    'max_photos': 60,
+}
+
+# ===================== RESPONSE COMPRESSION =====================
+# gzip always, brotli when the `brotli` package is installed.
+# Higher levels trade CPU for bandwidth.
+
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=1024, cast=int)  # bytes
+COMPRESSION_GZIP_LEVEL = config('COMPRESSION_GZIP_LEVEL', default=6, cast=int)  # 1-9
+COMPRESSION_BROTLI_QUALITY = config('COMPRESSION_BROTLI_QUALITY', default=5, cast=int)  # 0-11
+
+# Compressed bodies of public GET responses under these paths are cached
+# (keyed by a hash of the uncompressed body)
+COMPRESSION_CACHE_PATHS = (
+    '/api/invite/',
+    '/api/preview-templates/',
+    '/api/template-preview/',
+)
+COMPRESSION_CACHE_ALIAS = 'default'
+COMPRESSION_CACHE_TIMEOUT = 60 * 60  # 1 hour
 
 # Email Configuration (Gmail example)
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -162,12 +368,46 @@ EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='prinjalboruah@gmail.com')
-EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 ADMIN_EMAIL = config('ADMIN_EMAIL', 'admin@scrollvite.com')
-
-RAZORPAY_KEY_ID = config('RAZORPAY_KEY_ID')
-RAZORPAY_KEY_SECRET = config('RAZORPAY_KEY_SECRET')
+# orders.mailer.send_bulk reconnects after this many messages per SMTP session
+EMAIL_MESSAGES_PER_CONNECTION = config('EMAIL_MESSAGES_PER_CONNECTION', default=100, cast=int)
+
+# Admin purchase notifications: one email per purchase and/or a periodic
+# digest (`manage.py send_admin_digest` from cron; it only sends once
+# ADMIN_DIGEST_INTERVAL minutes have passed since the previous digest).
+ADMIN_PURCHASE_EMAIL = config('ADMIN_PURCHASE_EMAIL', default=True, cast=bool)
+ADMIN_DIGEST_INTERVAL = config('ADMIN_DIGEST_INTERVAL', default=60 * 24, cast=int)  # minutes
+ADMIN_DIGEST_TOP_ITEMS = 10
+
+# Empty values don't stop the project from loading (management commands,
+# tests); payment calls fail instead and `manage.py check --deploy` reports them
+RAZORPAY_KEY_ID = config('RAZORPAY_KEY_ID', default='')
+RAZORPAY_KEY_SECRET = config('RAZORPAY_KEY_SECRET', default='')
+RAZORPAY_TIMEOUT = config('RAZORPAY_TIMEOUT', default=10, cast=float)  # seconds per HTTP call
+
+# Local in-memory gateway with fault injection (orders/gateway_stub.py);
+# never enable in production
+RAZORPAY_STUB = config('RAZORPAY_STUB', default=False, cast=bool)
+RAZORPAY_STUB_FAILURE_RATE = config('RAZORPAY_STUB_FAILURE_RATE', default=0.0, cast=float)
+RAZORPAY_STUB_LATENCY = config('RAZORPAY_STUB_LATENCY', default=0.0, cast=float)  # seconds
+
+# Circuit breaker per gateway operation (orders/gateway.py): opens when
+# GATEWAY_BREAKER_FAILURE_RATE of at least GATEWAY_BREAKER_MIN_CALLS calls in
+# the last GATEWAY_BREAKER_WINDOW seconds failed or were slower than
+# GATEWAY_BREAKER_SLOW_CALL_SECONDS, then rejects calls (503 + Retry-After)
+# for GATEWAY_BREAKER_OPEN_SECONDS before letting a probe call through.
+GATEWAY_BREAKER_FAILURE_RATE = config('GATEWAY_BREAKER_FAILURE_RATE', default=0.5, cast=float)
+GATEWAY_BREAKER_SLOW_CALL_SECONDS = config('GATEWAY_BREAKER_SLOW_CALL_SECONDS', default=5, cast=float)
+GATEWAY_BREAKER_MIN_CALLS = config('GATEWAY_BREAKER_MIN_CALLS', default=10, cast=int)
+GATEWAY_BREAKER_WINDOW = 60  # seconds
+GATEWAY_BREAKER_OPEN_SECONDS = config('GATEWAY_BREAKER_OPEN_SECONDS', default=30, cast=int)
+
+# Payment endpoints accept an Idempotency-Key header (orders/idempotency.py);
+# retries within IDEMPOTENCY_KEY_TTL seconds replay the first response.
+# `manage.py purge_idempotency_keys` (cron) deletes expired keys.
+IDEMPOTENCY_KEY_TTL = config('IDEMPOTENCY_KEY_TTL', default=60 * 60 * 24, cast=int)
 
 # Backend URL for generating full image URLs
 BACKEND_URL = os.environ.get('BACKEND_URL', 'http://127.0.0.1:8000')
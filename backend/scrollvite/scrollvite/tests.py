@@ -0,0 +1,193 @@
+import gzip
+import json
+import uuid
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock, skipIf
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.conf import settings
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from . import middleware
+from .admin_tools import CreatedYearFilter
+from .middleware import CompressionMiddleware, choose_encoding
+from .renderers import FastJSONRenderer, orjson
+from .throttling import local_buckets, parse_rate
+from templates_app.models import Category, Order, Template
+from users.models import User
+
+
+@skipIf(orjson is None, "orjson is not installed")
+class FastJSONRendererTests(SimpleTestCase):
+    def assertSameOutput(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_matches_stdlib_renderer(self):
+        ist = dt_timezone(timedelta(hours=5, minutes=30))
+        self.assertSameOutput({
+            "id": uuid.UUID("7b0c1f3e-9d4a-4c55-8a39-1f2e3d4c5b6a"),
+            "price": Decimal("499.00"),
+            "created_at": datetime(2026, 10, 19, 9, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            "starts_at": datetime(2026, 12, 12, 18, 0, tzinfo=ist),
+            "naive": datetime(2026, 12, 12, 18, 0),
+            "wedding_date": date(2026, 12, 12),
+            "muhurat": time(7, 45, 30),
+            "guests": [{"name": "Asha   Vikram", "count": 2, "vip": True, "note": None}],
+            "unicode": "शुभ विवाह",
+        })
+
+    def test_non_str_keys(self):
+        data = {1: "one", 2.5: "two and a half", True: "yes", None: "none"}
+        self.assertEqual(
+            json.loads(FastJSONRenderer().render(data)),
+            json.loads(JSONRenderer().render(data)),
+        )
+
+    def test_nan_renders_as_null(self):
+        # The documented difference: the stdlib renderer refuses NaN/inf
+        with self.assertRaises(ValueError):
+            JSONRenderer().render({"ratio": float("nan")})
+        self.assertEqual(
+            FastJSONRenderer().render({"ratio": float("nan"), "max": float("inf")}),
+            b'{"ratio":null,"max":null}',
+        )
+
+    def test_falls_back_for_big_ints(self):
+        self.assertSameOutput({"big": 2 ** 70})
+
+
+@override_settings(COMPRESSION_MIN_SIZE=100, COMPRESSION_GZIP_LEVEL=6)
+class CompressionMiddlewareTests(SimpleTestCase):
+    body = json.dumps({"guests": ["Asha", "Vikram"] * 200}).encode()
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def _get(self, path="/api/invite/invite-test/", body=None, encoding="gzip, br", **extra):
+        response = HttpResponse(body or self.body, content_type="application/json")
+        response["ETag"] = '"abc"'
+        request = self.factory.get(path, HTTP_ACCEPT_ENCODING=encoding, **extra)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_choose_encoding(self):
+        self.assertIsNone(choose_encoding(""))
+        self.assertIsNone(choose_encoding("identity"))
+        self.assertIsNone(choose_encoding("gzip;q=0"))
+        self.assertEqual(choose_encoding("deflate, *;q=0.5"), "gzip")
+        with mock.patch.object(middleware, "brotli", object()):
+            self.assertEqual(choose_encoding("gzip, br"), "br")
+            self.assertEqual(choose_encoding("gzip;q=1.0, br;q=0.8"), "gzip")
+            self.assertEqual(choose_encoding("*"), "br")
+        with mock.patch.object(middleware, "brotli", None):
+            self.assertEqual(choose_encoding("br"), None)
+            self.assertEqual(choose_encoding("br, gzip;q=0.1"), "gzip")
+
+    def test_compresses_large_bodies(self):
+        response = self._get()
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(response["ETag"], 'W/"abc"')
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+        self.assertEqual(gzip.decompress(response.content), self.body)
+
+    def test_leaves_small_and_unaccepted_bodies_alone(self):
+        for response in (self._get(body=b'{"ok":true}'), self._get(encoding="identity")):
+            self.assertFalse(response.has_header("Content-Encoding"))
+            self.assertEqual(response["Vary"], "Accept-Encoding")
+
+    def test_public_responses_are_compressed_once(self):
+        with mock.patch.object(middleware, "compress", wraps=middleware.compress) as compress:
+            first = self._get()
+            second = self._get()
+            self.assertEqual(compress.call_count, 1)
+            self.assertEqual(first.content, second.content)
+
+            # Authenticated and non-public requests are never cached
+            self._get(HTTP_AUTHORIZATION="Bearer token")
+            self._get("/api/my-templates/")
+            self.assertEqual(compress.call_count, 3)
+
+    def test_cache_key_covers_body_encoding_and_level(self):
+        key = CompressionMiddleware(lambda request: None)._cache_key
+        self.assertEqual(key(self.body, "gzip"), key(self.body, "gzip"))
+        self.assertNotEqual(key(self.body, "gzip"), key(self.body + b" ", "gzip"))
+        self.assertNotEqual(key(self.body, "gzip"), key(self.body, "br"))
+        level_6 = key(self.body, "gzip")
+        with self.settings(COMPRESSION_GZIP_LEVEL=9):
+            self.assertNotEqual(key(self.body, "gzip"), level_6)
+
+
+def throttle_rates(**rates):
+    return override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_RATES": {**settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"], **rates},
+    })
+
+
+class BucketThrottleTests(TestCase):
+    def setUp(self):
+        local_buckets._buckets.clear()
+        self.addCleanup(local_buckets._buckets.clear)
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("120/min"), (2.0, 120))
+        self.assertEqual(parse_rate("120/min:30"), (2.0, 30))
+        self.assertEqual(parse_rate("10/s"), (10.0, 10))
+        self.assertIsNone(parse_rate(None))
+
+    @throttle_rates(invite="60/min:2")
+    def test_burst_then_429_with_retry_after(self):
+        statuses = [self.client.get("/api/invite/guessed-slug/").status_code for _ in range(3)]
+        self.assertEqual(statuses, [404, 404, 429])
+        response = self.client.get("/api/invite/guessed-slug/")
+        self.assertEqual(response["Retry-After"], "1")
+
+    @throttle_rates(invite="60/min:1")
+    def test_forwarded_for_does_not_create_new_buckets(self):
+        first = self.client.get("/api/invite/guessed-slug/", HTTP_X_FORWARDED_FOR="203.0.113.1")
+        second = self.client.get("/api/invite/guessed-slug/", HTTP_X_FORWARDED_FOR="203.0.113.2")
+        self.assertEqual((first.status_code, second.status_code), (404, 429))
+
+    @throttle_rates(invite="60/min:1")
+    def test_forwarded_for_is_used_behind_trusted_proxies(self):
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "NUM_PROXIES": 1}):
+            first = self.client.get("/api/invite/guessed-slug/", HTTP_X_FORWARDED_FOR="203.0.113.1")
+            second = self.client.get("/api/invite/guessed-slug/", HTTP_X_FORWARDED_FOR="203.0.113.2")
+        self.assertEqual((first.status_code, second.status_code), (404, 404))
+
+
+class CreatedYearFilterTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(email="admin@example.com", password="pw")
+        category = Category.objects.create(name="Wedding", slug="wedding")
+        template = Template.objects.create(title="Royal", category=category, schema={}, price="499.00")
+        for year in (2024, 2026):
+            order = Order.objects.create(user=self.admin, template=template, amount="499.00")
+            Order.objects.filter(pk=order.pk).update(
+                created_at=timezone.make_aware(datetime(year, 6, 1))
+            )
+        self.client.force_login(self.admin)
+
+    def test_years_come_from_min_max_not_distinct(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/admin/templates_app/order/")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q for q in queries.captured_queries if "DISTINCT" in q["sql"]])
+        changelist = response.context["cl"]
+        spec = next(spec for spec in changelist.filter_specs if isinstance(spec, CreatedYearFilter))
+        years = [choice["display"] for choice in spec.choices(changelist)]
+        self.assertEqual(years, ["All", "2026", "2025", "2024"])
+
+    def test_filters_by_year(self):
+        response = self.client.get("/admin/templates_app/order/", {"created_year": "2024"})
+        self.assertEqual(response.context["cl"].result_count, 1)
+        response = self.client.get("/admin/templates_app/order/", {"created_year": "2025"})
+        self.assertEqual(response.context["cl"].result_count, 0)
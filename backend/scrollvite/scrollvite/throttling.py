@@ -0,0 +1,128 @@
+"""
+Token-bucket throttling.
+
+Each ``(scope, client)`` pair gets a bucket holding up to ``burst`` tokens
+that refills at the scope's rate; a request takes one token. The client is
+the user for authenticated requests and the IP otherwise: ``REMOTE_ADDR``,
+or the address ``NUM_PROXIES`` hops back in X-Forwarded-For behind trusted
+proxies (see settings.REST_FRAMEWORK). Views opt in with
+``throttle_classes = [BucketThrottle]`` and a ``throttle_scope``; rates live
+in ``REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]`` like DRF's own throttles,
+with an optional burst (``"120/min"`` or ``"120/min:30"``).
+
+Buckets are kept in process memory by default, which costs no I/O per
+request. Set ``THROTTLE_CACHE_ALIAS`` to share them across workers through
+a cache; that read-modify-write isn't atomic, so concurrent requests from
+one client can occasionally slip an extra token through.
+
+A throttled request gets a 429 and DRF adds ``Retry-After`` from ``wait()``.
+"""
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 60 * 60 * 24}
+
+
+def parse_rate(rate):
+    """
+    "120/min" -> (2.0 tokens/s, burst 120); "120/min:30" -> (2.0, 30).
+    None disables throttling for the scope.
+    """
+    if rate is None:
+        return None
+    rate, _, burst = rate.partition(":")
+    num, period = rate.split("/")
+    num = int(num)
+    refill = num / PERIODS[period[0]]
+    return refill, int(burst) if burst else num
+
+
+class LocalBuckets:
+    """Process-local bucket store, bounded so unique IPs can't grow it forever"""
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def take(self, key, refill, burst, now):
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (burst, now))
+            tokens, allowed = _take(tokens, last, refill, burst, now)
+            # Re-inserting keeps the dict in least-recently-used order
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                del self._buckets[next(iter(self._buckets))]
+        return tokens, allowed
+
+
+class CacheBuckets:
+    """Bucket store in a (shared) Django cache"""
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    def take(self, key, refill, burst, now):
+        cache = caches[self.alias]
+        tokens, last = cache.get(key) or (burst, now)
+        tokens, allowed = _take(tokens, last, refill, burst, now)
+        # Expire once the bucket would be full again anyway
+        cache.set(key, (tokens, now), math.ceil(burst / refill) + 1)
+        return tokens, allowed
+
+
+def _take(tokens, last, refill, burst, now):
+    tokens = min(burst, tokens + (now - last) * refill)
+    if tokens >= 1:
+        return tokens - 1, True
+    return tokens, False
+
+
+local_buckets = LocalBuckets()
+
+
+def get_store():
+    alias = getattr(settings, "THROTTLE_CACHE_ALIAS", "")
+    if alias:
+        return CacheBuckets(alias)
+    local_buckets.max_keys = getattr(settings, "THROTTLE_LOCAL_MAX_KEYS", 10000)
+    return local_buckets
+
+
+class BucketThrottle(BaseThrottle):
+    """Token bucket per user (or per IP when anonymous) for ``view.throttle_scope``"""
+
+    def allow_request(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        if not scope:
+            return True
+        try:
+            rate = api_settings.DEFAULT_THROTTLE_RATES[scope]
+        except KeyError:
+            raise ImproperlyConfigured(f"No throttle rate set for scope '{scope}'")
+
+        parsed = parse_rate(rate)
+        if parsed is None:
+            return True
+        self.refill, burst = parsed
+
+        key = f"throttle:{scope}:{self.get_client(request)}"
+        self.tokens, allowed = get_store().take(key, self.refill, burst, time.time())
+        return allowed
+
+    def get_client(self, request):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return f"user:{user.pk}"
+        return f"ip:{self.get_ident(request)}"
+
+    def wait(self):
+        # Whole seconds until the next token, since Retry-After is an integer
+        return max(1, math.ceil((1 - self.tokens) / self.refill))
@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Category, Template, Order
+
+from scrollvite.admin_tools import CreatedYearFilter, LargeTableAdmin
+from .models import Category, Template, TemplateVersion, Order
 
 
 @admin.register(Category)
@@ -24,11 +26,13 @@ class CategoryAdmin(admin.ModelAdmin):
 @admin.register(Template)
 class TemplateAdmin(admin.ModelAdmin):
     list_display = ("title", "category", "price", "is_published", "is_active")
+    list_select_related = ("category",)
     list_filter = ("category", "is_published", "is_active")
-    search_fields = ("title",)
+    search_fields = ("title", "slug")
+    prepopulated_fields = {"slug": ("title",)}
     fieldsets = (
         ('Basic Info', {
-            'fields': ('title', 'category', 'region', 'template_component', 'price')
+            'fields': ('title', 'slug', 'category', 'region', 'template_component', 'price')
         }),
         ('Schema', {
             'fields': ('schema',),
@@ -44,7 +48,27 @@ class TemplateAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(TemplateVersion)
+class TemplateVersionAdmin(admin.ModelAdmin):
+    list_display = ("template", "number", "schema_size", "created_at")
+    list_select_related = ("template",)
+    exclude = ("compressed_schema",)
+    readonly_fields = ("template", "number", "content_hash", "schema_size", "created_at")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Order)
-class OrderAdmin(admin.ModelAdmin):
-    list_display = ("id", "user", "template", "status", "created_at")
-    readonly_fields = ("schema_snapshot",)
+class OrderAdmin(LargeTableAdmin):
+    list_display = ("id", "user", "template", "amount", "status", "created_at")
+    list_select_related = ("user", "template")
+    list_filter = ("status", CreatedYearFilter)
+    search_fields = ("=id", "=user__email")
+    raw_id_fields = ("user", "template")
+    ordering = ("-created_at",)
+    changelist_defer = ("schema_snapshot",)
+    readonly_fields = ("template_version", "schema_snapshot")
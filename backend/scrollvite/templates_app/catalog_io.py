@@ -0,0 +1,144 @@
+# File: backend/scrollvite/templates_app/catalog_io.py
+# Catalog file format shared by the import_catalog / export_catalog commands
+#
+# A catalog directory holds:
+#   categories.json or categories*.ndjson   category records, keyed by slug
+#   templates*.json or templates*.ndjson    template records, keyed by slug
+#   images/<storage name>                   image files referenced by records
+#
+# .json files contain a list of records, .ndjson files one record per line.
+# Templates refer to their category by slug, so a catalog can be loaded into
+# any database.
+
+import json
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.core.files.utils import validate_file_name
+
+CATEGORY_FIELDS = ("name", "default_image", "is_active")
+TEMPLATE_FIELDS = (
+    "title",
+    "category",
+    "region",
+    "template_component",
+    "price",
+    "schema",
+    "default_hero_image",
+    "is_published",
+    "is_active",
+    "is_preview",
+)
+
+IMAGES_DIR = "images"
+
+
+class CatalogError(ValueError):
+    """A record can't be imported; the message starts with file:line"""
+
+
+def find_files(directory, prefix):
+    directory = Path(directory)
+    return sorted(
+        path for path in directory.iterdir()
+        if path.name.startswith(prefix) and path.suffix in (".json", ".ndjson")
+    )
+
+
+def iter_records(path):
+    """Yield (location, record) for every record in a .json or .ndjson file"""
+    path = Path(path)
+    if path.suffix == ".json":
+        with path.open(encoding="utf-8") as fh:
+            records = json.load(fh)
+        if not isinstance(records, list):
+            raise CatalogError(f"{path.name}: expected a list of records")
+        for index, record in enumerate(records, start=1):
+            yield f"{path.name}[{index}]", record
+        return
+
+    with path.open(encoding="utf-8") as fh:
+        for line_number, line in enumerate(fh, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield f"{path.name}:{line_number}", json.loads(line)
+            except json.JSONDecodeError as e:
+                raise CatalogError(f"{path.name}:{line_number}: {e}")
+
+
+def parse_price(value, location):
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, TypeError):
+        raise CatalogError(f"{location}: invalid price {value!r}")
+
+
+# ===================== EXPORT =====================
+
+def category_record(category):
+    return {
+        "slug": category.slug,
+        "name": category.name,
+        "default_image": category.default_image.name or None,
+        "is_active": category.is_active,
+    }
+
+
+def template_record(template, category_slug):
+    return {
+        "slug": template.slug,
+        "title": template.title,
+        "category": category_slug,
+        "region": template.region,
+        "template_component": template.template_component,
+        "price": str(template.price),
+        "schema": template.schema,
+        "default_hero_image": template.default_hero_image.name or None,
+        "is_published": template.is_published,
+        "is_active": template.is_active,
+        "is_preview": template.is_preview,
+    }
+
+
+def export_image(name, directory):
+    """Copy a stored image into <directory>/images. Returns False if it's missing."""
+    target = Path(directory) / IMAGES_DIR / name
+    if target.exists():
+        return True
+    if not default_storage.exists(name):
+        return False
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with default_storage.open(name, "rb") as src, target.open("wb") as dst:
+        for chunk in iter(lambda: src.read(64 * 1024), b""):
+            dst.write(chunk)
+    return True
+
+
+# ===================== IMPORT =====================
+
+def check_image_name(name, location):
+    """Reject names that would escape the media or catalog images directory"""
+    try:
+        validate_file_name(name, allow_relative_path=True)
+    except SuspiciousFileOperation:
+        raise CatalogError(f"{location}: invalid image name {name!r}")
+
+
+def import_image(name, directory, location):
+    """
+    Make sure a referenced image is in storage, copying it from
+    <directory>/images if needed. Returns the stored name ("" if neither has it).
+    """
+    if not name:
+        return ""
+    check_image_name(name, location)
+    if default_storage.exists(name):
+        return name
+    source = Path(directory) / IMAGES_DIR / name
+    if not source.exists():
+        return ""
+    with source.open("rb") as fh:
+        return default_storage.save(name, fh)
@@ -0,0 +1,141 @@
+import asyncio
+import io
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+from django.core.asgi import get_asgi_application
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+
+from orders.models import InviteInstance
+from templates_app.models import Template
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare sync WSGI (thread pool) and async ASGI throughput for the public "
+        "guest endpoints, driving both Django handlers in-process at high concurrency"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=5000, help="Requests per run")
+        parser.add_argument("--concurrency", type=int, default=200)
+        parser.add_argument("--threads", type=int, default=16, help="WSGI worker threads")
+        parser.add_argument("--path", action="append", dest="paths", help="Path to request (repeatable)")
+        parser.add_argument("--cold", action="store_true", help="Clear the cache before each run")
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or self._default_paths()
+        if not paths:
+            self.stdout.write(self.style.ERROR("No published templates or invites found; pass --path"))
+            return
+        self.stdout.write(f"Paths: {', '.join(paths)}")
+        self.stdout.write(f"{options['requests']} requests, concurrency {options['concurrency']}\n")
+
+        for label, runner in (("WSGI (sync)", self._run_wsgi), ("ASGI (async)", self._run_asgi)):
+            if options["cold"]:
+                cache.clear()
+            elapsed, latencies, errors = runner(paths, options)
+            latencies.sort()
+            p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0
+            self.stdout.write(
+                f"{label:<13} {len(latencies) / elapsed:8.0f} req/s   "
+                f"p50 {statistics.median(latencies) * 1000:6.1f} ms   "
+                f"p99 {p99 * 1000:6.1f} ms   errors {errors}"
+            )
+
+    def _default_paths(self):
+        paths = []
+        template = Template.objects.filter(
+            is_active=True, is_published=True, is_preview=True
+        ).values_list("id", flat=True).first()
+        if template:
+            paths += ["/api/preview-templates/", f"/api/template-preview/{template}/"]
+        slug = InviteInstance.objects.filter(is_active=True).values_list("public_slug", flat=True).first()
+        if slug:
+            paths.append(f"/api/invite/{slug}/")
+        return paths
+
+    # ===================== WSGI =====================
+
+    def _run_wsgi(self, paths, options):
+        application = get_wsgi_application()
+        total = options["requests"]
+
+        def request(index):
+            environ = {
+                "REQUEST_METHOD": "GET",
+                "PATH_INFO": paths[index % len(paths)],
+                "HTTP_HOST": "127.0.0.1",
+                "HTTP_ACCEPT_ENCODING": "gzip",
+                "wsgi.input": io.BytesIO(b""),
+            }
+            setup_testing_defaults(environ)
+            status_holder = []
+            start = time.perf_counter()
+            body = application(environ, lambda status, headers: status_holder.append(status))
+            b"".join(body)
+            body.close()
+            return time.perf_counter() - start, status_holder[0].startswith("200")
+
+        def close_connection(_):
+            connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=options["threads"]) as pool:
+            start = time.perf_counter()
+            results = list(pool.map(request, range(total)))
+            elapsed = time.perf_counter() - start
+            list(pool.map(close_connection, range(options["threads"])))
+
+        return elapsed, [r[0] for r in results], sum(1 for r in results if not r[1])
+
+    # ===================== ASGI =====================
+
+    def _run_asgi(self, paths, options):
+        return asyncio.run(self._asgi_load(paths, options))
+
+    async def _asgi_load(self, paths, options):
+        application = get_asgi_application()
+        semaphore = asyncio.Semaphore(options["concurrency"])
+
+        async def request(index):
+            path = paths[index % len(paths)]
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": path,
+                "raw_path": path.encode(),
+                "query_string": b"",
+                "root_path": "",
+                "headers": [(b"host", b"127.0.0.1"), (b"accept-encoding", b"gzip")],
+                "client": ("127.0.0.1", 40000 + index % 20000),
+                "server": ("127.0.0.1", 8000),
+            }
+            messages = [{"type": "http.request", "body": b"", "more_body": False}]
+            status_code = []
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                await asyncio.Event().wait()  # never disconnects
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    status_code.append(message["status"])
+
+            async with semaphore:
+                start = time.perf_counter()
+                await application(scope, receive, send)
+                return time.perf_counter() - start, status_code[0] == 200
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(request(i) for i in range(options["requests"])))
+        elapsed = time.perf_counter() - start
+        return elapsed, [r[0] for r in results], sum(1 for r in results if not r[1])
@@ -0,0 +1,69 @@
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+# What a worker does before serving its first request
+BOOT_CODE = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure worker boot time (django.setup() + URL loading) in fresh "
+        "interpreters and summarize `python -X importtime` by module"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time")
+        parser.add_argument("--top", type=int, default=20, help="Modules to list")
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get(
+            "DJANGO_SETTINGS_MODULE", "scrollvite.settings"
+        ))
+
+        timings = []
+        for _ in range(options["runs"]):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", BOOT_CODE], env=env, check=True)
+            timings.append(time.perf_counter() - start)
+        self.stdout.write(
+            f"Boot (interpreter + setup + URLs): median {statistics.median(timings) * 1000:.0f} ms, "
+            f"min {min(timings) * 1000:.0f} ms over {len(timings)} runs"
+        )
+
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", BOOT_CODE],
+            env=env, check=True, capture_output=True, text=True,
+        )
+        modules = []
+        for line in result.stderr.splitlines():
+            match = LINE.match(line)
+            if match:
+                own, cumulative, indent, name = match.groups()
+                modules.append((name, int(own), int(cumulative), len(indent)))
+
+        total = sum(own for _, own, _, _ in modules)
+        self.stdout.write(f"Imports: {len(modules)} modules, {total / 1000:.0f} ms\n")
+
+        top_level = sorted((m for m in modules if m[3] == 1), key=lambda m: m[2], reverse=True)
+        self.stdout.write("Slowest top-level imports (cumulative):")
+        for name, _, cumulative, _ in top_level[:options["top"]]:
+            self.stdout.write(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+        packages = {}
+        for name, own, _, _ in modules:
+            package = name.split(".")[0]
+            packages[package] = packages.get(package, 0) + own
+        self.stdout.write("\nSlowest packages (own time):")
+        for package, own in sorted(packages.items(), key=lambda p: p[1], reverse=True)[:options["top"]]:
+            self.stdout.write(f"  {own / 1000:8.1f} ms  {package}")
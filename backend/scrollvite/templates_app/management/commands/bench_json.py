@@ -0,0 +1,143 @@
+import io
+import json
+import time
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from scrollvite.parsers import FastJSONParser
+from scrollvite.renderers import FastJSONRenderer, orjson
+
+
+def sample_schema(index, events=6, photos=12):
+    """A schema shaped like the ones RoyalWeddingTemplate/PhotoStoryTemplate render"""
+    base = f"http://127.0.0.1:8000/media/invites/{uuid.uuid4()}"
+    return {
+        "hero": {
+            "bride_name": f"Ananya {index}",
+            "groom_name": f"Rohan {index}",
+            "couple_photo": f"{base}/{uuid.uuid4()}.jpg",
+            "tagline": "Two hearts, one soul — दो दिल, एक जान",
+            "greeting": "Together Forever",
+            "wedding_date": "2026-12-12",
+        },
+        "couple_story": {
+            "title": "Our Story",
+            "content": "We met at a friend's wedding in Jaipur. " * 8,
+        },
+        "venue": {
+            "name": "Grand Palace",
+            "address": "MI Road, Near Panch Batti",
+            "city": "Jaipur",
+            "google_maps_link": "https://maps.google.com/?q=Grand+Palace+Jaipur",
+        },
+        "events": [
+            {
+                "name": f"Event {n}",
+                "date": "2026-12-1%d" % (n % 10),
+                "time": "7:00 PM",
+                "venue": "Palace Lawns",
+                "dress_code": "Traditional",
+                "description": "Join us for an evening of music and dance. " * 3,
+            }
+            for n in range(events)
+        ],
+        "photo_gallery": {
+            "photos": [f"{base}/{uuid.uuid4()}.jpg" for _ in range(photos)],
+        },
+        "closing": {
+            "message": "We look forward to celebrating with you!",
+            "signature": "With love",
+        },
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare DRF's stdlib JSON renderer/parser with the orjson-backed ones on realistic schemas"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=500)
+        parser.add_argument("--invites", type=int, default=20, help="Invites in the list payload")
+        parser.add_argument(
+            "--from-db",
+            action="store_true",
+            help="Use stored invite schemas instead of synthetic ones",
+        )
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed; FastJSON* will fall back to stdlib"))
+
+        schemas = self._schemas(options["invites"], options["from_db"])
+        now = timezone.now()
+
+        payloads = {
+            "invite (InviteView)": {
+                "schema": schemas[0],
+                "template_component": "RoyalWeddingTemplate",
+            },
+            "list (MyTemplatesView-like)": [
+                {
+                    "invite_id": uuid.uuid4(),
+                    "template_id": i,
+                    "template_title": "Royal Wedding",
+                    "public_slug": f"invite-{uuid.uuid4().hex[:10]}",
+                    "price": Decimal("499.00"),
+                    "created_at": now,
+                    "expires_at": now,
+                    "schema": schema,
+                }
+                for i, schema in enumerate(schemas)
+            ],
+        }
+
+        iterations = options["iterations"]
+        for name, data in payloads.items():
+            slow = JSONRenderer().render(data)
+            fast = FastJSONRenderer().render(data)
+            if json.loads(slow) != json.loads(fast):
+                self.stdout.write(self.style.ERROR(f"{name}: rendered output differs!"))
+
+            identical = "identical bytes" if slow == fast else "equivalent JSON"
+            self.stdout.write(f"\n{name}: {len(slow) / 1024:.1f} KiB ({identical})")
+            self._compare(
+                "render",
+                lambda: JSONRenderer().render(data),
+                lambda: FastJSONRenderer().render(data),
+                iterations,
+            )
+            self._compare(
+                "parse",
+                lambda: JSONParser().parse(io.BytesIO(slow)),
+                lambda: FastJSONParser().parse(io.BytesIO(slow)),
+                iterations,
+            )
+
+    def _schemas(self, count, from_db):
+        if from_db:
+            from orders.models import InviteInstance
+            schemas = list(InviteInstance.objects.values_list("schema", flat=True)[:count])
+            if schemas:
+                return schemas
+            self.stdout.write(self.style.WARNING("No invites in the database, using synthetic schemas"))
+        return [sample_schema(i) for i in range(count)]
+
+    def _compare(self, label, stdlib_fn, fast_fn, iterations):
+        stdlib_time = self._time(stdlib_fn, iterations)
+        fast_time = self._time(fast_fn, iterations)
+        self.stdout.write(
+            f"  {label:<7} stdlib {stdlib_time * 1e6:9.1f} us   "
+            f"orjson {fast_time * 1e6:9.1f} us   "
+            f"x{stdlib_time / fast_time:.1f}"
+        )
+
+    def _time(self, fn, iterations):
+        fn()  # warm up
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        return (time.perf_counter() - start) / iterations
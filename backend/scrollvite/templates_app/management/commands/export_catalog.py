@@ -0,0 +1,67 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from templates_app.catalog_io import category_record, export_image, template_record
+from templates_app.models import Category, Template
+
+
+class Command(BaseCommand):
+    help = "Export categories and templates (with their images) to a catalog directory"
+
+    def add_arguments(self, parser):
+        parser.add_argument("directory", help="Directory to write the catalog to")
+        parser.add_argument(
+            "--category",
+            action="append",
+            dest="categories",
+            help="Only export this category slug (repeatable)",
+        )
+        parser.add_argument("--no-images", action="store_true", help="Don't copy image files")
+
+    def handle(self, *args, **options):
+        directory = Path(options["directory"])
+        directory.mkdir(parents=True, exist_ok=True)
+        with_images = not options["no_images"]
+
+        categories = Category.objects.order_by("pk")
+        if options["categories"]:
+            categories = categories.filter(slug__in=options["categories"])
+        categories = list(categories)
+        category_slugs = {category.pk: category.slug for category in categories}
+
+        missing_images = []
+
+        def copy_image(name):
+            if with_images and name and not export_image(name, directory):
+                missing_images.append(name)
+
+        records = []
+        for category in categories:
+            record = category_record(category)
+            copy_image(record["default_image"])
+            records.append(record)
+        with (directory / "categories.json").open("w", encoding="utf-8") as fh:
+            json.dump(records, fh, ensure_ascii=False, indent=2)
+        self.stdout.write(f"  {len(records)} categories")
+
+        templates = Template.objects.filter(category__in=category_slugs).order_by("pk")
+        total = templates.count()
+        exported = 0
+        with (directory / "templates.ndjson").open("w", encoding="utf-8") as fh:
+            for template in templates.iterator(chunk_size=500):
+                record = template_record(template, category_slugs[template.category_id])
+                copy_image(record["default_hero_image"])
+                fh.write(json.dumps(record, ensure_ascii=False))
+                fh.write("\n")
+                exported += 1
+                if exported % 1000 == 0:
+                    self.stdout.write(f"  {exported}/{total} templates")
+
+        for name in missing_images:
+            self.stdout.write(self.style.WARNING(f"Image not found in storage: {name}"))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {len(records)} categories and {exported} templates to {directory}"
+        ))
@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-19 16:05
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def fill_slugs(apps, schema_editor):
+    Template = apps.get_model('templates_app', 'Template')
+    templates = list(Template.objects.only('id', 'title'))
+    for template in templates:
+        template.slug = f"{slugify(template.title)[:200] or 'template'}-{template.pk}"
+    Template.objects.bulk_update(templates, ['slug'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('templates_app', '0008_template_is_preview'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='template',
+            name='slug',
+            field=models.SlugField(max_length=220, null=True),
+        ),
+        migrations.RunPython(fill_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='template',
+            name='slug',
+            field=models.SlugField(blank=True, max_length=220, unique=True),
+        ),
+    ]
@@ -0,0 +1,112 @@
+# Generated by Django 6.0.1 on 2026-10-19 16:40
+
+import hashlib
+import json
+import zlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _compress(schema):
+    data = json.dumps(schema, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+    return zlib.compress(data, 6), len(data), hashlib.sha256(data).hexdigest()
+
+
+def create_versions(apps, schema_editor):
+    """
+    Version 1 of every template is its current schema. Legacy order snapshots
+    point at the matching version (adding one if the template has changed
+    since); their JSON copy is kept so the migration can be reversed.
+    """
+    Template = apps.get_model('templates_app', 'Template')
+    TemplateVersion = apps.get_model('templates_app', 'TemplateVersion')
+    Order = apps.get_model('templates_app', 'Order')
+
+    known = {}  # (template_id, hash) -> version id
+    numbers = {}
+
+    def get_version(template_id, schema):
+        compressed, size, content_hash = _compress(schema)
+        key = (template_id, content_hash)
+        if key not in known:
+            numbers[template_id] = numbers.get(template_id, 0) + 1
+            known[key] = TemplateVersion.objects.create(
+                template_id=template_id,
+                number=numbers[template_id],
+                content_hash=content_hash,
+                compressed_schema=compressed,
+                schema_size=size,
+            ).pk
+        return known[key]
+
+    for template in Template.objects.only('id', 'schema').iterator(chunk_size=500):
+        Template.objects.filter(pk=template.pk).update(
+            current_version=get_version(template.pk, template.schema)
+        )
+
+    orders = Order.objects.filter(schema_snapshot__isnull=False).only('id', 'template_id', 'schema_snapshot')
+    for order in orders.iterator(chunk_size=500):
+        Order.objects.filter(pk=order.pk).update(
+            template_version=get_version(order.template_id, order.schema_snapshot)
+        )
+
+
+def restore_snapshots(apps, schema_editor):
+    """Give orders placed after versions existed a JSON snapshot again"""
+    TemplateVersion = apps.get_model('templates_app', 'TemplateVersion')
+    Order = apps.get_model('templates_app', 'Order')
+
+    orders = Order.objects.filter(schema_snapshot__isnull=True, template_version__isnull=False)
+    for order in orders.only('id', 'template_version_id').iterator(chunk_size=500):
+        data = TemplateVersion.objects.values_list('compressed_schema', flat=True).get(
+            pk=order.template_version_id
+        )
+        Order.objects.filter(pk=order.pk).update(
+            schema_snapshot=json.loads(zlib.decompress(bytes(data)))
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('templates_app', '0009_template_slug'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TemplateVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField()),
+                ('content_hash', models.CharField(max_length=64)),
+                ('compressed_schema', models.BinaryField()),
+                ('schema_size', models.PositiveIntegerField(help_text='Uncompressed size in bytes')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='versions', to='templates_app.template')),
+            ],
+            options={
+                'ordering': ['template', '-number'],
+                'constraints': [
+                    models.UniqueConstraint(fields=('template', 'number'), name='unique_template_version_number'),
+                    models.UniqueConstraint(fields=('template', 'content_hash'), name='unique_template_version_hash'),
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name='template',
+            name='current_version',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='templates_app.templateversion'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='template_version',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='orders', to='templates_app.templateversion'),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='schema_snapshot',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(create_versions, restore_snapshots),
+    ]
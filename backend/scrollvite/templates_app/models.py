@@ -1,6 +1,12 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Max
+import copy
 import uuid
 from django.conf import settings
+from django.core.cache import cache
+from django.utils.text import slugify
+from .public_cache import invalidate_catalog
+from .versioning import compress_schema, decompress_schema, schema_hash, version_key
 
 class Category(models.Model):
     name = models.CharField(max_length=100)
@@ -19,9 +25,20 @@ class Category(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_catalog()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_catalog()
+        return result
+
 
 class Template(models.Model):
     title = models.CharField(max_length=200)
+    # Stable key for catalog import/export; generated from the title if blank
+    slug = models.SlugField(max_length=220, unique=True, blank=True)
     category = models.ForeignKey(Category, on_delete=models.CASCADE)
     region = models.CharField(max_length=50, null=True, blank=True)
 
@@ -51,11 +68,147 @@ class Template(models.Model):
         help_text="Show in homepage preview (max 5 templates recommended)"
     )
 
+    # Latest published snapshot; orders and invites point at versions
+    current_version = models.ForeignKey(
+        "TemplateVersion",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = f"{slugify(self.title)[:200] or 'template'}-{uuid.uuid4().hex[:6]}"
+        super().save(*args, **kwargs)
+        if self.is_published:
+            self.publish_version()
+        invalidate_catalog(self.pk)
+
+    def publish_version(self):
+        """Snapshot the current schema (reusing an identical version). Returns its id."""
+        return publish_versions([self], using=self._state.db)[self.pk]
+
+    def get_version_id(self):
+        """Version matching the current schema, for new orders"""
+        if self.is_published and self.current_version_id:
+            return self.current_version_id
+        return self.publish_version()
+
+    def delete(self, *args, **kwargs):
+        template_id = self.pk
+        result = super().delete(*args, **kwargs)
+        invalidate_catalog(template_id)
+        return result
+
+
+class TemplateVersion(models.Model):
+    """Immutable, compressed snapshot of a template schema (see versioning.py)"""
+    template = models.ForeignKey(Template, on_delete=models.CASCADE, related_name="versions")
+    number = models.PositiveIntegerField()
+    content_hash = models.CharField(max_length=64)
+    compressed_schema = models.BinaryField()
+    schema_size = models.PositiveIntegerField(help_text="Uncompressed size in bytes")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["template", "-number"]
+        constraints = [
+            models.UniqueConstraint(fields=["template", "number"], name="unique_template_version_number"),
+            models.UniqueConstraint(fields=["template", "content_hash"], name="unique_template_version_hash"),
+        ]
+
+    def __str__(self):
+        return f"{self.template_id} v{self.number}"
+
+    @property
+    def schema(self):
+        return decompress_schema(self.compressed_schema)
+
+    @classmethod
+    def load_schema(cls, version_id):
+        """Schema of a version; versions never change, so it's cached without expiry"""
+        key = version_key(version_id)
+        schema = cache.get(key)
+        if schema is None:
+            data = cls.objects.values_list("compressed_schema", flat=True).get(pk=version_id)
+            schema = decompress_schema(data)
+            cache.set(key, schema, None)
+        return schema
+
+
+PUBLISH_ATTEMPTS = 3
+
+
+def publish_versions(templates, using="default"):
+    """
+    Make sure each template's current schema exists as a TemplateVersion and
+    is its current_version. Identical schemas reuse the existing row.
+    Returns {template_id: version_id}.
+    """
+    for attempt in range(1, PUBLISH_ATTEMPTS + 1):
+        try:
+            with transaction.atomic(using=using):
+                # Version numbers are per template: lock the templates so
+                # concurrent publishers take turns
+                list(
+                    Template.objects.using(using).select_for_update()
+                    .filter(pk__in=[template.pk for template in templates])
+                    .order_by("pk").values_list("pk", flat=True)
+                )
+                return _publish_versions(templates, using)
+        except IntegrityError:
+            # A concurrent publisher took the number or the schema first
+            # (select_for_update is a no-op on SQLite); re-read and retry
+            if attempt == PUBLISH_ATTEMPTS:
+                raise
+
+
+def _publish_versions(templates, using):
+    versions = TemplateVersion.objects.using(using)
+    hashes = {template.pk: schema_hash(template.schema) for template in templates}
+
+    found = {
+        (template_id, content_hash): version_id
+        for template_id, content_hash, version_id in versions.filter(
+            template__in=hashes, content_hash__in=set(hashes.values())
+        ).values_list("template_id", "content_hash", "id")
+    }
+    latest = dict(
+        versions.filter(template__in=hashes)
+        .values("template").annotate(last=Max("number")).values_list("template", "last")
+    )
+
+    new_versions = []
+    for template in templates:
+        if (template.pk, hashes[template.pk]) in found:
+            continue
+        compressed, size, content_hash = compress_schema(template.schema)
+        new_versions.append(TemplateVersion(
+            template_id=template.pk,
+            number=latest.get(template.pk, 0) + 1,
+            content_hash=content_hash,
+            compressed_schema=compressed,
+            schema_size=size,
+        ))
+    for version in versions.bulk_create(new_versions):
+        found[(version.template_id, version.content_hash)] = version.pk
+
+    result = {}
+    for template in templates:
+        version_id = found[(template.pk, hashes[template.pk])]
+        if template.current_version_id != version_id:
+            Template.objects.using(using).filter(pk=template.pk).update(current_version=version_id)
+            template.current_version_id = version_id
+        result[template.pk] = version_id
+    return result
+
 
 class Order(models.Model):
     STATUS_CHOICES = (
@@ -71,12 +224,34 @@ class Order(models.Model):
     # Payment info
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     
-    # LEGACY — do not edit anymore
-    schema_snapshot = models.JSONField(editable=False)
+    # Template schema as purchased
+    template_version = models.ForeignKey(
+        TemplateVersion,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="orders"
+    )
+
+    # LEGACY — do not edit anymore; only set on orders that predate versions
+    # (kept so the versions migration can be reversed)
+    schema_snapshot = models.JSONField(null=True, blank=True, editable=False)
 
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="PENDING")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"], name="order_created_idx"),
+            models.Index(fields=["status", "created_at"], name="order_status_created_idx"),
+        ]
+
     def __str__(self):
-        return f"Order {self.id} - {self.status}"
\ No newline at end of file
+        return f"Order {self.id} - {self.status}"
+
+    def purchased_schema(self):
+        """Fresh copy of the schema this order was placed for"""
+        if self.template_version_id:
+            return TemplateVersion.load_schema(self.template_version_id)
+        return copy.deepcopy(self.schema_snapshot)
\ No newline at end of file
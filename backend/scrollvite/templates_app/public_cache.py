@@ -0,0 +1,69 @@
+# File: backend/scrollvite/templates_app/public_cache.py
+# Cache keys for the public read endpoints, and their invalidation
+#
+# Invalidation waits for the surrounding transaction to commit: deleting the
+# keys earlier lets a concurrent request re-cache the old row before the new
+# one is visible. Model save()/delete() invalidate; queryset.update(),
+# bulk_create() and bulk_update() skip them, so code writing cached rows that
+# way calls invalidate_invite()/invalidate_catalog() itself (InviteInstance
+# querysets do so in update()).
+#
+# Unknown slugs are remembered in a separate, bounded cache
+# (PUBLIC_MISSING_CACHE_ALIAS), so slug guessing can't evict real entries.
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+CATEGORIES_KEY = "public:categories"
+PREVIEW_TEMPLATES_KEY = "public:preview-templates"
+
+
+def invite_key(slug):
+    return f"public:invite:{slug}"
+
+
+def missing_invite_key(slug):
+    return f"public:invite-missing:{slug}"
+
+
+def invite_share_key(slug):
+    return f"public:invite-share:{slug}"
+
+
+def invite_active_key(slug):
+    return f"public:invite-active:{slug}"
+
+
+def template_preview_key(template_id):
+    return f"public:template-preview:{template_id}"
+
+
+def get_timeout():
+    return getattr(settings, "PUBLIC_CACHE_TIMEOUT", 60)
+
+
+def get_missing_timeout():
+    return getattr(settings, "PUBLIC_MISSING_CACHE_TIMEOUT", 300)
+
+
+def get_missing_alias():
+    return getattr(settings, "PUBLIC_MISSING_CACHE_ALIAS", "default")
+
+
+def _delete_on_commit(keys, alias="default"):
+    # Runs at once outside a transaction
+    transaction.on_commit(lambda: caches[alias].delete_many(keys))
+
+
+def invalidate_invite(slug):
+    _delete_on_commit([invite_key(slug), invite_share_key(slug), invite_active_key(slug)])
+    _delete_on_commit([missing_invite_key(slug)], get_missing_alias())
+
+
+def invalidate_catalog(template_id=None, template_ids=()):
+    keys = [CATEGORIES_KEY, PREVIEW_TEMPLATES_KEY]
+    if template_id is not None:
+        keys.append(template_preview_key(template_id))
+    keys.extend(template_preview_key(pk) for pk in template_ids)
+    _delete_on_commit(keys)
@@ -0,0 +1,208 @@
+# File: backend/scrollvite/templates_app/schema_validation.py
+# JSON Schema definitions per template_component, compiled once and cached
+
+from functools import lru_cache
+import json
+
+import fastjsonschema
+from django.conf import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class InvalidSchema(ValueError):
+    """Raised when a template/invite schema fails validation"""
+
+
+# ===================== LIMITS =====================
+# Overridable via settings.SCHEMA_LIMITS
+
+DEFAULT_LIMITS = {
+    "max_bytes": 256 * 1024,
+    "max_events": 30,
+    "max_photos": 60,
+    "max_timeline": 30,
+    "max_text": 500,
+    "max_long_text": 5000,
+    "max_url": 2000,
+    "max_extra_fields": 30,
+}
+
+
+def get_limits():
+    return {**DEFAULT_LIMITS, **getattr(settings, "SCHEMA_LIMITS", {})}
+
+
+# ===================== DEFINITIONS =====================
+
+def _text(max_length):
+    return {"type": ["string", "null"], "maxLength": max_length}
+
+
+def _section(properties, limits, required=()):
+    """Object with known fields plus a bounded number of extra scalar fields"""
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(required),
+        "maxProperties": len(properties) + limits["max_extra_fields"],
+        "additionalProperties": {
+            "type": ["string", "number", "boolean", "null"],
+            "maxLength": limits["max_long_text"],
+        },
+    }
+
+
+def _common_sections(limits):
+    text, long_text, url = _text(limits["max_text"]), _text(limits["max_long_text"]), _text(limits["max_url"])
+
+    return {
+        "hero": _section({
+            "bride_name": text,
+            "groom_name": text,
+            "tagline": text,
+            "greeting": text,
+            "wedding_date": {
+                "type": ["string", "null"],
+                "pattern": r"^$|^\d{4}-\d{2}-\d{2}",
+                "maxLength": 40,
+            },
+            "couple_photo": url,
+            "hero_image": url,
+            "image": url,
+        }, limits),
+        "venue": _section({
+            "name": text,
+            "address": text,
+            "city": text,
+            "google_maps_link": url,
+        }, limits),
+        "events": {
+            "type": "array",
+            "maxItems": limits["max_events"],
+            "items": _section({
+                "name": text,
+                "date": text,
+                "time": text,
+                "venue": text,
+                "dress_code": text,
+                "description": long_text,
+            }, limits),
+        },
+        "closing": _section({
+            "message": long_text,
+            "signature": text,
+        }, limits),
+        "couple_story": _section({
+            "title": text,
+            "content": long_text,
+        }, limits),
+    }
+
+
+def _photo_story_sections(limits):
+    text, long_text, url = _text(limits["max_text"]), _text(limits["max_long_text"]), _text(limits["max_url"])
+
+    return {
+        "our_story": {
+            "type": "object",
+            "properties": {
+                "timeline": {
+                    "type": "array",
+                    "maxItems": limits["max_timeline"],
+                    "items": _section({
+                        "date": text,
+                        "season": text,
+                        "title": text,
+                        "description": long_text,
+                    }, limits),
+                },
+            },
+        },
+        "wedding_details": _section({
+            "date": text,
+            "time": text,
+            "venue_name": text,
+            "venue_address": text,
+            "dress_code": text,
+        }, limits),
+        "photo_gallery": {
+            "type": "object",
+            "properties": {
+                "photos": {
+                    "type": "array",
+                    "maxItems": limits["max_photos"],
+                    "items": url,
+                },
+            },
+        },
+        "rsvp": _section({
+            "message": long_text,
+            "deadline": text,
+            "contact_email": text,
+            "contact_phone": text,
+            "additional_info": long_text,
+        }, limits),
+    }
+
+
+COMPONENT_SECTIONS = {
+    "RoyalWeddingTemplate": (_common_sections,),
+    "PhotoStoryTemplate": (_common_sections, _photo_story_sections),
+}
+
+
+def get_definition(component):
+    """JSON Schema for a template_component (unknown components get the common sections)"""
+    limits = get_limits()
+    properties = {}
+    for builder in COMPONENT_SECTIONS.get(component, (_common_sections,)):
+        properties.update(builder(limits))
+
+    return {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "type": "object",
+        "properties": properties,
+        "required": ["hero"],
+    }
+
+
+@lru_cache(maxsize=None)
+def get_validator(component):
+    """Compiled validator for a component, built on first use"""
+    return fastjsonschema.compile(get_definition(component))
+
+
+# ===================== VALIDATION =====================
+
+def _byte_size(schema):
+    if orjson is not None:
+        try:
+            return len(orjson.dumps(schema))
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits, which the stdlib encoder handles
+            pass
+    try:
+        return len(json.dumps(schema, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+    except ValueError:
+        # Integers past the interpreter's int-to-str digit limit
+        raise InvalidSchema("Schema contains a number that is too large")
+
+
+def validate_schema(component, schema):
+    """Raise InvalidSchema if schema is not valid for the given component"""
+    if not isinstance(schema, dict):
+        raise InvalidSchema("Schema must be a JSON object")
+
+    max_bytes = get_limits()["max_bytes"]
+    size = _byte_size(schema)
+    if size > max_bytes:
+        raise InvalidSchema(f"Schema is too large ({size} bytes, max {max_bytes})")
+
+    try:
+        get_validator(component)(schema)
+    except fastjsonschema.JsonSchemaValueException as e:
+        raise InvalidSchema(e.message)
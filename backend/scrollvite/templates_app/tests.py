@@ -1,3 +1,493 @@
-from django.test import TestCase
+import importlib
+import json
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from pathlib import Path
 
-# Create your tests here.
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from unittest import mock
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from PIL import Image
+
+from orders import qr
+from orders.analytics import view_counter
+from orders.models import InviteInstance
+from scrollvite.db_router import ReplicaRouter, replica_reads
+from users.models import User
+from .catalog_io import category_record, template_record
+from . import models as catalog_models
+from .models import Category, Order, Template, TemplateVersion
+from .public_cache import PREVIEW_TEMPLATES_KEY, invite_key, missing_invite_key
+from .schema_validation import InvalidSchema, validate_schema
+
+
+# Replica tests run on every suite: without DATABASE_REPLICA_NAMES a replica
+# alias is added here as a TEST MIRROR of default (same test database, own
+# connection), so routing is checked by which connection ran the queries
+if settings.DATABASE_REPLICAS:
+    REPLICA = settings.DATABASE_REPLICAS[0]
+else:
+    REPLICA = "replica_test"
+    settings.DATABASES[REPLICA] = {
+        **settings.DATABASES["default"],
+        "TEST": {**settings.DATABASES["default"].get("TEST", {}), "MIRROR": "default"},
+    }
+
+SCHEMA = {"hero": {"bride_name": "Asha", "groom_name": "Vikram", "wedding_date": "2026-12-12"}}
+
+
+def make_invite(slug="invite-test", schema=SCHEMA, email="host@example.com", **fields):
+    user = User.objects.create_user(email=email, role="BUYER")
+    category, _ = Category.objects.get_or_create(slug="wedding", defaults={"name": "Wedding"})
+    template = Template.objects.create(
+        title="Royal", category=category, schema=schema, price="499.00", is_published=True
+    )
+    order = Order.objects.create(user=user, template=template, amount="499.00", status="ACTIVE")
+    return InviteInstance.objects.create(
+        order=order, template=template, schema=schema, public_slug=slug, **fields
+    )
+
+
+def clear_caches():
+    for alias in settings.CACHES:
+        caches[alias].clear()
+
+
+class MediaTestMixin:
+    """Rendered files go to a temporary MEDIA_ROOT"""
+
+    def setUp(self):
+        super().setUp()
+        clear_caches()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+
+# TransactionTestCase: the mirror reads through its own connection, which
+# only sees committed rows
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaRoutingTests(TransactionTestCase):
+    databases = {"default", REPLICA}
+
+    def setUp(self):
+        clear_caches()
+        self.client = APIClient()
+
+    def _template(self, title):
+        category = Category.objects.create(name="Wedding", slug=f"wedding-{title.lower()}")
+        return Template.objects.create(
+            title=title,
+            category=category,
+            schema=SCHEMA,
+            price="499.00",
+            is_published=True,
+            is_preview=True,
+        )
+
+    def _queries(self, alias, request):
+        with CaptureQueriesContext(connections[alias]) as queries:
+            response = request()
+        return response, len(queries)
+
+    def test_router_reads_from_replica_only_inside_replica_reads(self):
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(Template), "default")
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Template), REPLICA)
+            self.assertEqual(router.db_for_write(Template), "default")
+
+    def test_replicas_are_never_migrated(self):
+        router = ReplicaRouter()
+        self.assertIsNone(router.allow_migrate("default", "templates_app"))
+        self.assertFalse(router.allow_migrate(REPLICA, "templates_app"))
+
+    def test_public_preview_is_served_from_replica(self):
+        response, replica_queries = self._queries(
+            REPLICA, lambda: self.client.get("/api/preview-templates/")
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(replica_queries, 0)
+
+    def test_user_is_pinned_to_primary_after_write(self):
+        user = User.objects.create_user(email="buyer@example.com", role="BUYER")
+        template = self._template("Royal")
+        order = Order.objects.create(
+            user=user, template=template, amount="499.00", schema_snapshot=SCHEMA, status="ACTIVE"
+        )
+        invite = InviteInstance.objects.create(
+            order=order, template=template, schema=SCHEMA, public_slug="invite-test"
+        )
+        self.client.force_authenticate(user)
+
+        _, replica_queries = self._queries(REPLICA, lambda: self.client.get("/api/my-templates/"))
+        self.assertGreater(replica_queries, 0)
+
+        response = self.client.put(f"/api/invites/{invite.id}/", {"schema": SCHEMA}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+        response, replica_queries = self._queries(
+            REPLICA, lambda: self.client.get("/api/my-templates/")
+        )
+        self.assertEqual(replica_queries, 0)
+        self.assertEqual([item["invite_id"] for item in response.json()], [str(invite.id)])
+
+
+class ShareImageTests(MediaTestMixin, TestCase):
+    def test_card_is_rendered_and_served_immutable(self):
+        make_invite()
+        redirect = self.client.get("/api/invite/invite-test/share-image/")
+        self.assertEqual(redirect.status_code, 302)
+
+        response = self.client.get(redirect["Location"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_deactivated_invite_files_are_not_served(self):
+        invite = make_invite()
+        card = self.client.get("/api/invite/invite-test/share-image/")["Location"]
+        self.assertEqual(self.client.get(card).status_code, 200)
+        self.assertEqual(self.client.get("/api/invite/invite-test/qr/256.png").status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invite.is_active = False
+            invite.save()
+
+        self.assertEqual(self.client.get(card).status_code, 404)
+        self.assertEqual(self.client.get("/api/invite/invite-test/qr/256.png").status_code, 404)
+        self.assertEqual(default_storage.listdir("share/invite-test")[1], [])
+        self.assertEqual(default_storage.listdir("qr/invite-test")[1], [])
+
+
+class QRCodeTests(MediaTestMixin, TestCase):
+    def _get(self, name):
+        response = self.client.get(f"/api/invite/invite-test/qr/{name}")
+        if response.status_code == 200:
+            self.addCleanup(response.close)
+        return response
+
+    def test_png_fits_the_requested_size(self):
+        make_invite()
+        response = self._get("256.png")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertIn("immutable", response["Cache-Control"])
+        with Image.open(BytesIO(b"".join(response.streaming_content))) as image:
+            self.assertEqual(image.width, image.height)
+            self.assertGreater(image.width, 128)
+            self.assertLessEqual(image.width, 256)
+
+    def test_svg(self):
+        make_invite()
+        response = self._get("512.svg")
+        self.assertEqual(response["Content-Type"], "image/svg+xml")
+        self.assertIn(b"<svg", b"".join(response.streaming_content))
+
+    def test_unsupported_sizes_and_formats_are_not_found(self):
+        make_invite()
+        for name in ("100.png", "0.png", "4096.svg", "256.gif", "256.jpg", "256.PNG"):
+            self.assertEqual(self._get(name).status_code, 404, name)
+        self.assertFalse(default_storage.exists("qr/invite-test"))
+
+    def test_each_code_is_rendered_once(self):
+        make_invite()
+        with mock.patch.object(qr, "render_qr", wraps=qr.render_qr) as render:
+            for name in ("256.png", "256.png", "256.svg"):
+                self.assertEqual(self._get(name).status_code, 200)
+        self.assertEqual(render.call_count, 2)
+
+    def test_unknown_invite_is_not_found(self):
+        self.assertEqual(self._get("256.png").status_code, 404)
+
+
+class SchemaValidationTests(TestCase):
+    def test_valid_schemas_are_accepted(self):
+        validate_schema("RoyalWeddingTemplate", {
+            **SCHEMA,
+            "events": [{"name": "Sangeet", "time": "7 PM", "theme": "Bollywood"}],
+            "venue": {"name": "Umaid Bhawan", "city": "Jodhpur"},
+            "closing": {"message": "See you there", "signature": None},
+        })
+        validate_schema("PhotoStoryTemplate", {
+            **SCHEMA,
+            "photo_gallery": {"photos": ["https://cdn.example.com/1.jpg"]},
+            "our_story": {"timeline": [{"title": "First met", "season": "Spring"}]},
+        })
+        # Unknown components get the common sections
+        validate_schema("NewTemplate", SCHEMA)
+
+    def test_invalid_schemas_are_rejected(self):
+        invalid = [
+            [],
+            {"events": []},
+            {"hero": "Asha & Vikram"},
+            {"hero": {"bride_name": "x" * 501}},
+            {"hero": {"wedding_date": "December"}},
+            {"hero": {"nested": {"not": "scalar"}}},
+            {"hero": {f"extra_{i}": "x" for i in range(40)}},
+            {**SCHEMA, "events": [{"name": "Event"}] * 31},
+            {**SCHEMA, "venue": {"google_maps_link": "https://maps.example.com/" + "x" * 2000}},
+            {**SCHEMA, "closing": {"message": "x" * 300 * 1024}},
+        ]
+        for schema in invalid:
+            with self.subTest(schema=str(schema)[:60]), self.assertRaises(InvalidSchema):
+                validate_schema("RoyalWeddingTemplate", schema)
+
+        with self.assertRaises(InvalidSchema):
+            validate_schema("PhotoStoryTemplate", {**SCHEMA, "photo_gallery": {"photos": ["x"] * 61}})
+
+    def test_integers_wider_than_64_bits(self):
+        # orjson can't encode these; sizing falls back to the stdlib encoder
+        validate_schema("RoyalWeddingTemplate", {"hero": {**SCHEMA["hero"], "guests": 2 ** 70}})
+        with self.assertRaises(InvalidSchema):
+            validate_schema("RoyalWeddingTemplate", {"hero": {**SCHEMA["hero"], "guests": 10 ** 5000}})
+
+        invite = make_invite()
+        client = APIClient()
+        client.force_authenticate(invite.order.user)
+        body = '{"schema": {"hero": {"bride_name": "Asha", "guests": %d}}}' % 2 ** 70
+        response = client.put(f"/api/invites/{invite.id}/", body, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        invite.refresh_from_db()
+        self.assertEqual(invite.schema["hero"]["guests"], 2 ** 70)
+
+    def test_invite_save_rejects_invalid_schema(self):
+        invite = make_invite()
+        client = APIClient()
+        client.force_authenticate(invite.order.user)
+
+        response = client.put(
+            f"/api/invites/{invite.id}/", {"schema": {"hero": {"wedding_date": "soon"}}}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Invalid schema", response.json()["error"])
+        invite.refresh_from_db()
+        self.assertEqual(invite.schema, SCHEMA)
+
+
+class PublicCacheTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        # Buffered invite views are written inside the test transaction
+        self.addCleanup(view_counter.flush)
+
+    def test_invite_is_served_from_cache_until_saved(self):
+        invite = make_invite()
+        self.assertEqual(self.client.get("/api/invite/invite-test/").json()["schema"], SCHEMA)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/api/invite/invite-test/").status_code, 200)
+
+        changed = {"hero": {**SCHEMA["hero"], "bride_name": "Meera"}}
+        with self.captureOnCommitCallbacks(execute=True):
+            invite.schema = changed
+            invite.save()
+            # Not before commit: a concurrent request would re-cache the old row
+            self.assertIsNotNone(cache.get(invite_key("invite-test")))
+        self.assertIsNone(cache.get(invite_key("invite-test")))
+        self.assertEqual(self.client.get("/api/invite/invite-test/").json()["schema"], changed)
+
+    def test_unknown_slug_is_cached_until_created(self):
+        self.assertEqual(self.client.get("/api/invite/invite-test/").status_code, 404)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/api/invite/invite-test/").status_code, 404)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_invite()
+        self.assertEqual(self.client.get("/api/invite/invite-test/").status_code, 200)
+
+    def test_unknown_slugs_use_the_negative_cache(self):
+        self.client.get("/api/invite/guessed-slug/")
+        self.assertIsNone(cache.get(missing_invite_key("guessed-slug")))
+        self.assertTrue(caches["negative"].get(missing_invite_key("guessed-slug")))
+
+    def test_reactivation_by_queryset_update_clears_the_404(self):
+        invite = make_invite(is_active=False)
+        self.assertEqual(self.client.get("/api/invite/invite-test/").status_code, 404)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            InviteInstance.objects.filter(pk=invite.pk).update(is_active=True)
+        self.assertEqual(self.client.get("/api/invite/invite-test/").status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            InviteInstance.objects.filter(pk=invite.pk).update(is_active=False)
+        self.assertEqual(self.client.get("/api/invite/invite-test/").status_code, 404)
+
+    def test_rolled_back_writes_keep_the_cache(self):
+        invite = make_invite()
+        self.client.get("/api/invite/invite-test/")
+        with self.captureOnCommitCallbacks() as callbacks:
+            invite.save()
+        self.assertTrue(callbacks)
+        self.assertIsNotNone(cache.get(invite_key("invite-test")))
+
+    def test_preview_templates_are_invalidated_on_template_save(self):
+        template = make_invite().template
+        template.is_preview = True
+        with self.captureOnCommitCallbacks(execute=True):
+            template.save()
+
+        self.assertEqual([t["id"] for t in self.client.get("/api/preview-templates/").json()], [template.id])
+        with self.assertNumQueries(0):
+            self.client.get("/api/preview-templates/")
+        self.assertEqual(self.client.get(f"/api/template-preview/{template.id}/").status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            template.is_preview = False
+            template.save()
+        self.assertIsNone(cache.get(PREVIEW_TEMPLATES_KEY))
+        self.assertEqual(self.client.get("/api/preview-templates/").json(), [])
+        self.assertEqual(self.client.get(f"/api/template-preview/{template.id}/").status_code, 404)
+
+
+class CatalogImportExportTests(MediaTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def _catalog(self):
+        categories = {c.slug: category_record(c) for c in Category.objects.all()}
+        templates = {
+            t.slug: template_record(t, t.category.slug)
+            for t in Template.objects.select_related("category")
+        }
+        return categories, templates
+
+    def _import(self, *args):
+        out = StringIO()
+        call_command("import_catalog", self.directory, *args, stdout=out)
+        return out.getvalue()
+
+    def test_round_trip(self):
+        image = default_storage.save("templates/royal.jpg", ContentFile(b"jpeg bytes"))
+        wedding = Category.objects.create(name="Wedding", slug="wedding")
+        Category.objects.create(name="Birthday", slug="birthday", is_active=False)
+        Template.objects.create(
+            title="Royal", category=wedding, schema=SCHEMA, price="499.00", region="North",
+            template_component="RoyalWeddingTemplate", default_hero_image=image,
+            is_published=True, is_preview=True,
+        )
+        Template.objects.create(title="Draft", category=wedding, schema=SCHEMA, price="99.50")
+        before = self._catalog()
+
+        call_command("export_catalog", self.directory, stdout=StringIO())
+        Template.objects.all().delete()
+        Category.objects.all().delete()
+        default_storage.delete(image)
+
+        self.assertIn("2 new and 0 updated templates", self._import())
+        self.assertEqual(self._catalog(), before)
+        self.assertTrue(default_storage.exists(image))
+        self.assertEqual(TemplateVersion.objects.filter(template__slug__startswith="royal").count(), 1)
+
+        # Importing the same catalog again changes nothing
+        self.assertIn("0 new and 0 updated templates", self._import())
+
+    def test_image_names_outside_media_are_rejected(self):
+        Path(self.directory, "categories.json").write_text(json.dumps([
+            {"slug": "wedding", "name": "Wedding", "default_image": "../../etc/passwd"},
+        ]))
+        for args in ((), ("--dry-run",)):
+            with self.assertRaisesMessage(CommandError, "categories.json[1]: invalid image name"):
+                self._import(*args)
+        self.assertFalse(Category.objects.exists())
+
+
+class TemplateVersionTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        category = Category.objects.create(name="Wedding", slug="wedding")
+        self.template = Template.objects.create(
+            title="Royal", category=category, schema=SCHEMA, price="499.00", is_published=True
+        )
+
+    def _numbers(self):
+        return list(self.template.versions.order_by("number").values_list("number", flat=True))
+
+    def test_publishing_snapshots_each_distinct_schema_once(self):
+        first = self.template.current_version
+        self.assertEqual((first.number, first.schema), (1, SCHEMA))
+
+        self.template.save()
+        self.assertEqual(self._numbers(), [1])
+
+        changed = {"hero": {**SCHEMA["hero"], "bride_name": "Meera"}}
+        self.template.schema = changed
+        self.template.save()
+        self.template.refresh_from_db()
+        self.assertEqual(self._numbers(), [1, 2])
+        self.assertEqual(self.template.current_version.schema, changed)
+
+        # Going back reuses version 1
+        self.template.schema = SCHEMA
+        self.template.save()
+        self.assertEqual(self._numbers(), [1, 2])
+        self.assertEqual(self.template.current_version_id, first.id)
+
+    def test_load_schema_is_cached(self):
+        version_id = self.template.current_version_id
+        self.assertEqual(TemplateVersion.load_schema(version_id), SCHEMA)
+        with self.assertNumQueries(0):
+            self.assertEqual(TemplateVersion.load_schema(version_id), SCHEMA)
+
+    def test_publish_retries_when_a_concurrent_publisher_wins(self):
+        real = catalog_models._publish_versions
+        attempts = []
+
+        def racing(templates, using):
+            attempts.append(using)
+            if len(attempts) == 1:
+                # Another worker inserted the same version number first
+                raise IntegrityError("UNIQUE constraint failed: unique_template_version_number")
+            return real(templates, using)
+
+        self.template.schema = {"hero": {"bride_name": "Meera"}}
+        with mock.patch.object(catalog_models, "_publish_versions", racing):
+            version_id = self.template.publish_version()
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(self.template.current_version_id, version_id)
+        self.assertEqual(self._numbers(), [1, 2])
+
+        with mock.patch.object(catalog_models, "_publish_versions", side_effect=IntegrityError):
+            with self.assertRaises(IntegrityError):
+                self.template.publish_version()
+
+    def test_version_detail_is_limited_to_buyers(self):
+        buyer = User.objects.create_user(email="buyer@example.com", role="BUYER")
+        stranger = User.objects.create_user(email="stranger@example.com", role="BUYER")
+        version = self.template.current_version
+        Order.objects.create(user=buyer, template=self.template, amount="499.00", template_version=version)
+
+        client = APIClient()
+        client.force_authenticate(buyer)
+        response = client.get(f"/api/template-version/{version.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["schema"], SCHEMA)
+        self.assertEqual(response["ETag"], f'"{version.content_hash}"')
+
+        client.force_authenticate(stranger)
+        self.assertEqual(client.get(f"/api/template-version/{version.id}/").status_code, 404)
+
+    def test_reverse_migration_restores_order_snapshots(self):
+        migration = importlib.import_module("templates_app.migrations.0010_templateversion")
+        buyer = User.objects.create_user(email="buyer@example.com", role="BUYER")
+        order = Order.objects.create(
+            user=buyer, template=self.template, amount="499.00",
+            template_version=self.template.current_version,
+        )
+        migration.restore_snapshots(apps, None)
+        order.refresh_from_db()
+        self.assertEqual(order.schema_snapshot, SCHEMA)
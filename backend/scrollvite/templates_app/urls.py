@@ -6,8 +6,14 @@ from .views import (
     TemplateEditorView,
     TemplateSaveView,
     TemplateByCategoryView,
+    TemplateVersionListView,
+    TemplateVersionDetailView,
     CreateOrderView,
     InviteView,
+    InviteShareImageView,
+    InviteShareImageFileView,
+    InviteQRCodeView,
+    InviteRSVPView,
     PreviewTemplatesView,
     TemplatePreviewDetailView,
 )
@@ -20,10 +26,16 @@ urlpatterns = [
     path('template-editor/<int:template_id>/', TemplateEditorView.as_view()),
     path('template-save/<int:template_id>/', TemplateSaveView.as_view()),
     path('templates-by-category/<slug:category_slug>/', TemplateByCategoryView.as_view()),
+    path('template-versions/<int:template_id>/', TemplateVersionListView.as_view()),
+    path('template-version/<int:version_id>/', TemplateVersionDetailView.as_view()),
     path('create-order/<int:template_id>/', CreateOrderView.as_view()),
     
     # Public endpoints
     path('invite/<slug:slug>/', InviteView.as_view()),
+    path('invite/<slug:slug>/share-image/', InviteShareImageView.as_view()),
+    path('invite/<slug:slug>/share-image/<slug:digest>.jpg', InviteShareImageFileView.as_view()),
+    path('invite/<slug:slug>/rsvp/', InviteRSVPView.as_view()),
+    path('invite/<slug:slug>/qr/<int:size>.<slug:fmt>', InviteQRCodeView.as_view()),
     
     # NEW: Public preview endpoints (no auth required)
     path('preview-templates/', PreviewTemplatesView.as_view()),
@@ -0,0 +1,35 @@
+# File: backend/scrollvite/templates_app/versioning.py
+# Content hashing and compression for TemplateVersion snapshots
+#
+# A version's identity is the SHA-256 of its canonical JSON (sorted keys, no
+# whitespace), so saving the same schema twice maps to the same row. The
+# JSON is stored zlib-compressed; schemas are repetitive text and typically
+# shrink 5-10x.
+
+import hashlib
+import json
+import zlib
+
+COMPRESSION_LEVEL = 6
+
+
+def canonical_json(schema):
+    return json.dumps(schema, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def schema_hash(schema):
+    return hashlib.sha256(canonical_json(schema)).hexdigest()
+
+
+def compress_schema(schema):
+    """(compressed bytes, uncompressed size, content hash) for a schema"""
+    data = canonical_json(schema)
+    return zlib.compress(data, COMPRESSION_LEVEL), len(data), hashlib.sha256(data).hexdigest()
+
+
+def decompress_schema(data):
+    return json.loads(zlib.decompress(bytes(data)))
+
+
+def version_key(version_id):
+    return f"template-version:{version_id}"
@@ -2,24 +2,55 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
-from .models import Category, Template
-from orders.models import InviteInstance
+from .models import Category, Template, TemplateVersion
+from orders.models import Guest, InviteInstance, RSVPResponse
 from .serializers import CategorySerializer, TemplateSerializer
+from scrollvite.db_router import ReplicaReadMixin
+from scrollvite.throttling import BucketThrottle
 from .permissions import IsSuperAdmin
+from .schema_validation import validate_schema, InvalidSchema
 from .models import Order
-from django.shortcuts import get_object_or_404
-import copy
+from .public_cache import (
+    CATEGORIES_KEY,
+    PREVIEW_TEMPLATES_KEY,
+    get_missing_alias,
+    get_missing_timeout,
+    get_timeout,
+    invite_active_key,
+    invite_key,
+    invite_share_key,
+    missing_invite_key,
+    template_preview_key,
+)
+from adrf.views import APIView as AsyncAPIView
+from scrollvite.caching import cache_aadd, cache_aget, cache_aset
+from orders.archive import restore_invite
+from orders.analytics import UNIQUE_VISITOR_TIMEOUT, unique_visitor_key, view_counter, visitor_id
+from orders.share_image import card_digest, get_share_image, share_image_path
+from orders.qr import QR_FORMATS, QR_SIZES, get_qr_code
+from orders.rollups import record_order
+from orders.rsvp import InvalidRSVP, build_responses
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponseRedirect
+from django.shortcuts import aget_object_or_404, get_object_or_404
+from django.utils import timezone
 import uuid
 
-class CategoryListView(APIView):
+class CategoryListView(ReplicaReadMixin, AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
-        categories = Category.objects.filter(is_active=True)
-        return Response(CategorySerializer(categories, many=True).data)
+    async def get(self, request):
+        data = await cache_aget(CATEGORIES_KEY)
+        if data is None:
+            categories = [c async for c in Category.objects.filter(is_active=True)]
+            data = CategorySerializer(categories, many=True).data
+            await cache_aset(CATEGORIES_KEY, data, get_timeout())
+        return Response(data)
 
 
-class TemplateListView(APIView):
+class TemplateListView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, category_slug):
@@ -40,7 +71,7 @@ class TemplateListView(APIView):
         return Response(TemplateSerializer(templates, many=True).data)
 
 
-class TemplateDetailView(APIView):
+class TemplateDetailView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, template_id):
@@ -73,6 +104,15 @@ class TemplateSaveView(APIView):
     def post(self, request, template_id):
         template = Template.objects.get(id=template_id)
 
+        if "schema" in request.data:
+            try:
+                validate_schema(template.template_component, request.data["schema"])
+            except InvalidSchema as e:
+                return Response(
+                    {"error": f"Invalid schema: {e}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
         template.schema = request.data.get("schema", template.schema)
         template.is_published = request.data.get("is_published", template.is_published)
 
@@ -81,7 +121,44 @@ class TemplateSaveView(APIView):
         return Response({"status": "saved"})
 
 
-class TemplateByCategoryView(APIView):
+class TemplateVersionListView(ReplicaReadMixin, APIView):
+    """Published versions of a template, newest first (metadata only)"""
+    permission_classes = [IsAuthenticated, IsSuperAdmin]
+
+    def get(self, request, template_id):
+        template = get_object_or_404(Template.objects.only('id', 'current_version'), id=template_id)
+        versions = template.versions.values('id', 'number', 'content_hash', 'schema_size', 'created_at')
+        return Response({
+            "template_id": template.id,
+            "current_version": template.current_version_id,
+            "versions": list(versions),
+        })
+
+
+class TemplateVersionDetailView(ReplicaReadMixin, APIView):
+    """
+    One version including its schema. Super admins can read any version,
+    buyers only versions they have an order for.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, version_id):
+        versions = TemplateVersion.objects.defer('compressed_schema')
+        if request.user.role != "SUPER_ADMIN":
+            versions = versions.filter(orders__user=request.user).distinct()
+        version = get_object_or_404(versions, id=version_id)
+
+        return Response({
+            "id": version.id,
+            "template_id": version.template_id,
+            "number": version.number,
+            "content_hash": version.content_hash,
+            "created_at": version.created_at,
+            "schema": TemplateVersion.load_schema(version.id),
+        }, headers={"ETag": f'"{version.content_hash}"'})
+
+
+class TemplateByCategoryView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, category_slug):
@@ -96,54 +173,70 @@ class TemplateByCategoryView(APIView):
 
 # ==================== NEW PUBLIC ENDPOINTS ====================
 
-class PreviewTemplatesView(APIView):
+class PreviewTemplatesView(ReplicaReadMixin, AsyncAPIView):
     """
     Public endpoint - Returns max 5 templates for homepage preview
     No authentication required
     """
     permission_classes = []
-
-    def get(self, request):
-        templates = Template.objects.filter(
-            is_active=True,
-            is_published=True,
-            is_preview=True
-        ).order_by('-created_at')[:5]  # Max 5 templates, newest first
-        
-        serializer = TemplateSerializer(templates, many=True)
-        return Response(serializer.data)
-
-
-class TemplatePreviewDetailView(APIView):
+    throttle_classes = [BucketThrottle]
+    throttle_scope = "catalog"
+
+    async def get(self, request):
+        data = await cache_aget(PREVIEW_TEMPLATES_KEY)
+        if data is None:
+            templates = [
+                t async for t in Template.objects.filter(
+                    is_active=True,
+                    is_published=True,
+                    is_preview=True
+                ).order_by('-created_at')[:5]  # Max 5 templates, newest first
+            ]
+            data = TemplateSerializer(templates, many=True).data
+            await cache_aset(PREVIEW_TEMPLATES_KEY, data, get_timeout())
+        return Response(data)
+
+
+class TemplatePreviewDetailView(ReplicaReadMixin, AsyncAPIView):
     """
     Public endpoint - Returns single template for demo preview
     No authentication required
     Only accessible if template has is_preview=True
     """
     permission_classes = []
+    throttle_classes = [BucketThrottle]
+    throttle_scope = "catalog"
+
+    async def get(self, request, template_id):
+        key = template_preview_key(template_id)
+        cached = await cache_aget(key)
+        if cached is None:
+            template = await aget_object_or_404(
+                Template,
+                id=template_id,
+                is_active=True,
+                is_published=True,
+                is_preview=True
+            )
+            cached = {
+                "id": template.id,
+                "version": template.current_version_id,
+                "title": template.title,
+                "schema": template.schema,
+                "template_component": template.template_component,
+                "price": str(template.price),
+                # Relative URL; made absolute per request below
+                "default_hero_image": template.default_hero_image.url if template.default_hero_image else None,
+            }
+            await cache_aset(key, cached, get_timeout())
 
-    def get(self, request, template_id):
-        template = get_object_or_404(
-            Template,
-            id=template_id,
-            is_active=True,
-            is_published=True,
-            is_preview=True
-        )
-        
         # Build response with necessary fields
-        response_data = {
-            "id": template.id,
-            "title": template.title,
-            "schema": template.schema,
-            "template_component": template.template_component,
-            "price": str(template.price),
-        }
-        
+        response_data = {k: v for k, v in cached.items() if k != "default_hero_image"}
+
         # Add default_hero_image URL if exists
-        if template.default_hero_image:
+        if cached["default_hero_image"]:
             response_data["default_hero_image_url"] = request.build_absolute_uri(
-                template.default_hero_image.url
+                cached["default_hero_image"]
             )
         else:
             response_data["default_hero_image_url"] = None
@@ -155,6 +248,8 @@ class TemplatePreviewDetailView(APIView):
 
 class CreateOrderView(APIView):
     permission_classes = [IsAuthenticated]
+    throttle_classes = [BucketThrottle]
+    throttle_scope = "payment"
 
     def post(self, request, template_id):
         template = get_object_or_404(Template, id=template_id)
@@ -182,13 +277,15 @@ class CreateOrderView(APIView):
         order = Order.objects.create(
             user=request.user,
             template=template,
-            schema_snapshot=copy.deepcopy(template.schema)
+            template_version_id=template.get_version_id()
         )
+        record_order(order)
 
         invite = InviteInstance.objects.create(
             order=order,
             template=template,
-            schema=copy.deepcopy(template.schema),
+            template_version_id=order.template_version_id,
+            schema=order.purchased_schema(),
             public_slug=f"invite-{uuid.uuid4().hex[:10]}"
         )
 
@@ -201,25 +298,188 @@ class CreateOrderView(APIView):
         })
 
     
-class InviteView(APIView):
+async def get_public_invite(slug):
+    """Cached public data of an active invite; raises Http404"""
+    key = invite_key(slug)
+    data = await cache_aget(key)
+    if data is None:
+        # Unknown slugs are cached too, so guessing slugs doesn't reach the DB
+        if await cache_aget(missing_invite_key(slug), alias=get_missing_alias()):
+            raise Http404
+        try:
+            invite = await InviteInstance.objects.select_related('template').only(
+                'id', 'public_slug', 'schema', 'is_archived', 'expires_at', 'template__template_component'
+            ).aget(public_slug=slug, is_active=True)
+        except InviteInstance.DoesNotExist:
+            await cache_aset(
+                missing_invite_key(slug), True, get_missing_timeout(), alias=get_missing_alias()
+            )
+            raise Http404
+        if invite.is_archived and not (invite.expires_at and timezone.now() > invite.expires_at):
+            # Expired guests only get a 410, so only a re-extended invite needs its schema back
+            await sync_to_async(restore_invite)(invite)
+        data = {
+            "id": invite.id,
+            "schema": invite.schema,
+            "template_component": invite.template.template_component,
+            "expires_at": invite.expires_at,
+        }
+        await cache_aset(key, data, get_timeout())
+    return data
+
+
+def is_expired(data):
+    return bool(data["expires_at"]) and timezone.now() > data["expires_at"]
+
+
+class InviteView(ReplicaReadMixin, AsyncAPIView):
     permission_classes = []
+    throttle_classes = [BucketThrottle]
+    throttle_scope = "invite"
 
-    def get(self, request, slug):
-        invite = get_object_or_404(
-            InviteInstance,
-            public_slug=slug,
-            is_active=True
-        )
+    async def get(self, request, slug):
+        data = await get_public_invite(slug)
 
         # Check if expired
-        if invite.is_expired():
+        if is_expired(data):
             return Response({
                 "expired": True,
                 "message": "This invitation has expired. Please contact the host."
             }, status=status.HTTP_410_GONE)
 
-        return Response({
-            "schema": invite.schema,
-            "template_component": invite.template.template_component,
-        })
-    
\ No newline at end of file
+        # Buffered: no database write on the request path
+        visitor = visitor_id(request)
+        is_unique = await cache_aadd(
+            unique_visitor_key(data["id"], visitor), True, UNIQUE_VISITOR_TIMEOUT
+        )
+        view_counter.record(data["id"], visitor, is_unique)
+        if view_counter.is_due():
+            await sync_to_async(view_counter.flush)()
+
+        payload = {
+            "schema": data["schema"],
+            "template_component": data["template_component"],
+        }
+
+        # Personal link from the host's guest list
+        token = request.query_params.get("guest")
+        if token:
+            guest = await Guest.objects.filter(invite_id=data["id"], token=token).values(
+                "name", "party_size"
+            ).afirst()
+            if guest:
+                payload["guest"] = guest
+
+        return Response(payload)
+
+
+class InviteRSVPView(AsyncAPIView):
+    """
+    Guest RSVP for an invite's events:
+    {"name", "contact"?, "message"?, "responses": [{"event", "status", "party_size"?}]}
+    """
+    permission_classes = []
+    throttle_classes = [BucketThrottle]
+    throttle_scope = "rsvp"
+
+    async def post(self, request, slug):
+        data = await get_public_invite(slug)
+        if is_expired(data):
+            return Response(
+                {"error": "This invitation has expired."},
+                status=status.HTTP_410_GONE
+            )
+
+        try:
+            responses = build_responses(data["id"], data["schema"], request.data)
+        except InvalidRSVP as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Append only; the aggregate_rsvps cron command counts it into the tallies
+        await RSVPResponse.objects.abulk_create(responses)
+
+        return Response({"success": True, "responses": len(responses)}, status=status.HTTP_201_CREATED)
+
+
+SHARE_IMAGE_FIELDS = ('public_slug', 'bride_name', 'groom_name', 'wedding_date', 'hero_image')
+# Cache-Control max-age of content-addressed files (share cards, QR codes)
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+
+def _immutable_file(path, content_type):
+    response = FileResponse(default_storage.open(path, "rb"), content_type=content_type)
+    response["Cache-Control"] = f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    return response
+
+
+def _is_active_invite(slug):
+    """
+    Rendered files are only served while their invite is active. Cached for
+    PUBLIC_CACHE_TIMEOUT; saving the invite clears it.
+    """
+    active = cache.get(invite_active_key(slug))
+    if active is None:
+        active = InviteInstance.objects.filter(public_slug=slug, is_active=True).exists()
+        cache.set(invite_active_key(slug), active, get_timeout())
+    return active
+
+
+def _share_image_redirect(path, digest):
+    response = HttpResponseRedirect(f"{path}{digest}.jpg")
+    response["Cache-Control"] = f"public, max-age={get_timeout()}"
+    return response
+
+
+class InviteShareImageView(APIView):
+    """
+    Redirects to the invite's current share card (og:image). The card URL
+    contains a hash of its content, so it's served as immutable.
+    """
+    permission_classes = []
+
+    def get(self, request, slug):
+        digest = cache.get(invite_share_key(slug))
+        if digest is None:
+            invite = get_object_or_404(
+                InviteInstance.objects.only(*SHARE_IMAGE_FIELDS), public_slug=slug, is_active=True
+            )
+            digest = card_digest(invite)
+            cache.set(invite_share_key(slug), digest, get_timeout())
+        return _share_image_redirect(request.path, digest)
+
+
+class InviteShareImageFileView(APIView):
+    permission_classes = []
+
+    def get(self, request, slug, digest):
+        if not _is_active_invite(slug):
+            raise Http404
+        path = share_image_path(slug, digest)
+        if not default_storage.exists(path):
+            invite = get_object_or_404(
+                InviteInstance.objects.only(*SHARE_IMAGE_FIELDS), public_slug=slug, is_active=True
+            )
+            current = card_digest(invite)
+            if digest != current:
+                # Outdated link (the invite was edited since)
+                return _share_image_redirect(request.path.rsplit("/", 1)[0] + "/", current)
+            path = get_share_image(invite)
+
+        return _immutable_file(path, "image/jpeg")
+
+
+class InviteQRCodeView(APIView):
+    """
+    QR code of the invite's public URL, for printing.
+    /api/invite/<slug>/qr/<size>.png|svg with size one of QR_SIZES.
+    """
+    permission_classes = []
+
+    def get(self, request, slug, size, fmt):
+        if size not in QR_SIZES or fmt not in QR_FORMATS:
+            raise Http404
+
+        if not _is_active_invite(slug):
+            raise Http404
+        path = get_qr_code(slug, size, fmt)
+        return _immutable_file(path, QR_FORMATS[fmt])
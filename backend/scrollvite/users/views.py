@@ -5,24 +5,19 @@ from rest_framework import status
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.tokens import RefreshToken
+from scrollvite.throttling import BucketThrottle
 
 User = get_user_model()
 
 GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v3/userinfo"
 
-import requests
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.tokens import RefreshToken
-
-User = get_user_model()
-
 GOOGLE_TOKEN_INFO_URL = "https://oauth2.googleapis.com/tokeninfo"
 
 
 class GoogleLoginView(APIView):
     permission_classes = []
+    throttle_classes = [BucketThrottle]
+    throttle_scope = "auth"
 
     def post(self, request):
         id_token = request.data.get("id_token")
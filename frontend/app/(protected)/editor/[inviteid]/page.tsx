@@ -25,6 +25,9 @@ export default function InviteEditorPage() {
   const [showExpiryAlert, setShowExpiryAlert] = useState(true);
   const [hasUnsavedChanges, setHasUnsavedChanges] = useState(false);
   const [lastSaved, setLastSaved] = useState<Date | null>(null);
+  const [version, setVersion] = useState<number | null>(null);
+  // Seconds until a buffered autosave (202) must be re-sent as a plain save
+  const [pendingFlush, setPendingFlush] = useState<number | null>(null);
 
   // Auto-dismiss expiry alert after 3 seconds
   useEffect(() => {
@@ -52,6 +55,7 @@ export default function InviteEditorPage() {
           return;
         }
         setSchema(data.schema);
+        setVersion(data.version ?? null);
         setTemplateTitle(data.template_title);
         setPublicSlug(data.public_slug);
         setTemplateComponent(data.template_component || "RoyalWeddingTemplate");
@@ -66,20 +70,30 @@ export default function InviteEditorPage() {
   }, [inviteId, router]);
 
   // Auto-save function (debounced)
-  const autoSave = useCallback(async (schemaToSave: any) => {
+  const autoSave = useCallback(async (schemaToSave: any, autosave = true) => {
     if (!schemaToSave) return;
     
     try {
       setSaving(true);
-      await saveInviteInstance(inviteId, schemaToSave);
+      const result = await saveInviteInstance(inviteId, schemaToSave, { version, autosave });
+      setVersion(result.version ?? null);
       setHasUnsavedChanges(false);
-      setLastSaved(new Date());
+      if (result.persisted) {
+        setPendingFlush(null);
+        setLastSaved(new Date());
+      } else {
+        // Buffered on the server, not in the database yet
+        setPendingFlush(result.retryAfter || 1);
+      }
       setSaving(false);
     } catch (error) {
       setSaving(false);
+      if (error instanceof Error && error.message === "conflict") {
+        showToast.error("This invite was changed in another window. Reload to continue.");
+      }
       console.error("Auto-save failed:", error);
     }
-  }, [inviteId]);
+  }, [inviteId, version]);
 
   // Auto-save with debounce (2 seconds after user stops typing)
   useEffect(() => {
@@ -92,6 +106,17 @@ export default function InviteEditorPage() {
     return () => clearTimeout(timeoutId);
   }, [schema, hasUnsavedChanges, autoSave]);
 
+  // Persist a buffered autosave once the server's autosave window closes
+  useEffect(() => {
+    if (!schema || hasUnsavedChanges || pendingFlush == null) return;
+
+    const timeoutId = setTimeout(() => {
+      autoSave(schema, false);
+    }, pendingFlush * 1000);
+
+    return () => clearTimeout(timeoutId);
+  }, [schema, hasUnsavedChanges, pendingFlush, autoSave]);
+
   // Expired state
   if (expired) {
     return (
@@ -214,12 +239,18 @@ export default function InviteEditorPage() {
   const handleManualSave = async () => {
     setSaving(true);
     try {
-      await saveInviteInstance(inviteId, schema);
+      const result = await saveInviteInstance(inviteId, schema, { version });
+      setVersion(result.version ?? null);
       setHasUnsavedChanges(false);
+      setPendingFlush(null);
       setLastSaved(new Date());
       showToast.success("Saved successfully! ✨");
     } catch (error) {
-      showToast.error("Failed to save. Please try again.");
+      if (error instanceof Error && error.message === "conflict") {
+        showToast.error("This invite was changed in another window. Reload to continue.");
+      } else {
+        showToast.error("Failed to save. Please try again.");
+      }
     } finally {
       setSaving(false);
     }
@@ -240,7 +271,7 @@ export default function InviteEditorPage() {
       );
     }
     
-    if (hasUnsavedChanges) {
+    if (hasUnsavedChanges || pendingFlush != null) {
       return (
         <div className="flex items-center gap-2 px-3 py-1.5 bg-orange-50 rounded-full border border-orange-200 shadow-sm">
           <span className="h-2 w-2 bg-orange-500 rounded-full animate-pulse"></span>
@@ -504,9 +535,13 @@ export default function InviteEditorPage() {
               <button
                 className="w-full gradient-button text-[#2C2416] px-4 py-2 mt-3 font-semibold rounded-full hover:shadow-lg transition-all disabled:opacity-50 disabled:cursor-not-allowed text-xs"
                 onClick={handleManualSave}
-                disabled={saving || !hasUnsavedChanges}
+                disabled={saving || (!hasUnsavedChanges && pendingFlush == null)}
               >
-                {saving ? "Saving..." : hasUnsavedChanges ? "Save Now" : "All Changes Saved ✓"}
+                {saving
+                  ? "Saving..."
+                  : hasUnsavedChanges || pendingFlush != null
+                    ? "Save Now"
+                    : "All Changes Saved ✓"}
               </button>
               
               <p className="text-xs text-center text-[#8B4513] mt-2">
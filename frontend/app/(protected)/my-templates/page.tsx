@@ -2,7 +2,7 @@
 
 import { useEffect, useState } from "react";
 import { useRouter } from "next/navigation";
-import { fetchMyTemplates, getHeroImage } from "@/lib/api";
+import { fetchMyTemplates } from "@/lib/api";
 
 type PurchasedTemplate = {
   invite_id: string;
@@ -15,7 +15,8 @@ type PurchasedTemplate = {
   is_expired: boolean;
   bride_name: string;
   groom_name: string;
-  schema?: any;
+  hero_image: string | null;
+  wedding_date: string | null;
 };
 
 export default function MyTemplatesPage() {
@@ -144,9 +145,9 @@ export default function MyTemplatesPage() {
                   {/* Template Preview Area */}
                   <div className="p-3 sm:p-4">
                     <div className="h-40 sm:h-48 bg-gradient-to-br from-gray-50 to-gray-100 rounded-2xl flex items-center justify-center relative overflow-hidden">
-                      {getHeroImage(template.schema) ? (
+                      {template.hero_image ? (
                         <img
-                          src={getHeroImage(template.schema)!}
+                          src={template.hero_image}
                           alt={template.template_title}
                           className="w-full h-full object-cover"
                         />
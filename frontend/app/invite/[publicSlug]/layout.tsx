@@ -0,0 +1,38 @@
+import type { Metadata } from "next";
+
+const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://127.0.0.1:8000";
+
+// Link previews in chat apps; the backend renders and caches the card
+export async function generateMetadata({
+  params,
+}: {
+  params: Promise<{ publicSlug: string }>;
+}): Promise<Metadata> {
+  const { publicSlug } = await params;
+  const image = {
+    url: `${API_BASE_URL}/api/invite/${publicSlug}/share-image/`,
+    width: 1200,
+    height: 630,
+  };
+
+  return {
+    title: "You're invited!",
+    openGraph: {
+      title: "You're invited!",
+      type: "website",
+      images: [image],
+    },
+    twitter: {
+      card: "summary_large_image",
+      images: [image.url],
+    },
+  };
+}
+
+export default function InviteLayout({
+  children,
+}: {
+  children: React.ReactNode;
+}) {
+  return children;
+}
@@ -132,21 +132,58 @@ export async function fetchInviteInstance(inviteId: string) {
   return res.json();
 }
 
+const SAVE_ATTEMPTS = 3;
+
 /**
  * API: Save invite instance schema (user-owned)
+ *
+ * `persisted` is false when the backend buffered an autosave (202): the
+ * change is not in the database yet, and a plain save should follow after
+ * `retryAfter` seconds. A 409 with Retry-After (another save of the same
+ * invite in progress) is retried; any other 409 is a version conflict.
  */
-export async function saveInviteInstance(inviteId: string, schema: any) {
-  const res = await fetch(`${API_BASE_URL}/api/invites/${inviteId}/`, {
-    method: "PUT",
-    headers: getAuthHeaders(),
-    body: JSON.stringify({ schema }),
-  });
-
-  if (!res.ok) {
-    throw new Error("Failed to save invite");
+export async function saveInviteInstance(
+  inviteId: string,
+  schema: any,
+  options: { version?: number | null; autosave?: boolean } = {}
+) {
+  const headers: Record<string, string> = {
+    ...(getAuthHeaders() as Record<string, string>),
+  };
+  if (options.version != null) {
+    headers["If-Match"] = `"${options.version}"`;
+  }
+  if (options.autosave) {
+    headers["X-Autosave"] = "1";
   }
 
-  return res.json();
+  for (let attempt = 1; ; attempt++) {
+    const res = await fetch(`${API_BASE_URL}/api/invites/${inviteId}/`, {
+      method: "PUT",
+      headers,
+      body: JSON.stringify({ schema }),
+    });
+
+    if (res.status === 409) {
+      const wait = Number(res.headers.get("Retry-After"));
+      if (wait && attempt < SAVE_ATTEMPTS) {
+        await new Promise((resolve) => setTimeout(resolve, wait * 1000));
+        continue;
+      }
+      throw new Error("conflict");
+    }
+
+    if (!res.ok) {
+      throw new Error("Failed to save invite");
+    }
+
+    const data = await res.json();
+    return {
+      ...data,
+      persisted: res.status !== 202,
+      retryAfter: Number(res.headers.get("Retry-After")) || 0,
+    };
+  }
 }
 
 /**
@@ -15,21 +15,57 @@ export function loadRazorpayScript(): Promise<boolean> {
   });
 }
 
+const MAX_ATTEMPTS = 3;
+const MAX_RETRY_WAIT_SECONDS = 10;
+const RETRY_STATUSES = [409, 503];
+
 /**
- * Create payment order in backend
+ * POST that retries network errors, 503s (payment gateway unavailable) and
+ * 409s (the first attempt with this key is still running), honouring
+ * Retry-After, with the same Idempotency-Key, so the backend replays a
+ * completed first attempt instead of running it twice
  */
-export async function createPaymentOrder(templateId: string) {
+async function idempotentPost(url: string, idempotencyKey: string, body?: string) {
   const token = localStorage.getItem("access");
-  
-  const res = await fetch(
-    `${API_BASE_URL}/api/create-payment-order/${templateId}/`,
-    {
+  const request = () =>
+    fetch(url, {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
         Authorization: `Bearer ${token}`,
+        "Idempotency-Key": idempotencyKey,
       },
+      body,
+    });
+
+  for (let attempt = 1; ; attempt++) {
+    let res: Response;
+    try {
+      res = await request();
+    } catch (error) {
+      if (attempt >= MAX_ATTEMPTS) throw error;
+      continue;
     }
+    if (!RETRY_STATUSES.includes(res.status) || attempt >= MAX_ATTEMPTS) return res;
+
+    const wait = Number(res.headers.get("Retry-After")) || 1;
+    await new Promise((resolve) =>
+      setTimeout(resolve, Math.min(wait, MAX_RETRY_WAIT_SECONDS) * 1000)
+    );
+  }
+}
+
+/**
+ * Create payment order in backend. Pass the same key for retries of one
+ * purchase attempt.
+ */
+export async function createPaymentOrder(
+  templateId: string,
+  idempotencyKey: string = crypto.randomUUID()
+) {
+  const res = await idempotentPost(
+    `${API_BASE_URL}/api/create-payment-order/${templateId}/`,
+    idempotencyKey
   );
 
   if (!res.ok) {
@@ -47,16 +83,12 @@ export async function verifyPayment(paymentData: {
   razorpay_payment_id: string;
   razorpay_signature: string;
 }) {
-  const token = localStorage.getItem("access");
-
-  const res = await fetch(`${API_BASE_URL}/api/verify-payment/`, {
-    method: "POST",
-    headers: {
-      "Content-Type": "application/json",
-      Authorization: `Bearer ${token}`,
-    },
-    body: JSON.stringify(paymentData),
-  });
+  // One verification per Razorpay payment
+  const res = await idempotentPost(
+    `${API_BASE_URL}/api/verify-payment/`,
+    `verify-${paymentData.razorpay_payment_id}`,
+    JSON.stringify(paymentData)
+  );
 
   if (!res.ok) {
     throw new Error("Payment verification failed");